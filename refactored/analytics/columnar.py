@@ -0,0 +1,379 @@
+import io
+import json
+import os
+from typing import Dict, List, Any, Optional
+
+import numpy as np
+from numpy.lib import format as npy_format
+
+from blockchain.block import Block
+
+
+# Column name -> dtype of the exported .npy arrays
+COLUMNS = {
+    "height": np.int64,
+    "timestamp": np.float64,
+    "sender": np.int32,
+    "receiver": np.int32,
+    "amount": np.float64,
+    "type": np.int8,
+}
+
+# Transaction type -> code stored in the "type" column
+TYPE_TRANSFER = 0
+TYPE_REWARD = 1
+TYPE_OTHER = 2
+TYPE_CODES = {None: TYPE_TRANSFER, "REWARD": TYPE_REWARD}
+
+
+def type_code(tx_type: Optional[str]) -> int:
+    """
+    Map a transaction's type field to its numeric column code.
+
+    Args:
+        tx_type: Value of the transaction's "type" key
+
+    Returns:
+        Integer code stored in the "type" column
+    """
+    return TYPE_CODES.get(tx_type, TYPE_OTHER)
+
+
+class ChainColumns:
+    """
+    Columnar view of every transaction in the chain, one NumPy array per field.
+    Sender and receiver columns hold integer ids into the `addresses` list.
+    """
+    def __init__(self, arrays: Dict[str, np.ndarray], addresses: List[str]):
+        """
+        Initialize the column view.
+
+        Args:
+            arrays: Mapping of column name to array, all of the same length
+            addresses: Address strings indexed by the sender/receiver ids
+        """
+        self.height = arrays["height"]
+        self.timestamp = arrays["timestamp"]
+        self.sender = arrays["sender"]
+        self.receiver = arrays["receiver"]
+        self.amount = arrays["amount"]
+        self.type = arrays["type"]
+        self.addresses = addresses
+        self._address_ids = None
+
+    def __len__(self) -> int:
+        """Number of transactions in the view."""
+        return len(self.height)
+
+    def address_id(self, address: str) -> int:
+        """
+        Look up the integer id of an address.
+
+        Args:
+            address: Wallet address or "Network Reward"
+
+        Returns:
+            The address id, or -1 if the address never appears in the chain
+        """
+        if self._address_ids is None:
+            self._address_ids = {addr: i for i, addr in enumerate(self.addresses)}
+        return self._address_ids.get(address, -1)
+
+
+class ColumnarExporter:
+    """
+    Writes the chain's transactions to columnar .npy files and keeps them
+    current as new blocks are mined by appending only the missing rows.
+    """
+    def __init__(self, data_handler, directory: Optional[str] = None):
+        """
+        Initialize the exporter.
+
+        Args:
+            data_handler: Handler used for the JSON side files (addresses, metadata)
+            directory: Output directory (defaults to "columns" in the data directory)
+        """
+        self.data_handler = data_handler
+        self.directory = directory or os.path.join(data_handler.data_dir, "columns")
+        self.addresses_file = os.path.join(self.directory, "addresses.json")
+        self.meta_file = os.path.join(self.directory, "meta.json")
+
+    def column_file(self, name: str) -> str:
+        """
+        Get the path of a column's .npy file.
+
+        Args:
+            name: Column name
+
+        Returns:
+            Path to the column file
+        """
+        return os.path.join(self.directory, f"{name}.npy")
+
+    def export(self, chain: List[Block]) -> int:
+        """
+        Rewrite all column files from scratch.
+
+        Args:
+            chain: List of Block objects to export
+
+        Returns:
+            Number of transaction rows written
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        addresses: List[str] = []
+        columns = self._build_columns(chain, addresses, {})
+        for name, values in columns.items():
+            np.save(self.column_file(name), values)
+        self._save_state(chain, addresses, len(columns["height"]))
+        return len(columns["height"])
+
+    def sync(self, chain: List[Block]) -> int:
+        """
+        Bring the column files up to date with the chain, appending rows for
+        blocks that have not been exported yet. Falls back to a full export
+        when the files are missing or were written for a different chain.
+
+        Args:
+            chain: List of Block objects to export
+
+        Returns:
+            Number of transaction rows appended
+        """
+        meta = self.data_handler.load_data(self.meta_file)
+        if not meta or not all(os.path.exists(self.column_file(name)) for name in COLUMNS):
+            return self.export(chain)
+
+        height = meta["height"]
+        if height >= len(chain) or chain[height].hash != meta["tip_hash"]:
+            return self.export(chain)
+        if height == len(chain) - 1:
+            return 0
+
+        addresses = self.data_handler.load_data(self.addresses_file)
+        address_ids = {addr: i for i, addr in enumerate(addresses)}
+        columns = self._build_columns(chain[height + 1:], addresses, address_ids)
+
+        # Append data before rewriting headers so a crash never leaves a header
+        # pointing past the end of the file
+        for name, values in columns.items():
+            _append_npy(self.column_file(name), values)
+        self._save_state(chain, addresses, meta["rows"] + len(columns["height"]))
+        return len(columns["height"])
+
+    def disconnect(self, block: Block) -> int:
+        """
+        Drop the rows of a block removed from the tip of the chain by a reorganization.
+        Rows are ordered by height, so this truncates the column files in place.
+
+        Args:
+            block: The removed tip block
+
+        Returns:
+            Number of transaction rows removed
+        """
+        meta = self.data_handler.load_data(self.meta_file)
+        if not meta or meta["tip_hash"] != block.hash:
+            # Out of step with the chain; the next sync re-exports
+            return 0
+
+        heights = np.load(self.column_file("height"), mmap_mode="r")
+        rows = int(np.searchsorted(heights, block.index, side="left"))
+        del heights
+        for name in COLUMNS:
+            _truncate_npy(self.column_file(name), rows)
+        self.data_handler.save_data({
+            "height": block.index - 1,
+            "tip_hash": block.previous_hash,
+            "rows": rows
+        }, self.meta_file)
+        return meta["rows"] - rows
+
+    def follow(self, blockchain) -> None:
+        """
+        Register this exporter to follow a blockchain as blocks are mined or
+        disconnected by a reorganization.
+
+        Args:
+            blockchain: Blockchain instance to follow
+        """
+        blockchain.add_block_listener(lambda block: self.sync(blockchain.chain))
+        blockchain.add_disconnect_listener(self.disconnect)
+
+    def load(self, mmap: bool = True) -> ChainColumns:
+        """
+        Load the exported columns.
+
+        Args:
+            mmap: Memory-map the arrays instead of reading them into memory
+
+        Returns:
+            ChainColumns view over the exported data
+        """
+        return load_columns(self.directory, mmap)
+
+    def _build_columns(self, blocks: List[Block], addresses: List[str],
+                       address_ids: Dict[str, int]) -> Dict[str, np.ndarray]:
+        """
+        Convert blocks to column arrays, assigning ids to unseen addresses.
+
+        Args:
+            blocks: Blocks whose transactions should be converted
+            addresses: Address list, extended in place with new addresses
+            address_ids: Address -> id mapping, extended in place
+
+        Returns:
+            Mapping of column name to array
+        """
+        def address_id(addr: str) -> int:
+            if addr not in address_ids:
+                address_ids[addr] = len(addresses)
+                addresses.append(addr)
+            return address_ids[addr]
+
+        rows: Dict[str, List[Any]] = {name: [] for name in COLUMNS}
+        for block in blocks:
+            # Genesis block stores a plain string instead of transactions
+            if not isinstance(block.transactions, list):
+                continue
+            for tx in block.transactions:
+                rows["height"].append(block.index)
+                rows["timestamp"].append(tx["timestamp"])
+                rows["sender"].append(address_id(tx["sender"]))
+                rows["receiver"].append(address_id(tx["receiver"]))
+                rows["amount"].append(tx["amount"])
+                rows["type"].append(type_code(tx.get("type")))
+
+        return {name: np.array(rows[name], dtype=dtype) for name, dtype in COLUMNS.items()}
+
+    def _save_state(self, chain: List[Block], addresses: List[str], rows: int) -> None:
+        """
+        Persist the address table and the export position.
+
+        Args:
+            chain: Chain that was exported
+            addresses: Address table matching the sender/receiver ids
+            rows: Total number of rows in the column files
+        """
+        self.data_handler.save_data(addresses, self.addresses_file)
+        self.data_handler.save_data({
+            "height": len(chain) - 1,
+            "tip_hash": chain[-1].hash,
+            "rows": rows
+        }, self.meta_file)
+
+
+def load_columns(directory: str, mmap: bool = True) -> ChainColumns:
+    """
+    Load exported transaction columns from a directory.
+
+    Args:
+        directory: Directory written by ColumnarExporter
+        mmap: Memory-map the arrays instead of reading them into memory
+
+    Returns:
+        ChainColumns view over the exported data
+    """
+    mode = "r" if mmap else None
+    arrays = {name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mode)
+              for name in COLUMNS}
+    with open(os.path.join(directory, "addresses.json"), "r") as f:
+        addresses = json.load(f)
+    return ChainColumns(arrays, addresses)
+
+
+def _read_npy_header(f) -> tuple:
+    """
+    Read the header of an open .npy file.
+
+    Args:
+        f: File object positioned at the start of the file
+
+    Returns:
+        (format version, shape, fortran_order, dtype, data offset)
+    """
+    version = npy_format.read_magic(f)
+    if version == (1, 0):
+        shape, fortran_order, dtype = npy_format.read_array_header_1_0(f)
+    else:
+        shape, fortran_order, dtype = npy_format.read_array_header_2_0(f)
+    return version, shape, fortran_order, dtype, f.tell()
+
+
+def _rewrite_npy_length(f, version: tuple, fortran_order: bool, dtype, data_offset: int,
+                        length: int) -> bool:
+    """
+    Overwrite the shape in an open .npy file's header with a new length.
+
+    Args:
+        f: File object opened for reading and writing
+        version: Format version of the file
+        fortran_order: Fortran-order flag of the file
+        dtype: Data type of the file
+        data_offset: Size of the existing header
+        length: New number of elements
+
+    Returns:
+        True if the header was rewritten, False if it would change size
+    """
+    header = io.BytesIO()
+    header_data = {
+        "descr": npy_format.dtype_to_descr(dtype),
+        "fortran_order": fortran_order,
+        "shape": (length,)
+    }
+    if version == (1, 0):
+        npy_format.write_array_header_1_0(header, header_data)
+    else:
+        npy_format.write_array_header_2_0(header, header_data)
+    if len(header.getvalue()) != data_offset:
+        return False
+    f.seek(0)
+    f.write(header.getvalue())
+    return True
+
+
+def _append_npy(path: str, values: np.ndarray) -> None:
+    """
+    Append values to a one-dimensional .npy file in place.
+    NumPy pads array headers so the length field can grow without moving
+    the data; if the header would change size the file is rewritten instead.
+
+    Args:
+        path: Path to an existing .npy file
+        values: Values to append, with the same dtype as the file
+    """
+    if len(values) == 0:
+        return
+    with open(path, "r+b") as f:
+        version, shape, fortran_order, dtype, data_offset = _read_npy_header(f)
+        f.seek(data_offset + shape[0] * dtype.itemsize)
+        f.write(values.astype(dtype, copy=False).tobytes())
+        if _rewrite_npy_length(f, version, fortran_order, dtype, data_offset,
+                               shape[0] + len(values)):
+            return
+        # Drop the appended bytes again before falling back to a rewrite
+        f.truncate(data_offset + shape[0] * dtype.itemsize)
+
+    existing = np.load(path)
+    np.save(path, np.concatenate([existing, values.astype(existing.dtype, copy=False)]))
+
+
+def _truncate_npy(path: str, length: int) -> None:
+    """
+    Shorten a one-dimensional .npy file in place.
+
+    Args:
+        path: Path to an existing .npy file
+        length: Number of elements to keep
+    """
+    with open(path, "r+b") as f:
+        version, shape, fortran_order, dtype, data_offset = _read_npy_header(f)
+        if length >= shape[0]:
+            return
+        if _rewrite_npy_length(f, version, fortran_order, dtype, data_offset, length):
+            f.truncate(data_offset + length * dtype.itemsize)
+            return
+
+    existing = np.load(path)
+    np.save(path, existing[:length].copy())
@@ -0,0 +1,173 @@
+from typing import Dict, List, Any
+
+import numpy as np
+
+from analytics.columnar import ChainColumns, TYPE_REWARD
+
+
+HOUR = 3600
+DAY = 24 * HOUR
+
+
+def period_stats(columns: ChainColumns, period: int = HOUR) -> Dict[str, np.ndarray]:
+    """
+    Group transactions into fixed-length time periods and summarize each one.
+    Periods without any transactions are left out.
+
+    Args:
+        columns: Columnar view of the chain's transactions
+        period: Period length in seconds
+
+    Returns:
+        Dictionary of equal-length arrays: "period_start", "count", "volume",
+        "mean" and "max", ordered by period
+
+    Raises:
+        ValueError: If period is not positive
+    """
+    if period <= 0:
+        raise ValueError(f"Period must be a positive number of seconds, got {period}")
+    if len(columns) == 0:
+        empty = np.zeros(0)
+        return {"period_start": empty, "count": empty.astype(np.int64),
+                "volume": empty, "mean": empty, "max": empty}
+
+    buckets = (np.asarray(columns.timestamp) // period).astype(np.int64)
+    first = buckets.min()
+    buckets -= first
+    amounts = np.asarray(columns.amount)
+
+    counts = np.bincount(buckets)
+    volumes = np.bincount(buckets, weights=amounts)
+    maxima = np.full(len(counts), -np.inf)
+    _grouped_max(maxima, buckets, amounts)
+
+    used = np.flatnonzero(counts)
+    return {
+        "period_start": (used + first) * float(period),
+        "count": counts[used],
+        "volume": volumes[used],
+        "mean": volumes[used] / counts[used],
+        "max": maxima[used]
+    }
+
+
+def volume_per_period(columns: ChainColumns, period: int = HOUR) -> Dict[str, np.ndarray]:
+    """
+    Total transferred amount per time period.
+
+    Args:
+        columns: Columnar view of the chain's transactions
+        period: Period length in seconds
+
+    Returns:
+        Dictionary with "period_start" and "volume" arrays
+
+    Raises:
+        ValueError: If period is not positive
+    """
+    stats = period_stats(columns, period)
+    return {"period_start": stats["period_start"], "volume": stats["volume"]}
+
+
+def top_receivers(columns: ChainColumns, n: int = 100,
+                  include_rewards: bool = False) -> List[Dict[str, Any]]:
+    """
+    Addresses that received the largest total amount.
+
+    Args:
+        columns: Columnar view of the chain's transactions
+        n: Number of addresses to return
+        include_rewards: Count mining rewards as received amounts
+
+    Returns:
+        List of {"address", "total", "count"} dictionaries, largest total first
+    """
+    mask = None if include_rewards else np.asarray(columns.type) != TYPE_REWARD
+    return _top_by_address(columns, columns.receiver, mask, n)
+
+
+def top_senders(columns: ChainColumns, n: int = 100) -> List[Dict[str, Any]]:
+    """
+    Addresses that sent the largest total amount. Mining rewards are excluded.
+
+    Args:
+        columns: Columnar view of the chain's transactions
+        n: Number of addresses to return
+
+    Returns:
+        List of {"address", "total", "count"} dictionaries, largest total first
+    """
+    mask = np.asarray(columns.type) != TYPE_REWARD
+    return _top_by_address(columns, columns.sender, mask, n)
+
+
+def mining_rewards_per_miner(columns: ChainColumns) -> List[Dict[str, Any]]:
+    """
+    Total mining rewards earned by each miner.
+
+    Args:
+        columns: Columnar view of the chain's transactions
+
+    Returns:
+        List of {"address", "total", "count"} dictionaries, largest total first
+    """
+    mask = np.asarray(columns.type) == TYPE_REWARD
+    return _top_by_address(columns, columns.receiver, mask, len(columns.addresses))
+
+
+def _top_by_address(columns: ChainColumns, ids: np.ndarray, mask, n: int) -> List[Dict[str, Any]]:
+    """
+    Sum amounts per address id and return the n largest totals.
+
+    Args:
+        columns: Columnar view of the chain's transactions
+        ids: Sender or receiver id column to group by
+        mask: Boolean row filter, or None to use every row
+        n: Number of addresses to return
+
+    Returns:
+        List of {"address", "total", "count"} dictionaries, largest total first
+    """
+    ids = np.asarray(ids)
+    amounts = np.asarray(columns.amount)
+    if mask is not None:
+        ids = ids[mask]
+        amounts = amounts[mask]
+
+    size = len(columns.addresses)
+    totals = np.bincount(ids, weights=amounts, minlength=size)
+    counts = np.bincount(ids, minlength=size)
+
+    active = np.flatnonzero(counts)
+    n = min(n, len(active))
+    if n == 0:
+        return []
+    # argpartition avoids sorting every address when only the top n are needed
+    top = active[np.argpartition(-totals[active], n - 1)[:n]]
+    top = top[np.argsort(-totals[top], kind="stable")]
+
+    return [{
+        "address": columns.addresses[i],
+        "total": float(totals[i]),
+        "count": int(counts[i])
+    } for i in top]
+
+
+def _grouped_max(out: np.ndarray, buckets: np.ndarray, values: np.ndarray) -> None:
+    """
+    Per-bucket maximum written into `out` using reduceat over runs of equal
+    buckets. Chain timestamps are almost always already in order, so the
+    sort is skipped when it isn't needed.
+
+    Args:
+        out: Output array indexed by bucket, updated in place
+        buckets: Bucket index of each value
+        values: Values to reduce
+    """
+    if np.any(buckets[1:] < buckets[:-1]):
+        order = np.argsort(buckets, kind="stable")
+        buckets = buckets[order]
+        values = values[order]
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    out[buckets[starts]] = np.maximum.reduceat(values, starts)
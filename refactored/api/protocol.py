@@ -0,0 +1,158 @@
+import asyncio
+import json
+from typing import Dict, Any, Optional
+from urllib.parse import urlsplit, parse_qs
+
+
+# Largest request body accepted, in bytes
+MAX_BODY_SIZE = 1024 * 1024
+# Longest request line or header line accepted, in bytes (the API server's StreamReader limit)
+MAX_LINE_SIZE = 8192
+# Most header lines accepted per request
+MAX_HEADERS = 100
+
+STATUS_TEXT = {
+    200: "OK",
+    201: "Created",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    408: "Request Timeout",
+    409: "Conflict",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+
+
+class HttpError(Exception):
+    """Raised for a request that should be answered with an HTTP error status."""
+    def __init__(self, status: int, message: str):
+        """
+        Initialize the error.
+
+        Args:
+            status: HTTP status code to answer with
+            message: Error description for the response body
+        """
+        super().__init__(message)
+        self.status = status
+
+
+class Request:
+    """
+    One parsed HTTP request.
+    """
+    def __init__(self, method: str, target: str, headers: Dict[str, str], body: bytes):
+        """
+        Initialize a request.
+
+        Args:
+            method: HTTP method in upper case
+            target: Request target (path and query string)
+            headers: Header names in lower case mapped to their values
+            body: Raw request body
+        """
+        self.method = method
+        url = urlsplit(target)
+        self.path = url.path.rstrip("/") or "/"
+        self.query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        self.headers = headers
+        self.body = body
+
+    @property
+    def keep_alive(self) -> bool:
+        """Whether the client wants the connection kept open after the response."""
+        return self.headers.get("connection", "").lower() != "close"
+
+    def json(self) -> Dict[str, Any]:
+        """
+        Decode the body as a JSON object.
+
+        Returns:
+            Decoded body, or an empty dictionary for an empty body
+
+        Raises:
+            HttpError: If the body is not a JSON object
+        """
+        if not self.body:
+            return {}
+        try:
+            data = json.loads(self.body)
+        except ValueError:
+            raise HttpError(400, "Request body is not valid JSON")
+        if not isinstance(data, dict):
+            raise HttpError(400, "Request body must be a JSON object")
+        return data
+
+
+async def read_request(reader: asyncio.StreamReader) -> Optional[Request]:
+    """
+    Read one HTTP/1.1 request from a stream.
+
+    Args:
+        reader: Stream to read from
+
+    Returns:
+        The parsed request, or None if the client closed the connection
+
+    Raises:
+        HttpError: If the request is malformed or too large
+    """
+    try:
+        line = await reader.readuntil(b"\n")
+    except asyncio.IncompleteReadError:
+        return None
+    except asyncio.LimitOverrunError:
+        raise HttpError(400, "Request line too long")
+    parts = line.decode("latin-1").split()
+    if len(parts) != 3:
+        raise HttpError(400, "Malformed request line")
+    method, target, _ = parts
+
+    headers: Dict[str, str] = {}
+    while True:
+        try:
+            line = await reader.readuntil(b"\n")
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            raise HttpError(400, "Malformed headers")
+        if line in (b"\r\n", b"\n"):
+            break
+        if len(headers) >= MAX_HEADERS:
+            raise HttpError(400, "Too many headers")
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    try:
+        length = int(headers.get("content-length", 0))
+    except ValueError:
+        raise HttpError(400, "Invalid Content-Length")
+    if length < 0:
+        raise HttpError(400, "Invalid Content-Length")
+    if length > MAX_BODY_SIZE:
+        raise HttpError(413, "Request body too large")
+    try:
+        body = await reader.readexactly(length) if length else b""
+    except asyncio.IncompleteReadError:
+        return None
+    return Request(method.upper(), target, headers, body)
+
+
+def encode_response(status: int, payload: Dict[str, Any], keep_alive: bool = True) -> bytes:
+    """
+    Serialize a JSON response.
+
+    Args:
+        status: HTTP status code
+        payload: JSON-serializable response body
+        keep_alive: Whether the connection stays open afterwards
+
+    Returns:
+        Response bytes including the status line and headers
+    """
+    body = json.dumps(payload, separators=(",", ":")).encode()
+    head = (f"HTTP/1.1 {status} {STATUS_TEXT.get(status, 'Unknown')}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode("latin-1") + body
+
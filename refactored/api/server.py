@@ -0,0 +1,349 @@
+import asyncio
+import math
+import re
+from typing import Dict, List, Any, Optional, Callable, Tuple
+
+from blockchain.block import Block
+from mining.job import MiningTimeout, start_mining
+from api.protocol import MAX_LINE_SIZE, HttpError, Request, read_request, encode_response
+
+
+# Default and largest page size of wallet history responses
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+class ApiServer:
+    """
+    HTTP/JSON API over a Blockchain and its DataHandler, built on asyncio streams.
+    Every response uses the envelope {"success", "data", "message", "errors"}.
+    In-memory lookups are answered on the event loop; anything that reads or
+    writes the data files, takes the chain lock, mines or validates runs in an
+    executor, so slow work never stalls other clients. Reads run side by side
+    under the data handler's reader/writer lock; writes take it exclusively.
+    """
+    def __init__(self, blockchain, data_handler, host: str = "127.0.0.1", port: int = 8080):
+        """
+        Initialize the server.
+
+        Args:
+            blockchain: Blockchain instance to serve
+            data_handler: Handler for wallet and history data
+            host: Interface to listen on
+            port: Port to listen on (0 picks a free port)
+        """
+        self.blockchain = blockchain
+        self.data_handler = data_handler
+        self.host = host
+        self.port = port
+        self.server: Optional[asyncio.AbstractServer] = None
+        self._clients: Dict[asyncio.StreamWriter, asyncio.Task] = {}
+        self.routes: List[Tuple[str, Any, Callable]] = [
+            ("GET", re.compile(r"/api/blockchain"), self.get_status),
+            ("GET", re.compile(r"/api/blockchain/blocks/(?P<block_id>[^/]+)"), self.get_block),
+            ("POST", re.compile(r"/api/blockchain/mine"), self.mine),
+            ("GET", re.compile(r"/api/blockchain/validate"), self.validate),
+            ("GET", re.compile(r"/api/wallets/(?P<address>[^/]+)/balance"), self.get_balance),
+            ("GET", re.compile(r"/api/wallets/(?P<address>[^/]+)/transactions"), self.get_history),
+            ("POST", re.compile(r"/api/transactions"), self.submit_transaction),
+            ("GET", re.compile(r"/api/transactions/pending"), self.get_pending),
+            ("GET", re.compile(r"/api/transactions/(?P<tx_id>[^/]+)"), self.get_transaction),
+        ]
+
+    async def start(self) -> None:
+        """Start listening for clients."""
+        # The reader limit bounds the request line and each header line
+        self.server = await asyncio.start_server(self._serve_client, self.host, self.port,
+                                                 limit=MAX_LINE_SIZE)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        """Stop listening and close client connections."""
+        if self.server:
+            self.server.close()
+            for writer in list(self._clients):
+                writer.close()
+            # Closed connections end their handlers at the next read
+            await asyncio.gather(*self._clients.values(), return_exceptions=True)
+            await self.server.wait_closed()
+
+    async def dispatch(self, request: Request) -> Tuple[int, Dict[str, Any]]:
+        """
+        Route a request to its handler and wrap the result in the response envelope.
+
+        Args:
+            request: Parsed request
+
+        Returns:
+            (HTTP status, response body)
+        """
+        path_found = False
+        for method, pattern, handler in self.routes:
+            match = pattern.fullmatch(request.path)
+            if not match:
+                continue
+            path_found = True
+            if method != request.method:
+                continue
+            try:
+                status, data, message = await handler(request, **match.groupdict())
+            except HttpError as e:
+                return e.status, self._error(str(e))
+            except Exception as e:
+                print(f"Error handling {request.method} {request.path}: {str(e)}")
+                return 500, self._error("Internal server error")
+            return status, {"success": True, "data": data, "message": message, "errors": []}
+
+        if path_found:
+            return 405, self._error(f"Method {request.method} not allowed")
+        return 404, self._error(f"No route for {request.path}")
+
+    async def get_status(self, request: Request) -> Tuple[int, Any, str]:
+        """GET /api/blockchain - chain height, tip and pending pool size."""
+        chain = self.blockchain.chain
+        return 200, {
+            "height": len(chain) - 1,
+            "tip_hash": chain[-1].hash,
+            "difficulty": self.blockchain.difficulty,
+            "mining_reward": self.blockchain.mining_reward,
+            "pending_transactions": len(self.blockchain.pending_transactions),
+        }, "Chain status"
+
+    async def get_block(self, request: Request, block_id: str) -> Tuple[int, Any, str]:
+        """GET /api/blockchain/blocks/{height or hash} - one block."""
+        chain = self.blockchain.chain
+        block: Optional[Block] = None
+        if block_id in self.blockchain.block_tree:
+            block = self.blockchain.block_tree.entries[block_id].block
+        elif len(block_id) == 64 and all(c in "0123456789abcdef" for c in block_id):
+            raise HttpError(404, f"Block {block_id} not found")
+        else:
+            # str.isdigit() also accepts characters such as "²" that int() refuses
+            try:
+                height = int(block_id)
+            except ValueError:
+                raise HttpError(400, "Block id must be a height or a block hash")
+            if not 0 <= height < len(chain):
+                raise HttpError(400, f"Block height must be between 0 and {len(chain) - 1}")
+            block = chain[height]
+
+        data = block.to_dict()
+        data["main_chain"] = block.index < len(chain) and chain[block.index].hash == block.hash
+        data["confirmations"] = len(chain) - block.index if data["main_chain"] else 0
+        return 200, data, f"Block {block.index}"
+
+    async def mine(self, request: Request) -> Tuple[int, Any, str]:
+        """POST /api/blockchain/mine {"miner": address, "timeout": seconds} - mine the pending transactions."""
+        body = request.json()
+        miner = body.get("miner")
+        timeout = body.get("timeout")
+        if not isinstance(miner, str) or not miner:
+            raise HttpError(400, "Field 'miner' must be a wallet address")
+        if timeout is not None and (isinstance(timeout, bool) or not isinstance(timeout, (int, float))
+                                    or not math.isfinite(timeout) or timeout <= 0):
+            raise HttpError(400, "Field 'timeout' must be a positive number of seconds")
+        # Proof of work runs outside the chain lock, so other requests go ahead meanwhile
+        job = start_mining(self.blockchain, miner, timeout=timeout)
+        try:
+            block = await job
+        except MiningTimeout:
+            raise HttpError(408, f"No block found within {timeout}s after "
+                                 f"{job.progress.nonces:,} nonces; transactions stay pending")
+        if job.block is None:
+            raise HttpError(409, "No transactions available for mining")
+        if block is None:
+            raise HttpError(409, "The chain changed while mining; try again")
+        return 201, {"block": block.to_dict(), "transactions": len(block.transactions) - 1}, \
+            f"Block {block.index} mined"
+
+    async def validate(self, request: Request) -> Tuple[int, Any, str]:
+        """GET /api/blockchain/validate - re-check every block's hash and link."""
+        valid = await self._run(self.blockchain.validate_chain)
+        return 200, {"valid": valid}, "Blockchain is valid" if valid else "Blockchain is invalid"
+
+    async def get_balance(self, request: Request, address: str) -> Tuple[int, Any, str]:
+        """GET /api/wallets/{address}/balance - a wallet's balance."""
+        wallet = await self._run(self._find_wallet, address)
+        if wallet is None:
+            raise HttpError(404, f"Wallet {address} not found")
+        return 200, {"address": address, "balance": wallet.get("balance", 0)}, "Wallet balance"
+
+    async def get_history(self, request: Request, address: str) -> Tuple[int, Any, str]:
+        """GET /api/wallets/{address}/transactions?page=&per_page= - newest first."""
+        page = self._int_param(request, "page", 1)
+        per_page = min(self._int_param(request, "per_page", DEFAULT_PAGE_SIZE), MAX_PAGE_SIZE)
+        tx_file = self.data_handler.get_transaction_file(address)
+        history = await self._run(self.data_handler.load_data, tx_file)
+        start = (page - 1) * per_page
+        transactions = list(reversed(history))[start:start + per_page]
+        return 200, {
+            "address": address,
+            "page": page,
+            "per_page": per_page,
+            "total": len(history),
+            "transactions": transactions,
+        }, f"{len(transactions)} of {len(history)} transactions"
+
+    async def submit_transaction(self, request: Request) -> Tuple[int, Any, str]:
+        """POST /api/transactions {"sender", "receiver", "amount"} - send coins."""
+        body = request.json()
+        sender = body.get("sender")
+        receiver = body.get("receiver")
+        amount = body.get("amount")
+        if not isinstance(sender, str) or not sender or not isinstance(receiver, str) or not receiver:
+            raise HttpError(400, "Fields 'sender' and 'receiver' must be wallet addresses")
+        # json.loads accepts NaN and Infinity, which would pass the comparisons below
+        if (isinstance(amount, bool) or not isinstance(amount, (int, float))
+                or not math.isfinite(amount) or amount <= 0):
+            raise HttpError(400, "Field 'amount' must be a positive number")
+        if sender == receiver:
+            raise HttpError(400, "Sender and receiver must differ")
+        tx = await self._run(self._send, sender, receiver, float(amount))
+        return 201, tx, "Transaction added to pending pool"
+
+    async def get_pending(self, request: Request) -> Tuple[int, Any, str]:
+        """GET /api/transactions/pending - the pending pool."""
+        pending = list(self.blockchain.pending_transactions)
+        return 200, pending, f"{len(pending)} pending transactions"
+
+    async def get_transaction(self, request: Request, tx_id: str) -> Tuple[int, Any, str]:
+        """GET /api/transactions/{id} - a transaction and its confirmations."""
+        found = await self._run(self.blockchain.get_transaction, tx_id)
+        if found is None:
+            raise HttpError(404, f"Transaction {tx_id} not found")
+        tx, confirmations = found
+        return 200, {"transaction": tx, "confirmations": confirmations}, \
+            "Confirmed" if confirmations else "Pending"
+
+    def _send(self, sender: str, receiver: str, amount: float) -> Dict[str, Any]:
+        """
+        Create a transaction and update balances and histories, as the send menu does.
+
+        Args:
+            sender: Sending wallet address
+            receiver: Receiving address
+            amount: Amount to send
+
+        Returns:
+            The new transaction dictionary
+
+        Raises:
+            HttpError: If the sender is unknown or can't cover the amount
+        """
+        # Check and update under one write lock so concurrent sends can't overdraw
+        with self.blockchain.lock.write():
+            wallet = self._find_wallet(sender)
+            if wallet is None:
+                raise HttpError(404, f"Wallet {sender} not found")
+            if amount > wallet.get("balance", 0):
+                raise HttpError(409, "Insufficient balance")
+
+            transaction = self.blockchain.create_transaction(sender, receiver, amount)
+            self.data_handler.update_wallet_balance(sender, -amount)
+            self.data_handler.update_wallet_balance(receiver, amount)
+            self.data_handler.record_transaction(transaction, sender, "sent")
+            self.data_handler.record_transaction(transaction, receiver, "received")
+        return transaction
+
+    def _find_wallet(self, address: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a wallet by address.
+
+        Args:
+            address: Wallet address
+
+        Returns:
+            The wallet dictionary, or None if there is no such wallet
+        """
+        for wallet in self.data_handler.load_wallets():
+            if wallet["address"] == address:
+                return wallet
+        return None
+
+    async def _run(self, func: Callable, *args) -> Any:
+        """
+        Run a blocking call in the executor.
+
+        Args:
+            func: Blocking function to call
+            *args: Arguments for the function
+
+        Returns:
+            The function's return value
+        """
+        return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+    async def _serve_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Answer requests on one connection until the client closes it."""
+        self._clients[writer] = asyncio.current_task()
+        try:
+            while True:
+                try:
+                    request = await read_request(reader)
+                except HttpError as e:
+                    writer.write(encode_response(e.status, self._error(str(e)), keep_alive=False))
+                    await writer.drain()
+                    break
+                if request is None:
+                    break
+                status, payload = await self.dispatch(request)
+                writer.write(encode_response(status, payload, request.keep_alive))
+                await writer.drain()
+                if not request.keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            self._clients.pop(writer, None)
+            writer.close()
+
+    @staticmethod
+    def _int_param(request: Request, name: str, default: int) -> int:
+        """
+        Read a positive integer query parameter.
+
+        Args:
+            request: Parsed request
+            name: Parameter name
+            default: Value when the parameter is absent
+
+        Returns:
+            The parameter value
+
+        Raises:
+            HttpError: If the value is not a positive integer
+        """
+        value = request.query.get(name)
+        if value is None:
+            return default
+        try:
+            number = int(value)
+        except ValueError:
+            number = 0
+        if number < 1:
+            raise HttpError(400, f"Query parameter '{name}' must be a positive integer")
+        return number
+
+    @staticmethod
+    def _error(message: str) -> Dict[str, Any]:
+        """Build an error envelope."""
+        return {"success": False, "data": None, "message": message, "errors": [message]}
+
+
+async def run_api(blockchain, data_handler, host: str, port: int) -> None:
+    """
+    Start the API server and serve until cancelled.
+
+    Args:
+        blockchain: Blockchain instance to serve
+        data_handler: Handler for wallet and history data
+        host: Interface to listen on
+        port: Port to listen on
+    """
+    server = ApiServer(blockchain, data_handler, host, port)
+    await server.start()
+    print(f"API listening on http://{server.host}:{server.port}/api/blockchain")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
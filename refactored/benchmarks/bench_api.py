@@ -0,0 +1,212 @@
+#!/usr/bin/env python
+"""
+API Load Test
+-------------
+Starts the HTTP/JSON API server on a temporary copy of a small chain (or
+targets a running server with --url) and drives it with many concurrent
+keep-alive clients issuing a mix of status, block, balance and transaction
+requests. With --mine a block is mined halfway through the run, showing that
+requests keep being answered while proof of work runs in the executor.
+
+Usage:
+    python benchmarks/bench_api.py [--clients 100] [--requests 50] [--mine]
+    python benchmarks/bench_api.py --url 127.0.0.1:8080 --sender <address>
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.server import ApiServer
+from blockchain.blockchain import Blockchain
+from data.data_handler import DataHandler
+
+
+class HttpClient:
+    """
+    Minimal keep-alive HTTP/1.1 client for JSON requests.
+    """
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+
+    async def request(self, method: str, path: str, body=None):
+        """Send a request and return (status, decoded JSON body)."""
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        payload = json.dumps(body).encode() if body is not None else b""
+        self.writer.write(f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\n"
+                          f"Content-Type: application/json\r\n"
+                          f"Content-Length: {len(payload)}\r\n\r\n".encode() + payload)
+        await self.writer.drain()
+
+        status = int((await self.reader.readline()).split()[1])
+        length = 0
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode().partition(":")
+            if name.lower() == "content-length":
+                length = int(value)
+        return status, json.loads(await self.reader.readexactly(length))
+
+    async def close(self):
+        if self.writer:
+            self.writer.close()
+
+
+def create_data_dir(root: str, wallets: int, difficulty: int):
+    """
+    Create a data directory with a genesis block and funded wallets.
+
+    Returns:
+        List of wallet addresses
+    """
+    handler = DataHandler(root)
+    Blockchain(handler, difficulty=difficulty)
+    addresses = [f"{i:040x}" for i in range(1, wallets + 1)]
+    handler.save_wallets([{"address": address, "nickname": f"Load {i}", "balance": 1_000_000}
+                          for i, address in enumerate(addresses)])
+    return addresses
+
+
+def start_server_thread(root: str, difficulty: int):
+    """Run an ApiServer on its own event loop in a background thread."""
+    loop = asyncio.new_event_loop()
+    ready = threading.Event()
+    handler = DataHandler(root)
+    server = ApiServer(Blockchain(handler, difficulty=difficulty), handler, port=0)
+
+    def serve():
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(server.start())
+        ready.set()
+        loop.run_forever()
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    ready.wait()
+    return server, loop, thread
+
+
+async def client_session(host, port, addresses, requests, latencies, errors, rng):
+    """Issue `requests` mixed requests over one connection."""
+    client = HttpClient(host, port)
+    try:
+        for _ in range(requests):
+            roll = rng.random()
+            if roll < 0.4:
+                kind, method, path, body = "status", "GET", "/api/blockchain", None
+            elif roll < 0.6:
+                kind, method, path, body = "block", "GET", "/api/blockchain/blocks/0", None
+            elif roll < 0.8:
+                kind, method, path, body = ("balance", "GET",
+                                            f"/api/wallets/{rng.choice(addresses)}/balance", None)
+            else:
+                sender, receiver = rng.sample(addresses, 2) if len(addresses) > 1 else (addresses[0], "sink")
+                kind, method, path, body = ("submit", "POST", "/api/transactions",
+                                            {"sender": sender, "receiver": receiver, "amount": 1})
+            started = time.perf_counter()
+            status, _ = await client.request(method, path, body)
+            latencies.setdefault(kind, []).append(time.perf_counter() - started)
+            if status >= 400:
+                errors.append((kind, status))
+    finally:
+        await client.close()
+
+
+async def mine_during_run(host, port, miner, delay, result):
+    """Mine one block after `delay` seconds and record how long it took."""
+    await asyncio.sleep(delay)
+    client = HttpClient(host, port)
+    started = time.perf_counter()
+    status, body = await client.request("POST", "/api/blockchain/mine", {"miner": miner})
+    result["mine"] = (status, time.perf_counter() - started, started)
+    await client.close()
+
+
+async def run_load(host, port, addresses, args):
+    latencies = {}
+    errors = []
+    rng = random.Random(args.seed)
+    mined = {}
+    started = time.perf_counter()
+    tasks = [client_session(host, port, addresses, args.requests, latencies, errors,
+                            random.Random(rng.random())) for _ in range(args.clients)]
+    if args.mine:
+        tasks.append(mine_during_run(host, port, addresses[0], args.mine_after, mined))
+    await asyncio.gather(*tasks)
+    return latencies, errors, time.perf_counter() - started, mined
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load-test the HTTP/JSON API")
+    parser.add_argument("--clients", type=int, default=100, help="Concurrent connections")
+    parser.add_argument("--requests", type=int, default=50, help="Requests per connection")
+    parser.add_argument("--wallets", type=int, default=50)
+    parser.add_argument("--difficulty", type=int, default=4)
+    parser.add_argument("--mine", action="store_true", help="Mine a block during the run")
+    parser.add_argument("--mine-after", type=float, default=0.2,
+                        help="Seconds into the run to start mining")
+    parser.add_argument("--url", help="host:port of a running server instead of a local one")
+    parser.add_argument("--sender", action="append", default=[],
+                        help="Funded wallet address on the --url server (repeatable)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    root = None
+    if args.url:
+        host, _, port = args.url.rpartition(":")
+        port = int(port)
+        addresses = args.sender
+        if not addresses:
+            parser.error("--url needs at least one --sender")
+    else:
+        root = tempfile.mkdtemp(prefix="bench_api_")
+        with contextlib.redirect_stdout(io.StringIO()):
+            addresses = create_data_dir(root, args.wallets, args.difficulty)
+            server, loop, thread = start_server_thread(root, args.difficulty)
+        host, port = server.host, server.port
+
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            latencies, errors, seconds, mined = asyncio.run(run_load(host, port, addresses, args))
+    finally:
+        if root:
+            asyncio.run_coroutine_threadsafe(server.stop(), loop).result()
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            shutil.rmtree(root, ignore_errors=True)
+
+    total = sum(len(values) for values in latencies.values())
+    print(f"{args.clients} clients x {args.requests} requests: {total} in {seconds:.2f}s "
+          f"({total / seconds:.0f} req/s), {len(errors)} errors")
+    print(f"{'request':>8} {'count':>6} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for kind, values in sorted(latencies.items()):
+        values.sort()
+        p99 = values[min(len(values) - 1, int(len(values) * 0.99))]
+        print(f"{kind:>8} {len(values):>6} {statistics.median(values) * 1000:>8.1f} "
+              f"{p99 * 1000:>8.1f} {values[-1] * 1000:>8.1f}")
+    if mined:
+        status, mine_seconds, _ = mined["mine"]
+        print(f"Mining request: status {status} after {mine_seconds:.2f}s; "
+              f"status/block requests kept being served meanwhile")
+
+
+if __name__ == "__main__":
+    main()
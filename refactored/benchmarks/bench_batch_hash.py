@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+"""
+Batched SHA-256 Mining Benchmark
+--------------------------------
+Checks the NumPy batch hasher against hashlib for many message lengths and
+nonce ranges, then times the scalar hashlib nonce loop against the NumPy
+backend at difficulties 3 to 6 on the same block. Each difficulty searches
+for a real solution from nonce 0, so both backends do the same work and must
+find the same nonce.
+
+Usage:
+    python benchmarks/bench_batch_hash.py [--transactions 1] [--min-difficulty 3] [--max-difficulty 6]
+"""
+
+import argparse
+import hashlib
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from blockchain.batch_hash import DEFAULT_CHUNK, sha256_batch
+from blockchain.block import Block
+from blockchain.blockchain import Blockchain, NONCE_BATCH
+
+
+class _Chain:
+    """Just enough of a Blockchain for Blockchain.search_nonce."""
+    def __init__(self, difficulty: int, mining_backend: str):
+        self.difficulty = difficulty
+        self.mining_backend = mining_backend
+
+
+def cross_check(seed: int = 0) -> int:
+    """
+    Compare batch digests with hashlib for nonces that put the digits at every
+    offset of a SHA-256 block and across block boundaries.
+
+    Returns:
+        Number of digests checked
+    """
+    rng = random.Random(seed)
+    checked = 0
+    lengths = [0, 1, 55, 56, 58, 60, 63, 64, 119, 130] + [rng.randint(0, 3000) for _ in range(10)]
+    for prefix_length in lengths:
+        prefix = bytes(rng.getrandbits(8) for _ in range(prefix_length))
+        suffix = bytes(rng.getrandbits(8) for _ in range(rng.choice([0, 10, 100, 900])))
+        for start in (0, 7, 95, 998, 123456, 99999990, 10 ** 12 - 50):
+            # A batch must not mix digit counts
+            stop = min(start + 200, 10 ** len(str(start)))
+            nonces = np.arange(start, stop, dtype=np.uint64)
+            for nonce, digest in zip(nonces, sha256_batch(prefix, suffix, nonces)):
+                expected = hashlib.sha256(prefix + str(int(nonce)).encode() + suffix).hexdigest()
+                actual = "".join(f"{word:08x}" for word in digest)
+                if actual != expected:
+                    raise AssertionError(f"Digest mismatch for prefix length {prefix_length}, "
+                                         f"suffix length {len(suffix)}, nonce {nonce}")
+                checked += 1
+    return checked
+
+
+def sample_block(transactions: int) -> Block:
+    """Build a block with the given number of transfers plus a mining reward."""
+    rng = random.Random(1)
+    txs = [{
+        "sender": f"{rng.getrandbits(256):064x}",
+        "receiver": f"{rng.getrandbits(256):064x}",
+        "amount": 1.0,
+        "timestamp": 1700000000.0 + i
+    } for i in range(transactions)]
+    txs.append({
+        "sender": "Network Reward",
+        "receiver": f"{rng.getrandbits(256):064x}",
+        "amount": 10,
+        "timestamp": 1700000000.0,
+        "type": "REWARD"
+    })
+    return Block(1, 1700000000.0, txs, "0" * 64)
+
+
+def solve(block: Block, difficulty: int, backend: str, count: int):
+    """
+    Search nonces from 0 in ranges of `count` until one meets the difficulty.
+
+    Returns:
+        (nonce, seconds)
+    """
+    chain = _Chain(difficulty, backend)
+    started = time.perf_counter()
+    start = 0
+    while True:
+        nonce = Blockchain.search_nonce(chain, block, start, count)
+        if nonce is not None:
+            return nonce, time.perf_counter() - started
+        start += count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark batched NumPy SHA-256 against hashlib")
+    parser.add_argument("--transactions", type=int, default=1, help="Transfers in the mined block")
+    parser.add_argument("--min-difficulty", type=int, default=3)
+    parser.add_argument("--max-difficulty", type=int, default=6)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    checked = cross_check()
+    print(f"Cross-check: {checked:,} digests match hashlib ({time.perf_counter() - started:.1f}s)")
+
+    block = sample_block(args.transactions)
+    prefix, suffix = block.hash_template()
+    # Message plus the 0x80 byte and 8-byte length, rounded up to 64-byte blocks
+    blocks = (len(prefix) + len(suffix) + 1 + 9 + 63) // 64
+    print(f"Block: {args.transactions} transfers, {len(prefix) + len(suffix):,} bytes "
+          f"({blocks} SHA-256 blocks per hash), numpy chunk {DEFAULT_CHUNK:,} nonces\n")
+
+    print(f"{'difficulty':>10}  {'nonce':>10}  {'hashlib':>14}  {'numpy':>14}  {'speedup':>7}")
+    for difficulty in range(args.min_difficulty, args.max_difficulty + 1):
+        nonce, scalar_time = solve(block, difficulty, "hashlib", NONCE_BATCH)
+        batch_nonce, batch_time = solve(block, difficulty, "numpy", DEFAULT_CHUNK)
+        if batch_nonce != nonce:
+            raise AssertionError(f"Backends disagree at difficulty {difficulty}: {nonce} != {batch_nonce}")
+        tried = nonce + 1
+        print(f"{difficulty:>10}  {nonce:>10,}  {tried / scalar_time:>10,.0f} H/s  "
+              f"{tried / batch_time:>10,.0f} H/s  {scalar_time / batch_time:>6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+"""
+Block Bloom Filter Benchmark
+----------------------------
+Builds a synthetic chain with realistic (heavy-tailed) wallet activity and
+reports, for several false-positive rates, the share of blocks an address
+history scan can skip, the false-positive rate observed, and the scan time
+with and without the filters.
+
+Usage:
+    python benchmarks/bench_bloom.py [--blocks 5000] [--wallets 2000] [--tx-per-block 20]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from blockchain.block import Block
+from blockchain.bloom import BloomFilter, BloomProbe
+
+
+def synthetic_chain(blocks: int, wallets: int, tx_per_block: int, seed: int = 0):
+    """
+    Build blocks of transfers between Zipf-weighted wallets plus a mining reward.
+
+    Args:
+        blocks: Number of blocks
+        wallets: Number of wallet addresses
+        tx_per_block: Maximum transfers per block
+        seed: Random seed
+
+    Returns:
+        (list of Blocks, list of wallet addresses)
+    """
+    rng = random.Random(seed)
+    addresses = [f"{rng.getrandbits(128):032x}" for _ in range(wallets)]
+    weights = [1 / (rank + 1) for rank in range(wallets)]
+    miners = addresses[:10]
+
+    chain = []
+    for height in range(1, blocks + 1):
+        count = rng.randint(1, tx_per_block)
+        parties = rng.choices(addresses, weights, k=2 * count)
+        transactions = [{
+            "sender": parties[2 * i],
+            "receiver": parties[2 * i + 1],
+            "amount": 1.0,
+            "timestamp": float(height)
+        } for i in range(count)]
+        transactions.append({
+            "sender": "Network Reward",
+            "receiver": rng.choice(miners),
+            "amount": 10,
+            "timestamp": float(height),
+            "type": "REWARD"
+        })
+        chain.append(Block(height, float(height), transactions, "0"))
+    return chain, addresses
+
+
+def scan(chain, address: str, use_bloom: bool):
+    """
+    Collect an address's transactions, optionally skipping blocks by Bloom filter.
+
+    Returns:
+        (number of matching transactions, number of blocks skipped)
+    """
+    probe = BloomProbe(address)
+    found = skipped = 0
+    for block in chain:
+        if use_bloom and not probe.might_be_in(block.bloom):
+            skipped += 1
+            continue
+        for tx in block.transactions:
+            if address == tx["sender"] or address == tx["receiver"]:
+                found += 1
+    return found, skipped
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark per-block address Bloom filters")
+    parser.add_argument("--blocks", type=int, default=5000)
+    parser.add_argument("--wallets", type=int, default=2000)
+    parser.add_argument("--tx-per-block", type=int, default=20)
+    parser.add_argument("--samples", type=int, default=200, help="Addresses to scan")
+    args = parser.parse_args()
+
+    chain, addresses = synthetic_chain(args.blocks, args.wallets, args.tx_per_block)
+    rng = random.Random(1)
+    # Mix of busy (low-rank) and ordinary wallets
+    sample = addresses[:args.samples // 4] + rng.sample(addresses, args.samples - args.samples // 4)
+
+    print(f"{len(chain)} blocks, {sum(len(b.transactions) for b in chain)} transactions, "
+          f"{len(sample)} addresses scanned")
+    print(f"{'fp rate':>8} {'avg bits':>9} {'skipped':>9} {'ideal':>9} {'observed fp':>12} "
+          f"{'scan ms':>9} {'full ms':>9}")
+
+    for fp_rate in (0.1, 0.01, 0.001):
+        for block in chain:
+            block.bloom = BloomFilter.from_items(
+                [a for tx in block.transactions for a in (tx["sender"], tx["receiver"])], fp_rate)
+        avg_bits = sum(block.bloom.size for block in chain) / len(chain)
+
+        skipped = ideal = false_positive = 0
+        bloom_time = full_time = 0.0
+        for address in sample:
+            start = time.perf_counter()
+            found, block_skips = scan(chain, address, True)
+            bloom_time += time.perf_counter() - start
+
+            start = time.perf_counter()
+            expected, _ = scan(chain, address, False)
+            full_time += time.perf_counter() - start
+            assert found == expected
+
+            involved = sum(1 for block in chain if any(
+                address in (tx["sender"], tx["receiver"]) for tx in block.transactions))
+            skipped += block_skips
+            ideal += len(chain) - involved
+            false_positive += len(chain) - involved - block_skips
+
+        total = len(chain) * len(sample)
+        print(f"{fp_rate:>8} {avg_bits:>9.0f} {skipped / total:>9.1%} {ideal / total:>9.1%} "
+              f"{false_positive / max(ideal, 1):>12.2%} "
+              f"{bloom_time / len(sample) * 1000:>9.2f} {full_time / len(sample) * 1000:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
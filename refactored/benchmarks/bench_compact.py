@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+"""
+Compact Block Relay Benchmark
+-----------------------------
+Starts N local nodes, gossips transactions so every pending pool holds them,
+mines blocks and compares the bytes spent relaying each block as compact
+blocks (header plus short transaction ids) against sending full blocks.
+Some transactions can be kept off the gossip network (--unrelayed) so
+receivers must request them, which exercises get_block_txn.
+
+Usage:
+    python benchmarks/bench_compact.py [--nodes 8] [--txs 200] [--unrelayed 5] [--blocks 3]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from blockchain.transaction import Transaction
+from bench_propagation import create_nodes, connect_random
+
+
+async def wait_until(condition, timeout: float) -> None:
+    """Poll until a condition holds."""
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        if time.perf_counter() > deadline:
+            raise asyncio.TimeoutError()
+        await asyncio.sleep(0.005)
+
+
+async def run(args, compact: bool) -> dict:
+    rng = random.Random(args.seed)
+    root = tempfile.mkdtemp(prefix="bench_compact_")
+    try:
+        nodes = create_nodes(args.nodes, args.difficulty, root)
+        for node in nodes:
+            node.compact_blocks = compact
+            await node.start()
+        await connect_random(nodes, args.degree, rng)
+
+        propagation = []
+        for round_number in range(args.blocks):
+            origin = rng.choice(nodes)
+            for i in range(args.txs):
+                sender = rng.choice(nodes)
+                await sender.submit_transaction(
+                    Transaction(f"s{round_number}-{i}", "receiver", 1.0).to_dict())
+            await wait_until(lambda: all(len(node.blockchain.pending_transactions) >= args.txs
+                                         for node in nodes), args.timeout)
+            # Transactions only the origin knows about
+            for i in range(args.unrelayed):
+                origin.blockchain.add_pending_transaction(
+                    Transaction(f"u{round_number}-{i}", "receiver", 1.0).to_dict())
+
+            block = await origin.mine("miner")
+            started = time.perf_counter()
+            await wait_until(lambda: all(node.blockchain.get_last_block().hash == block.hash
+                                         for node in nodes), args.timeout)
+            propagation.append(time.perf_counter() - started)
+
+        totals = {
+            "sent": sum(node.relay_stats.block_bytes_sent + node.relay_stats.txn_bytes_sent
+                        for node in nodes),
+            "full": sum(node.relay_stats.full_block_bytes for node in nodes),
+            "announcements": sum(node.relay_stats.blocks_sent for node in nodes),
+            "requested": sum(node.relay_stats.transactions_requested for node in nodes),
+            "rebuild": [seconds for node in nodes for seconds in node.relay_stats.reconstruct_seconds],
+            "propagation": propagation,
+        }
+        for node in nodes:
+            await node.stop()
+        return totals
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure compact block relay")
+    parser.add_argument("--nodes", type=int, default=8)
+    parser.add_argument("--degree", type=int, default=2, help="Outbound connections per node")
+    parser.add_argument("--txs", type=int, default=200, help="Gossiped transactions per block")
+    parser.add_argument("--unrelayed", type=int, default=5,
+                        help="Transactions per block only the miner knows")
+    parser.add_argument("--blocks", type=int, default=3)
+    parser.add_argument("--difficulty", type=int, default=2)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{args.nodes} nodes, {args.txs} gossiped + {args.unrelayed} unrelayed transactions "
+          f"per block, {args.blocks} blocks")
+    for compact in (False, True):
+        with contextlib.redirect_stdout(io.StringIO()):
+            totals = asyncio.run(run(args, compact))
+        per_block = totals["sent"] / args.blocks
+        label = "compact" if compact else "full"
+        print(f"{label:>8}: {per_block:>10,.0f} relay bytes/block "
+              f"({totals['sent'] / max(totals['full'], 1):.1%} of full), "
+              f"propagation median {statistics.median(totals['propagation']) * 1000:.1f} ms")
+        if compact:
+            rebuild = sorted(totals["rebuild"])
+            print(f"{'':>8}  {totals['requested']} transactions requested with get_block_txn; "
+                  f"rebuild median {statistics.median(rebuild) * 1000:.2f} ms, "
+                  f"max {rebuild[-1] * 1000:.2f} ms over {len(rebuild)} rebuilds")
+
+
+if __name__ == "__main__":
+    main()
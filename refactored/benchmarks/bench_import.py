@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+"""
+Bulk Import Benchmark
+---------------------
+Creates wallets for synthetic names on top of an existing set of wallets,
+once one at a time the way WalletUI.create_wallet does (a linear duplicate
+check, then loading, appending to and saving wallets.json and contacts.json
+for every wallet) and once with BulkImporter from a JSONL file.
+
+The one-at-a-time path rewrites both files for every wallet, so it gets
+slower as they grow; it is run for at most --single wallets.
+
+Usage:
+    python benchmarks/bench_import.py [--existing 10000] [--records 1000,10000,50000] [--single 200]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import string
+import sys
+import tempfile
+import time
+from uuid import uuid4
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tabulate import tabulate
+from data.bulk_import import BulkImporter, read_records
+from data.data_handler import DataHandler
+
+
+def name(i: int) -> str:
+    """A distinct name made of letters only, as the name validation requires."""
+    letters = []
+    i += 26 * 27
+    while i:
+        i, digit = divmod(i, 26)
+        letters.append(string.ascii_lowercase[digit])
+    return "".join(reversed(letters)).capitalize()
+
+
+def prepare(root: str, existing: int) -> DataHandler:
+    """A data directory with existing wallets and matching contacts."""
+    handler = DataHandler(root)
+    addresses = [uuid4().hex for _ in range(existing)]
+    handler.save_wallets([{"address": address, "nickname": f"Existing {name(i)}", "balance": 100}
+                          for i, address in enumerate(addresses)])
+    handler.save_contacts([{"first_name": "Existing", "last_name": name(i), "address": address}
+                           for i, address in enumerate(addresses)])
+    return handler
+
+
+def create_one_at_a_time(handler: DataHandler, count: int) -> None:
+    """Create wallets like WalletUI.create_wallet, without the prompts."""
+    for i in range(count):
+        first_name, last_name = "New", name(i)
+        if handler.name_exists_in_contacts(first_name, last_name):
+            continue
+        address = uuid4().hex
+        wallets = handler.load_wallets()
+        wallets.append({"address": address, "nickname": f"{first_name} {last_name}", "balance": 100})
+        handler.save_wallets(wallets)
+        contacts = handler.load_contacts()
+        contacts.append({"first_name": first_name, "last_name": last_name, "address": address})
+        handler.save_contacts(contacts)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare one-at-a-time and bulk wallet creation")
+    parser.add_argument("--existing", type=int, default=10_000, help="Wallets already in the data directory")
+    parser.add_argument("--records", default="1000,10000,50000", help="Comma-separated batch sizes")
+    parser.add_argument("--single", type=int, default=200,
+                        help="Most wallets to create one at a time (default: 200)")
+    args = parser.parse_args()
+
+    rows = []
+    for count in (int(value) for value in args.records.split(",")):
+        root = tempfile.mkdtemp(prefix="bench_import_")
+        try:
+            single = min(count, args.single)
+            handler = prepare(root, args.existing)
+            started = time.perf_counter()
+            create_one_at_a_time(handler, single)
+            single_seconds = time.perf_counter() - started
+
+            handler = prepare(root, args.existing)
+            import_file = os.path.join(root, "import.jsonl")
+            with open(import_file, "w") as f:
+                for i in range(count):
+                    f.write(json.dumps({"first_name": "New", "last_name": name(i)}) + "\n")
+            started = time.perf_counter()
+            result = BulkImporter(handler).import_records(read_records(import_file))
+            bulk_seconds = time.perf_counter() - started
+            assert result["wallets"] == count and len(handler.load_contacts()) == args.existing + count
+
+            per_single = single_seconds / single
+            rows.append([f"{count:,}", f"{single:,}", f"{single_seconds:.2f}", f"{per_single * 1000:.2f}",
+                         f"{bulk_seconds:.2f}", f"{bulk_seconds / count * 1000:.3f}",
+                         f"{per_single * count / bulk_seconds:,.0f}x"])
+        finally:
+            shutil.rmtree(root, ignore_errors=True)
+
+    print(tabulate(rows, headers=["Records", "Created singly", "Singly s", "Singly ms per wallet",
+                                  "Bulk s", "Bulk ms per wallet", "Speedup (at least)"],
+                   tablefmt="simple_grid", disable_numparse=True))
+
+
+if __name__ == "__main__":
+    main()
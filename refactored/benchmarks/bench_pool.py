@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+"""
+Mining Pool Benchmark
+---------------------
+Mines blocks on a temporary chain with the single-process proof_of_work loop
+and then with a pool coordinator driving 1..N local worker processes, and
+reports hashrate for each. Pool hashrate is shown both as estimated from
+accepted shares and as reported by the workers.
+
+Usage:
+    python benchmarks/bench_pool.py [--workers 4] [--blocks 3] [--difficulty 5]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from blockchain.blockchain import Blockchain
+from blockchain.transaction import Transaction
+from data.data_handler import DataHandler
+from mining.pool import PoolCoordinator, spawn_workers, stop_workers, wait_for_workers
+
+
+def fresh_chain(root: str, name: str, difficulty: int) -> Blockchain:
+    """Create a chain in its own data directory."""
+    directory = os.path.join(root, name)
+    os.makedirs(directory)
+    return Blockchain(DataHandler(directory), difficulty=difficulty)
+
+
+def add_pending(blockchain: Blockchain, count: int) -> None:
+    """Queue a block's worth of transfers."""
+    for i in range(count):
+        blockchain.add_pending_transaction(Transaction(f"sender{i}", "receiver", 1.0).to_dict())
+
+
+def bench_single(root: str, args) -> tuple:
+    """Mine with Blockchain.proof_of_work; returns (seconds, hashes)."""
+    blockchain = fresh_chain(root, "single", args.difficulty)
+    seconds = hashes = 0
+    for _ in range(args.blocks):
+        add_pending(blockchain, args.tx_per_block)
+        block = blockchain.prepare_block("miner")
+        started = time.perf_counter()
+        block.nonce = blockchain.proof_of_work(block)
+        seconds += time.perf_counter() - started
+        hashes += block.nonce + 1
+        block.hash = block.calculate_hash()
+        blockchain.commit_block(block, "miner")
+    return seconds, hashes
+
+
+async def bench_pool(root: str, workers: int, args) -> tuple:
+    """Mine with a pool of local worker processes; returns (seconds, report rows)."""
+    blockchain = fresh_chain(root, f"pool{workers}", args.difficulty)
+    coordinator = PoolCoordinator(blockchain, "miner")
+    await coordinator.start()
+    processes = spawn_workers(coordinator.host, coordinator.port, workers)
+    try:
+        await wait_for_workers(coordinator, processes, workers)
+        seconds = 0.0
+        for _ in range(args.blocks):
+            add_pending(blockchain, args.tx_per_block)
+            started = time.perf_counter()
+            await coordinator.mine_block()
+            seconds += time.perf_counter() - started
+        return seconds, coordinator.report()
+    finally:
+        await coordinator.stop()
+        stop_workers(processes)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare single-process and pool mining")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Largest number of worker processes to try")
+    parser.add_argument("--blocks", type=int, default=3)
+    parser.add_argument("--difficulty", type=int, default=5)
+    parser.add_argument("--tx-per-block", type=int, default=10)
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="bench_pool_")
+    try:
+        print(f"difficulty {args.difficulty}, {args.blocks} blocks, {os.cpu_count()} CPUs")
+        with contextlib.redirect_stdout(io.StringIO()):
+            seconds, hashes = bench_single(root, args)
+        print(f"{'single process':>16}: {seconds:6.2f}s  {hashes / seconds:>12,.0f} H/s")
+
+        counts = sorted({1, 2, args.workers} & set(range(1, args.workers + 1)))
+        for workers in counts:
+            with contextlib.redirect_stdout(io.StringIO()):
+                seconds, report = asyncio.run(bench_pool(root, workers, args))
+            estimated = sum(row["estimated_hashrate"] for row in report)
+            reported = sum(row["reported_hashrate"] for row in report)
+            print(f"{f'pool, {workers} workers':>16}: {seconds:6.2f}s  {reported:>12,.0f} H/s "
+                  f"reported, {estimated:,.0f} H/s from shares")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
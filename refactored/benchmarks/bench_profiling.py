@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+"""
+Collapsed Stack Benchmark
+-------------------------
+Times utils.profiling.collapsed_stacks() on profiles whose call graphs have
+many paths, and checks that the stacks still add up to the profiled time:
+
+    diamond     a layered call graph in which every function is called from
+                both functions of the layer above, so the number of paths
+                doubles with every layer while the profile stays small
+    cold_start  constructing a Blockchain on a synthetic chain without a
+                chain cache, as the menu does on startup
+
+Exits with status 1 if collapsing takes longer than --limit seconds or the
+stacks are off from the profiled time by more than 1%.
+
+Usage:
+    python benchmarks/bench_profiling.py [--layers 8,16,24] [--blocks 1000] [--limit 2]
+"""
+
+import argparse
+import contextlib
+import cProfile
+import io
+import os
+import pstats
+import random
+import shutil
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tabulate import tabulate
+from blockchain.blockchain import Blockchain
+from data.chain_cache import ChainCache
+from data.data_handler import DataHandler
+from utils.profiling import collapsed_stacks
+from regression import write_chain
+
+
+def diamond(layers: int, runs: int = 200) -> Callable[[], None]:
+    """
+    Build a call graph of `layers` layers with two functions each. Every call
+    goes down one randomly chosen function per layer, so after a few runs
+    every function has been called from both functions of the layer above:
+    the profile is small, but there are 2 ** layers paths through it.
+
+    Returns:
+        Function making `runs` calls from the top layer to the bottom
+    """
+    namespace: Dict[str, Any] = {"random": random.Random(0)}
+    source = []
+    for layer in range(layers):
+        for side in "ab":
+            if layer == layers - 1:
+                body = "    sum(range(20_000))\n"
+            else:
+                body = (f"    if random.random() < 0.5:\n        layer{layer + 1}a()\n"
+                        f"    else:\n        layer{layer + 1}b()\n")
+            source.append(f"def layer{layer}{side}():\n{body}")
+    source.append(f"def top():\n    for _ in range({runs}):\n"
+                  f"        layer0a() if random.random() < 0.5 else layer0b()\n")
+    exec(compile("".join(source), "<diamond>", "exec"), namespace)
+    return namespace["top"]
+
+
+def profile(func: Callable[[], None]) -> pstats.Stats:
+    """Run a function under cProfile."""
+    profiler = cProfile.Profile()
+    profiler.runcall(func)
+    return pstats.Stats(profiler)
+
+
+def measure(name: str, stats: pstats.Stats):
+    """
+    Returns:
+        Table row: name, functions, calls, profiled ms, collapsed ms, stacks, seconds to collapse
+    """
+    total = stats.total_tt
+    started = time.perf_counter()
+    stacks = collapsed_stacks(stats)
+    seconds = time.perf_counter() - started
+    collapsed = sum(stacks.values()) / 1000
+    return [name, len(stats.stats), stats.total_calls, total * 1000, collapsed, len(stacks), seconds]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Time collapsed_stacks on call graphs with many paths")
+    parser.add_argument("--layers", default="8,16,24", help="Comma-separated diamond depths")
+    parser.add_argument("--blocks", type=int, default=1000, help="Chain length of the cold start")
+    parser.add_argument("--limit", type=float, default=2.0, help="Slowest acceptable collapse in seconds")
+    args = parser.parse_args()
+
+    rows = []
+    for layers in (int(value) for value in args.layers.split(",")):
+        rows.append(measure(f"diamond, {layers} layers", profile(diamond(layers))))
+
+    root = tempfile.mkdtemp(prefix="bench_profiling_")
+    try:
+        write_chain(root, args.blocks)
+        handler = DataHandler(root)
+        os.remove(ChainCache(handler).cache_file)
+
+        def cold_start():
+            with contextlib.redirect_stdout(io.StringIO()):
+                Blockchain(handler).chain_cache.wait()
+        rows.append(measure(f"cold_start, {args.blocks:,} blocks", profile(cold_start)))
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    failed = False
+    table = []
+    for name, functions, calls, total, collapsed, stacks, seconds in rows:
+        ok = seconds <= args.limit and abs(collapsed - total) <= total * 0.01
+        failed = failed or not ok
+        table.append([name, f"{functions:,}", f"{calls:,}", f"{total:,.1f}", f"{collapsed:,.1f}",
+                      f"{stacks:,}", f"{seconds:.3f}", "ok" if ok else "FAILED"])
+    print(tabulate(table, headers=["Profile", "Functions", "Calls", "Profiled ms", "In stacks ms",
+                                   "Stacks", "Collapse s", "Status"],
+                   tablefmt="simple_grid", disable_numparse=True))
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
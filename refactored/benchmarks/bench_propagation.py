@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+"""
+Block Propagation Benchmark
+---------------------------
+Starts N nodes on localhost in one process, each with its own data directory
+seeded from a shared genesis block, connects them in a random topology, then
+repeatedly mines a block on one node and measures how long the block takes to
+be validated and appended by every other node.
+
+Usage:
+    python benchmarks/bench_propagation.py [--nodes 8] [--degree 2] [--blocks 5]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from blockchain.blockchain import Blockchain
+from blockchain.transaction import Transaction
+from data.data_handler import DataHandler
+from network.node import Node
+
+
+def create_nodes(count: int, difficulty: int, root: str):
+    """
+    Create nodes whose data directories share one genesis block.
+
+    Args:
+        count: Number of nodes
+        difficulty: Proof-of-work difficulty
+        root: Directory that will hold one data directory per node
+
+    Returns:
+        List of Node objects (not yet started)
+    """
+    genesis_dir = os.path.join(root, "genesis")
+    os.makedirs(genesis_dir)
+    Blockchain(DataHandler(genesis_dir), difficulty=difficulty)
+
+    nodes = []
+    for i in range(count):
+        node_dir = os.path.join(root, f"node{i}")
+        os.makedirs(node_dir)
+        shutil.copy(os.path.join(genesis_dir, "blockchain.json"), node_dir)
+        nodes.append(Node(Blockchain(DataHandler(node_dir), difficulty=difficulty)))
+    return nodes
+
+
+async def connect_random(nodes, degree: int, rng: random.Random) -> None:
+    """
+    Connect each node to up to `degree` earlier nodes, which keeps the graph connected.
+
+    Args:
+        nodes: Started nodes
+        degree: Outbound connections per node
+        rng: Random source
+    """
+    for i, node in enumerate(nodes[1:], 1):
+        for target in rng.sample(nodes[:i], min(degree, i)):
+            await node.connect(target.host, target.port)
+    # Let hello messages settle
+    await asyncio.sleep(0.2)
+
+
+async def run(args) -> list:
+    rng = random.Random(args.seed)
+    root = tempfile.mkdtemp(prefix="bench_propagation_")
+    try:
+        nodes = create_nodes(args.nodes, args.difficulty, root)
+        for node in nodes:
+            await node.start()
+        await connect_random(nodes, args.degree, rng)
+
+        results = []
+        for round_number in range(args.blocks):
+            origin = rng.choice(nodes)
+            mined_at = {}
+            arrivals = {}
+            done = asyncio.Event()
+
+            # Timestamp the block the moment the origin appends it
+            listener = lambda block: mined_at.setdefault(block.hash, time.perf_counter())
+            origin.blockchain.block_listeners.append(listener)
+
+            def on_block(block, node):
+                arrivals[node.port] = time.perf_counter()
+                if len(arrivals) == len(nodes) - 1:
+                    done.set()
+
+            for node in nodes:
+                node.block_handlers[:] = [] if node is origin else [lambda b, n=node: on_block(b, n)]
+
+            await origin.submit_transaction(
+                Transaction(f"sender{round_number}", "receiver", 1.0).to_dict())
+            block = await origin.mine("miner")
+            await asyncio.wait_for(done.wait(), args.timeout)
+            origin.blockchain.block_listeners.remove(listener)
+
+            start = mined_at[block.hash]
+            results.append(sorted(arrival - start for arrival in arrivals.values()))
+
+        for node in nodes:
+            await node.stop()
+        return results
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure block propagation across local nodes")
+    parser.add_argument("--nodes", type=int, default=8)
+    parser.add_argument("--degree", type=int, default=2, help="Outbound connections per node")
+    parser.add_argument("--blocks", type=int, default=5, help="Blocks to mine")
+    parser.add_argument("--difficulty", type=int, default=2)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    # The blockchain reports every save; keep the benchmark output readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = asyncio.run(run(args))
+
+    print(f"{args.nodes} nodes, {args.degree} outbound connections each")
+    print(f"{'block':>5} {'first ms':>9} {'median ms':>10} {'all ms':>8}")
+    for i, delays in enumerate(results, 1):
+        print(f"{i:>5} {delays[0] * 1000:>9.1f} {statistics.median(delays) * 1000:>10.1f} "
+              f"{delays[-1] * 1000:>8.1f}")
+    print(f"Mean time to reach all nodes: "
+          f"{statistics.mean(delays[-1] for delays in results) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
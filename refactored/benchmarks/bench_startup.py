@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+"""
+Chain Cache Startup Benchmark
+-----------------------------
+Writes synthetic chains of several lengths and times constructing a
+Blockchain on them cold (no blockchain.cache: parse the JSON, rehash every
+block, rewrite the file and sync the indexes) and warm (unpickle the chain
+and indexes from the cache after checking blockchain.json's SHA-256), plus
+how long the background cache rebuild after a cold start takes.
+
+Usage:
+    python benchmarks/bench_startup.py [--blocks 1000,10000,100000] [--repeat 3]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tabulate import tabulate
+from blockchain.blockchain import Blockchain
+from data.chain_cache import ChainCache, content_hash
+from data.data_handler import DataHandler
+from regression import write_chain
+
+
+def start(root: str):
+    """
+    Construct a Blockchain on a data directory and wait for its cache rebuild.
+
+    Returns:
+        (seconds until the Blockchain was ready, seconds the cache rebuild took after that)
+    """
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        blockchain = Blockchain(DataHandler(root))
+    ready = time.perf_counter()
+    blockchain.chain_cache.wait()
+    return ready - started, time.perf_counter() - ready
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare cold and warm startup with the chain cache")
+    parser.add_argument("--blocks", default="1000,10000,100000", help="Comma-separated chain lengths")
+    parser.add_argument("--repeat", type=int, default=3, help="Starts per measurement; the fastest counts")
+    args = parser.parse_args()
+
+    rows = []
+    for blocks in (int(value) for value in args.blocks.split(",")):
+        root = tempfile.mkdtemp(prefix="bench_startup_")
+        try:
+            print(f"Writing {blocks:,} blocks...", flush=True)
+            write_chain(root, blocks)
+            handler = DataHandler(root)
+            cache_file = ChainCache(handler).cache_file
+
+            cold = rebuild = warm = float("inf")
+            for _ in range(args.repeat):
+                os.remove(cache_file)
+                seconds, rebuilt = start(root)
+                cold, rebuild = min(cold, seconds), min(rebuild, rebuilt)
+            for _ in range(args.repeat):
+                warm = min(warm, start(root)[0])
+            started = time.perf_counter()
+            content_hash(handler.blockchain_file)
+            hashing = time.perf_counter() - started
+
+            rows.append([f"{blocks:,}", f"{os.path.getsize(handler.blockchain_file) / 2**20:,.1f}",
+                         f"{os.path.getsize(cache_file) / 2**20:,.1f}", f"{cold:.3f}", f"{warm:.3f}",
+                         f"{hashing:.3f}", f"{cold / warm:.1f}x", f"{rebuild:.3f}"])
+        finally:
+            shutil.rmtree(root, ignore_errors=True)
+
+    print(tabulate(rows, headers=["Blocks", "JSON MiB", "Cache MiB", "Cold s", "Warm s",
+                                  "Hash check s", "Speedup", "Rebuild s"],
+                   tablefmt="simple_grid", disable_numparse=True))
+
+
+if __name__ == "__main__":
+    main()
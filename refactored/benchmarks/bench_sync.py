@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+"""
+Chain Sync Benchmark
+--------------------
+Builds a source chain, serves it from several local stand-in peers, and
+measures headers-first sync throughput (blocks/sec) for a fresh node.
+With --interrupt the first sync is cancelled halfway and a restarted node
+resumes from the last applied height.
+
+Usage:
+    python benchmarks/bench_sync.py [--blocks 2000] [--peers 4] [--window 100] [--interrupt]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from blockchain.block import Block
+from blockchain.blockchain import Blockchain
+from blockchain.transaction import Transaction
+from data.data_handler import DataHandler
+from network.node import Node
+from network import sync as chain_sync
+
+
+def build_source_chain(directory: str, blocks: int, tx_per_block: int, difficulty: int) -> None:
+    """
+    Mine a chain of synthetic blocks into a data directory.
+
+    Args:
+        directory: Data directory to create the chain in
+        blocks: Number of blocks to add after genesis
+        tx_per_block: Transfers per block
+        difficulty: Proof-of-work difficulty
+    """
+    blockchain = Blockchain(DataHandler(directory), difficulty=difficulty)
+    new_blocks = []
+    previous = blockchain.get_last_block()
+    for height in range(1, blocks + 1):
+        transactions = [Transaction(f"wallet{i}", f"wallet{i + 1}", 1.0).to_dict()
+                        for i in range(tx_per_block)]
+        transactions.append(Transaction("Network Reward", "miner", blockchain.mining_reward,
+                                        tx_type='REWARD').to_dict())
+        block = Block(height, time.time(), transactions, previous.hash)
+        block.nonce = blockchain.proof_of_work(block)
+        block.hash = block.calculate_hash()
+        new_blocks.append(block)
+        previous = block
+    blockchain.add_blocks(new_blocks)
+
+
+def copy_genesis(source: str, target: str) -> None:
+    """Create a data directory holding only the source chain's genesis block."""
+    os.makedirs(target)
+    handler = DataHandler(target)
+    handler.save_blockchain(DataHandler(source).load_blockchain()[:1])
+
+
+async def start_peers(source: str, root: str, count: int, difficulty: int):
+    """Start `count` nodes serving copies of the source chain."""
+    peers = []
+    for i in range(count):
+        peer_dir = os.path.join(root, f"peer{i}")
+        shutil.copytree(source, peer_dir)
+        node = Node(Blockchain(DataHandler(peer_dir), difficulty=difficulty), auto_sync=False)
+        await node.start()
+        peers.append(node)
+    return peers
+
+
+async def sync_once(directory: str, peers, difficulty: int, window: int, stop_at=None):
+    """
+    Start a node on a data directory, connect it to the peers and sync.
+
+    Args:
+        directory: Data directory of the syncing node
+        peers: Started peer nodes
+        difficulty: Proof-of-work difficulty
+        window: Blocks per body request
+        stop_at: Cancel the sync once this height is reached
+
+    Returns:
+        (SyncStats or None if cancelled, chain length when the node started)
+    """
+    node = Node(Blockchain(DataHandler(directory), difficulty=difficulty), auto_sync=False)
+    start_height = len(node.blockchain.chain)
+    await node.start()
+    for peer in peers:
+        await node.connect(peer.host, peer.port)
+    # Wait for every hello so peer heights are known
+    while sum(1 for peer in node.peers if peer.height) < len(peers):
+        await asyncio.sleep(0.01)
+
+    task = asyncio.ensure_future(node.sync(window))
+    if stop_at is not None:
+        node.block_handlers.append(
+            lambda block: task.cancel() if block.index >= stop_at else None)
+    try:
+        stats = await task
+    except asyncio.CancelledError:
+        stats = None
+    await node.stop()
+    return stats, start_height
+
+
+async def run(args):
+    root = tempfile.mkdtemp(prefix="bench_sync_")
+    try:
+        source = os.path.join(root, "source")
+        os.makedirs(source)
+        build_source_chain(source, args.blocks, args.tx_per_block, args.difficulty)
+        peers = await start_peers(source, root, args.peers, args.difficulty)
+
+        fresh = os.path.join(root, "fresh")
+        copy_genesis(source, fresh)
+        report = []
+        if args.interrupt:
+            await sync_once(fresh, peers, args.difficulty, args.window, stop_at=args.blocks // 2)
+            stats, resumed_from = await sync_once(fresh, peers, args.difficulty, args.window)
+            report.append(f"Interrupted at half way; restarted node resumed from height {resumed_from}")
+        else:
+            stats, _ = await sync_once(fresh, peers, args.difficulty, args.window)
+        report.append(str(stats))
+
+        for peer in peers:
+            await peer.stop()
+        return report
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure headers-first chain sync throughput")
+    parser.add_argument("--blocks", type=int, default=2000)
+    parser.add_argument("--tx-per-block", type=int, default=5)
+    parser.add_argument("--peers", type=int, default=4)
+    parser.add_argument("--window", type=int, default=chain_sync.DEFAULT_WINDOW)
+    parser.add_argument("--difficulty", type=int, default=2)
+    parser.add_argument("--interrupt", action="store_true",
+                        help="Cancel the first sync halfway and resume with a restarted node")
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        report = asyncio.run(run(args))
+    print(f"{args.blocks} blocks from {args.peers} peers, window {args.window}")
+    for line in report:
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
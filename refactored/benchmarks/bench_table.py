@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+"""
+Table Rendering Benchmark
+-------------------------
+Renders a wallet history of synthetic transactions with tabulate, as the
+history view used to, and with the streaming GridTable it uses now. Reports
+the total time, the time until the first row is written and the peak memory
+of each, and checks that both produce the same text.
+
+Usage:
+    python benchmarks/bench_table.py [--rows 1000,10000]
+"""
+
+import argparse
+import hashlib
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tabulate import tabulate
+from ui.transaction_ui import HISTORY_WIDTHS
+from utils.formatting import (
+    format_address_with_name, format_amount, format_timestamp, format_type, pad_to_width
+)
+from utils.table import GridTable
+from bench_bloom import synthetic_chain
+
+HEADERS = [pad_to_width('Type', 14), pad_to_width('Amount', 14), pad_to_width('From', 50),
+           pad_to_width('To', 50), pad_to_width('Time', 21)]
+
+
+class Sink:
+    """
+    Output stream that keeps only a hash of what was written and when it was
+    first written to, so the text itself doesn't count towards peak memory.
+    """
+    def __init__(self):
+        self.digest = hashlib.sha256()
+        self.first = None
+
+    def write(self, s: str) -> int:
+        if self.first is None:
+            self.first = time.perf_counter()
+        self.digest.update(s.encode())
+        return len(s)
+
+
+def format_row(tx, contacts, wallets):
+    """A history row as the history view formats it."""
+    return [format_type((tx.get('type') or 'UNKNOWN').upper()), format_amount(tx['amount']),
+            format_address_with_name(tx['sender'], contacts, wallets, is_sender=True),
+            format_address_with_name(tx['receiver'], contacts, wallets),
+            format_timestamp(tx['timestamp'])]
+
+
+def render_tabulate(transactions, contacts, wallets, out) -> None:
+    """Build every row, then render the table in one call."""
+    rows = [format_row(tx, contacts, wallets) for tx in transactions]
+    out.write(tabulate(rows, headers=HEADERS, tablefmt="simple_grid",
+                       colalign=("center",) * 5, disable_numparse=True) + "\n")
+
+
+def render_streaming(transactions, contacts, wallets, out) -> None:
+    """Write each row as soon as it is formatted."""
+    with GridTable(HISTORY_WIDTHS, ["center"] * 5, HEADERS, out) as table:
+        for tx in transactions:
+            table.add_row(format_row(tx, contacts, wallets))
+
+
+def measure(render, transactions, contacts, wallets):
+    """
+    Returns:
+        (hash of the output, total seconds, seconds to the first write,
+        peak MiB traced while rendering)
+    """
+    out = Sink()
+    tracemalloc.start()
+    started = time.perf_counter()
+    render(transactions, contacts, wallets, out)
+    total = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return out.digest.hexdigest(), total, out.first - started, peak / 2**20
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare tabulate with the streaming table renderer")
+    parser.add_argument("--rows", default="1000,10000", help="Comma-separated row counts")
+    args = parser.parse_args()
+
+    rows = []
+    for count in (int(value) for value in args.rows.split(",")):
+        chain, addresses = synthetic_chain(count // 9 + 1, 100, 9, 0)
+        transactions = [tx for block in chain for tx in block.transactions][:count]
+        wallets = [{"address": address, "nickname": f"Wallet {i}", "balance": 0.0}
+                   for i, address in enumerate(addresses[:50])]
+        contacts = [{"first_name": "Contact", "last_name": str(i), "address": address}
+                    for i, address in enumerate(addresses[50:])]
+        expected, old_total, old_first, old_peak = measure(render_tabulate, transactions, contacts, wallets)
+        output, new_total, new_first, new_peak = measure(render_streaming, transactions, contacts, wallets)
+        rows.append([f"{count:,}", f"{old_total:.3f}", f"{new_total:.3f}", f"{old_total / new_total:.1f}x",
+                     f"{old_first * 1000:,.1f}", f"{new_first * 1000:,.3f}",
+                     f"{old_peak:,.1f}", f"{new_peak:,.2f}",
+                     "yes" if output == expected else "NO"])
+
+    print(tabulate(rows, headers=["Rows", "tabulate s", "Streaming s", "Speedup", "First row ms (tabulate)",
+                                  "First row ms (streaming)", "Peak MiB (tabulate)",
+                                  "Peak MiB (streaming)", "Same output"],
+                   tablefmt="simple_grid", disable_numparse=True))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+"""
+Block Relay Validation Check
+----------------------------
+Starts two nodes on localhost. One relays blocks that carry valid proof of
+work but a malformed transaction (no id, a NaN or string amount, no
+timestamp, a missing or inflated mining reward, ...), then one valid block.
+The other node must reject every malformed block without storing or
+relaying it, accept the valid one, and keep its transaction and time
+indexes in step with its chain.
+
+Exits with status 1 if a malformed block was accepted or the indexes
+fell out of step.
+
+Usage:
+    python benchmarks/check_block_relay.py [--difficulty 2]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from blockchain.block import Block
+from blockchain.transaction import Transaction
+from bench_propagation import create_nodes
+
+
+def transfer(**changes: Any) -> Dict[str, Any]:
+    """A valid transfer with some fields replaced (None removes the field)."""
+    tx = Transaction("alice", "bob", 1.0).to_dict()
+    for field, value in changes.items():
+        if value is None:
+            tx.pop(field, None)
+        else:
+            tx[field] = value
+    return tx
+
+
+def reward(amount: float = 10) -> Dict[str, Any]:
+    """A mining reward transaction."""
+    return Transaction("Network Reward", "miner", amount, tx_type='REWARD').to_dict()
+
+
+# Name -> transactions of a block that must be rejected
+BAD_BLOCKS = {
+    "transfer without id": [transfer(id=None), reward()],
+    "NaN amount": [transfer(amount=float("nan")), reward()],
+    "string amount": [transfer(amount="5"), reward()],
+    "boolean amount": [transfer(amount=True), reward()],
+    "negative amount": [transfer(amount=-1.0), reward()],
+    "empty sender": [transfer(sender=""), reward()],
+    "transfer without timestamp": [transfer(timestamp=None), reward()],
+    "transaction that isn't an object": [["alice", "bob", 1.0], reward()],
+    "no reward": [transfer()],
+    "inflated reward": [transfer(), reward(1_000_000)],
+    "two rewards": [reward(), reward()],
+    "no transactions": [],
+}
+
+
+def forge(blockchain, transactions: List[Any]) -> Block:
+    """Mine a block with the given transactions on top of a chain's tip."""
+    tip = blockchain.get_last_block()
+    block = Block(tip.index + 1, time.time(), transactions, tip.hash)
+    block.nonce = blockchain.proof_of_work(block)
+    block.hash = block.calculate_hash()
+    return block
+
+
+async def run(difficulty: int) -> List[str]:
+    """Relay the blocks and return the problems found."""
+    root = tempfile.mkdtemp(prefix="check_block_relay_")
+    try:
+        relay, target = create_nodes(2, difficulty, root)
+        for node in (relay, target):
+            await node.start()
+        await target.connect(relay.host, relay.port)
+        await asyncio.sleep(0.2)
+
+        problems = []
+        chain = target.blockchain
+        for name, transactions in BAD_BLOCKS.items():
+            block = forge(relay.blockchain, transactions)
+            await relay.broadcast({"type": "block", "block": block.to_dict()})
+            await asyncio.sleep(0.1)
+            if chain.block_tree.entries.get(block.hash) or len(chain.chain) != 1:
+                problems.append(f"block with {name} was accepted")
+
+        block = forge(relay.blockchain, [transfer(), reward(chain.mining_reward)])
+        await relay.broadcast({"type": "block", "block": block.to_dict()})
+        await asyncio.sleep(0.2)
+        if chain.get_last_block().hash != block.hash:
+            problems.append("valid block was rejected")
+        if chain.tx_index.height != len(chain.chain) - 1:
+            problems.append(f"transaction index reaches height {chain.tx_index.height} "
+                            f"of {len(chain.chain) - 1}")
+        if len(chain.time_index.block_times) != len(chain.chain):
+            problems.append(f"time index covers {len(chain.time_index.block_times)} "
+                            f"of {len(chain.chain)} blocks")
+
+        for node in (relay, target):
+            await node.stop()
+        return problems
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Check that nodes reject relayed blocks with bad transactions")
+    parser.add_argument("--difficulty", type=int, default=2)
+    args = parser.parse_args()
+
+    # The blockchain reports every save; keep the output readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        problems = asyncio.run(run(args.difficulty))
+
+    print(f"{len(BAD_BLOCKS)} malformed blocks and 1 valid block relayed")
+    if problems:
+        for problem in problems:
+            print(f"FAILED: {problem}")
+        sys.exit(1)
+    print("OK: every malformed block was rejected and the indexes match the chain")
+
+
+if __name__ == "__main__":
+    main()
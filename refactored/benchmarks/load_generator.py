@@ -0,0 +1,406 @@
+#!/usr/bin/env python
+"""
+Synthetic Workload Generator
+----------------------------
+Creates a data directory with N funded wallets and a contact for each of
+them through DataHandler, then replays a mix of the application's
+operations against it from several threads or processes:
+
+    send     the menu's send flow: balance check, create_transaction, wallet
+             balance updates and history records under the chain lock
+    mine     mine_pending_transactions() for a random miner
+    balance  load the wallets and look one up
+    history  load a wallet's history plus the contacts and wallets it is shown with
+
+Operations are issued at a target total rate (or as fast as possible with
+--rate 0). The report gives throughput and latency percentiles per operation,
+how far the workers fell behind the schedule, and how the data files grew
+over time. The same operation list can be written with --record and run again
+with --replay; use --workers 1 for a run whose end state is reproducible.
+
+In process mode every process has its own Blockchain on the shared directory,
+so mines all run in the first worker and senders reload the pending pool
+before adding to it. Threads share one Blockchain, like the menu and the
+auto-miner do.
+
+Usage:
+    python benchmarks/load_generator.py [--wallets 50] [--operations 2000] [--workers 4]
+        [--mode thread|process] [--rate 200] [--mix send=50,mine=2,balance=28,history=20]
+        [--record trace.jsonl | --replay trace.jsonl] [--data-dir DIR]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import random
+import shutil
+import statistics
+import string
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from blockchain.blockchain import Blockchain
+from data.data_handler import DataHandler
+
+OPERATIONS = ("send", "mine", "balance", "history")
+DEFAULT_MIX = "send=50,mine=2,balance=28,history=20"
+STARTING_BALANCE = 1_000_000
+MINING_REWARD = 10
+# Data files whose growth is reported, by column title
+TRACKED_FILES = (("chain", "blockchain.json"), ("completed", "completed_transactions.json"),
+                 ("pending", "pending_transactions.json"), ("tx index", "tx_index.jsonl"))
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    """
+    Parse an operation mix such as "send=50,mine=2".
+
+    Returns:
+        Operation -> weight
+
+    Raises:
+        ValueError: If an operation is unknown or a weight is invalid
+    """
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise ValueError(f"Unknown operation {name!r}, expected one of {', '.join(OPERATIONS)}")
+        mix[name] = float(weight)
+        if mix[name] < 0:
+            raise ValueError(f"Negative weight for {name}")
+    if not any(mix.values()):
+        raise ValueError("The mix needs at least one operation with a positive weight")
+    return mix
+
+
+def contact_name(index: int) -> str:
+    """Alphabetic name for a generated contact (names may only contain letters)."""
+    letters = ""
+    index += 26  # At least two letters
+    while index:
+        index, digit = divmod(index, 26)
+        letters = string.ascii_lowercase[digit] + letters
+    return letters.capitalize()
+
+
+def create_workload_dir(root: str, wallets: int, difficulty: int) -> List[str]:
+    """
+    Create a data directory with a genesis block, funded wallets and a contact
+    for every wallet, all written through DataHandler.
+
+    Returns:
+        List of wallet addresses
+    """
+    handler = DataHandler(root)
+    Blockchain(handler, difficulty=difficulty, mining_reward=MINING_REWARD)
+    addresses = [f"{i:032x}" for i in range(1, wallets + 1)]
+    handler.save_wallets([{"address": address, "nickname": f"Load {i}", "balance": STARTING_BALANCE}
+                          for i, address in enumerate(addresses)])
+    handler.save_contacts([{"first_name": "Load", "last_name": contact_name(i), "address": address}
+                           for i, address in enumerate(addresses)])
+    return addresses
+
+
+def generate_trace(operations: int, mix: Dict[str, float], wallets: int, seed: int) -> List[Dict[str, Any]]:
+    """
+    Draw a list of operations. Wallets are referred to by index so a trace
+    can be replayed on a freshly created directory.
+
+    Returns:
+        List of operation dictionaries
+    """
+    rng = random.Random(seed)
+    names = [name for name in OPERATIONS if mix.get(name)]
+    weights = [mix[name] for name in names]
+    trace = []
+    for name in rng.choices(names, weights, k=operations):
+        if name == "send":
+            sender, receiver = rng.sample(range(wallets), 2)
+            trace.append({"op": "send", "sender": sender, "receiver": receiver,
+                          "amount": round(rng.uniform(0.01, 5), 2)})
+        else:
+            trace.append({"op": name, "wallet": rng.randrange(wallets)})
+    return trace
+
+
+def save_trace(path: str, header: Dict[str, Any], trace: List[Dict[str, Any]]) -> None:
+    """Write a header line followed by one operation per line."""
+    with open(path, "w") as f:
+        f.write(json.dumps(header) + "\n")
+        f.writelines(json.dumps(op) + "\n" for op in trace)
+
+
+def load_trace(path: str) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """
+    Read a trace written by save_trace.
+
+    Returns:
+        (header, operations)
+    """
+    with open(path) as f:
+        lines = [json.loads(line) for line in f if line.strip()]
+    return lines[0], lines[1:]
+
+
+class Workload:
+    """
+    The application's operations on one data directory.
+    """
+    def __init__(self, root: str, addresses: List[str], difficulty: int, reload_pending: bool):
+        """
+        Initialize a workload.
+
+        Args:
+            root: Data directory
+            addresses: Wallet addresses, indexed by the trace
+            difficulty: Proof-of-work difficulty
+            reload_pending: Reload the pending pool before sending, for processes
+                            that share the directory with other Blockchains
+        """
+        self.handler = DataHandler(root)
+        self.blockchain = Blockchain(self.handler, difficulty=difficulty, mining_reward=MINING_REWARD)
+        self.addresses = addresses
+        self.reload_pending = reload_pending
+
+    def run(self, op: Dict[str, Any]) -> None:
+        """
+        Perform one operation.
+
+        Raises:
+            RuntimeError: If a send is refused for lack of funds
+        """
+        name = op["op"]
+        if name == "send":
+            sender, receiver = self.addresses[op["sender"]], self.addresses[op["receiver"]]
+            amount = op["amount"]
+            # The send flow of TransactionUI.send_transaction, with the balance
+            # check inside the lock as in the API
+            with self.blockchain.lock.write():
+                wallet = next(w for w in self.handler.load_wallets() if w["address"] == sender)
+                if wallet["balance"] < amount:
+                    raise RuntimeError("Insufficient balance")
+                if self.reload_pending:
+                    self.blockchain.load_pending_transactions()
+                tx = self.blockchain.create_transaction(sender, receiver, amount)
+                self.handler.update_wallet_balance(sender, -amount)
+                self.handler.update_wallet_balance(receiver, amount)
+                self.handler.record_transaction(tx, sender, "sent")
+                self.handler.record_transaction(tx, receiver, "received")
+        elif name == "mine":
+            self.blockchain.mine_pending_transactions(self.addresses[op["wallet"]])
+        elif name == "balance":
+            address = self.addresses[op["wallet"]]
+            next(w["balance"] for w in self.handler.load_wallets() if w["address"] == address)
+        else:
+            # What TransactionUI.view_transaction_history loads
+            self.handler.load_data(self.handler.get_transaction_file(self.addresses[op["wallet"]]))
+            self.handler.load_wallets()
+            self.handler.load_contacts()
+
+
+def run_worker(workload: Workload, ops: List[Tuple[int, Dict[str, Any]]], start_at: float,
+               rate: float, done) -> Dict[str, Any]:
+    """
+    Run a worker's share of the trace. Operation i of the whole trace is due
+    at start_at + i / rate (wall-clock time, shared across processes).
+
+    Returns:
+        Dictionary with per-operation latencies, schedule lags and errors
+    """
+    latencies: Dict[str, List[float]] = {}
+    lags: List[float] = []
+    errors: Dict[str, int] = {}
+    with contextlib.redirect_stdout(io.StringIO()):
+        for index, op in ops:
+            if rate:
+                due = start_at + index / rate
+                delay = due - time.time()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    lags.append(-delay)
+            started = time.perf_counter()
+            try:
+                workload.run(op)
+            except Exception:
+                errors[op["op"]] = errors.get(op["op"], 0) + 1
+            latencies.setdefault(op["op"], []).append(time.perf_counter() - started)
+            with done.get_lock():
+                done.value += 1
+    return {"latencies": latencies, "lags": lags, "errors": errors}
+
+
+def run_process(root: str, addresses: List[str], difficulty: int, ops, start_at: float,
+                rate: float, done, results) -> None:
+    """Worker process: its own Workload on the shared directory."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        workload = Workload(root, addresses, difficulty, reload_pending=True)
+    results.put(run_worker(workload, ops, start_at, rate, done))
+
+
+def assign(trace: List[Dict[str, Any]], workers: int, mines_to_first: bool) -> List[List]:
+    """
+    Deal the trace round-robin to the workers, keeping each operation's index.
+
+    Returns:
+        One list of (index, operation) per worker
+    """
+    shares: List[List] = [[] for _ in range(workers)]
+    for index, op in enumerate(trace):
+        worker = 0 if mines_to_first and op["op"] == "mine" else index % workers
+        shares[worker].append((index, op))
+    return shares
+
+
+def file_sizes(root: str) -> Dict[str, int]:
+    """Sizes of the tracked data files and of all wallet histories together."""
+    sizes = {}
+    for title, name in TRACKED_FILES:
+        path = os.path.join(root, name)
+        sizes[title] = os.path.getsize(path) if os.path.exists(path) else 0
+    history_dir = os.path.join(root, "transactions")
+    sizes["histories"] = sum(entry.stat().st_size for entry in os.scandir(history_dir))
+    return sizes
+
+
+def sample_growth(root: str, done, stop: threading.Event, interval: float, samples: List) -> None:
+    """Record (elapsed seconds, operations done, file sizes) every interval."""
+    started = time.perf_counter()
+    while True:
+        samples.append((time.perf_counter() - started, done.value, file_sizes(root)))
+        if stop.wait(interval):
+            if done.value != samples[-1][1]:
+                samples.append((time.perf_counter() - started, done.value, file_sizes(root)))
+            return
+
+
+def percentile(ordered: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of sorted values."""
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run a synthetic workload against a data directory")
+    parser.add_argument("--wallets", type=int, default=50)
+    parser.add_argument("--operations", type=int, default=2000)
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"Operation weights (default: {DEFAULT_MIX})")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--mode", choices=("thread", "process"), default="thread")
+    parser.add_argument("--rate", type=float, default=0,
+                        help="Target operations per second over all workers (0: as fast as possible)")
+    parser.add_argument("--difficulty", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--sample-interval", type=float, default=1.0,
+                        help="Seconds between data-file size samples")
+    parser.add_argument("--record", help="Write the generated operations to this trace file")
+    parser.add_argument("--replay", help="Run the operations of a recorded trace file")
+    parser.add_argument("--data-dir", help="Use (and keep) this directory instead of a temporary one")
+    args = parser.parse_args()
+
+    if args.replay:
+        header, trace = load_trace(args.replay)
+        args.wallets, args.difficulty = header["wallets"], header["difficulty"]
+    else:
+        trace = generate_trace(args.operations, parse_mix(args.mix), args.wallets, args.seed)
+        if args.record:
+            save_trace(args.record, {"wallets": args.wallets, "difficulty": args.difficulty,
+                                     "mix": args.mix, "seed": args.seed}, trace)
+
+    root = args.data_dir or tempfile.mkdtemp(prefix="load_generator_")
+    os.makedirs(root, exist_ok=True)
+    context = multiprocessing.get_context("spawn")
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            addresses = create_workload_dir(root, args.wallets, args.difficulty)
+        process_mode = args.mode == "process"
+        shares = assign(trace, args.workers, mines_to_first=process_mode)
+        done = context.Value("i", 0)
+        samples: List = []
+        stop = threading.Event()
+        sampler = threading.Thread(target=sample_growth,
+                                   args=(root, done, stop, args.sample_interval, samples))
+
+        start_at = time.time() + (1.0 if process_mode else 0.1)
+        if process_mode:
+            results = context.Queue()
+            processes = [context.Process(target=run_process, args=(
+                root, addresses, args.difficulty, share, start_at, args.rate, done, results))
+                for share in shares]
+            for process in processes:
+                process.start()
+        else:
+            with contextlib.redirect_stdout(io.StringIO()):
+                workload = Workload(root, addresses, args.difficulty, reload_pending=False)
+            reports: List[Dict[str, Any]] = []
+            threads = [threading.Thread(target=lambda share=share: reports.append(
+                run_worker(workload, share, start_at, args.rate, done))) for share in shares]
+            for thread in threads:
+                thread.start()
+
+        time.sleep(max(0.0, start_at - time.time()))
+        started = time.perf_counter()
+        sampler.start()
+        if process_mode:
+            reports = [results.get() for _ in processes]
+            for process in processes:
+                process.join()
+        else:
+            for thread in threads:
+                thread.join()
+        elapsed = time.perf_counter() - started
+        stop.set()
+        sampler.join()
+
+        source = f"replay of {args.replay}" if args.replay else f"mix {args.mix}"
+        rate = f"{args.rate:,.0f} ops/s target" if args.rate else "unthrottled"
+        print(f"{len(trace):,} operations ({source}) from {args.workers} {args.mode} workers, {rate}, "
+              f"{args.wallets} wallets, difficulty {args.difficulty}, {os.cpu_count()} CPUs")
+        print(f"Finished in {elapsed:.1f}s: {len(trace) / elapsed:,.1f} ops/s\n")
+
+        print(f"{'operation':>9}  {'count':>7}  {'errors':>6}  {'ops/s':>8}  "
+              f"{'p50 ms':>8}  {'p95 ms':>8}  {'p99 ms':>8}  {'max ms':>8}")
+        for name in OPERATIONS:
+            values = sorted(value for report in reports for value in report["latencies"].get(name, []))
+            if not values:
+                continue
+            errors = sum(report["errors"].get(name, 0) for report in reports)
+            print(f"{name:>9}  {len(values):>7,}  {errors:>6,}  {len(values) / elapsed:>8,.1f}  "
+                  f"{statistics.median(values) * 1000:>8.2f}  {percentile(values, 0.95) * 1000:>8.2f}  "
+                  f"{percentile(values, 0.99) * 1000:>8.2f}  {values[-1] * 1000:>8.2f}")
+        if args.rate:
+            lags = sorted(lag for report in reports for lag in report["lags"])
+            late = f"p50 {statistics.median(lags) * 1000:.1f} ms, max {lags[-1] * 1000:.1f} ms" if lags else ""
+            print(f"\n{len(lags):,} operations started behind schedule {late}")
+
+        titles = [title for title, _ in TRACKED_FILES] + ["histories"]
+        print("\nData file growth (bytes):")
+        print(f"{'seconds':>8}  {'ops':>7}  " + "  ".join(f"{title:>11}" for title in titles))
+        for seconds, ops, sizes in samples:
+            print(f"{seconds:>8.1f}  {ops:>7,}  " + "  ".join(f"{sizes[title]:>11,}" for title in titles))
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            handler = DataHandler(root)
+            chain = handler.load_blockchain()
+            wallets = handler.load_wallets()
+        total = sum(wallet["balance"] for wallet in wallets)
+        expected = STARTING_BALANCE * args.wallets + MINING_REWARD * (len(chain) - 1)
+        state = "consistent" if abs(total - expected) < 1e-4 else f"INCONSISTENT (expected {expected:,.2f})"
+        print(f"\nEnd state: height {len(chain) - 1}, {len(handler.load_pending_transactions())} pending, "
+              f"wallet total {total:,.2f} ({state})")
+    finally:
+        if not args.data_dir:
+            shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
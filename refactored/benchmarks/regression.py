@@ -0,0 +1,327 @@
+#!/usr/bin/env python
+"""
+Performance Regression Harness
+------------------------------
+Runs a fixed set of scenarios on deterministic synthetic data and compares
+the timings with a committed baseline (benchmarks/baseline.json):
+
+    load_10k      restart on a 10,000 block chain without a chain cache:
+                  parse, rehash, save, index sync
+    load_100k     the same with 100,000 blocks
+    load_100k_warm  restart on 100,000 blocks from the chain cache
+    validate_10k  Blockchain.validate_chain() over 10,000 blocks
+    mine_d4       proof of work for fixed blocks at difficulty 4
+    send_10k      10,000 sends through the menu's send flow
+    history_10k   render a 10,000 row transaction history table
+
+Each scenario is run --repeat times and the fastest run counts. Timings are
+divided by a short pure-Python calibration loop measured on the same machine,
+so a baseline recorded on one machine still says something on another. A
+scenario regresses when it is more than its tolerance slower than the
+baseline, or when its result check (chain height, nonces found, rows
+rendered) changed. The exit status is 1 on any regression.
+
+Record a new baseline after an intended change with --update, on a quiet machine.
+
+Usage:
+    python benchmarks/regression.py [--only load_10k,mine_d4] [--repeat 3]
+        [--tolerance 0.25] [--baseline benchmarks/baseline.json] [--update]
+"""
+
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tabulate import tabulate
+from blockchain.block import Block
+from blockchain.blockchain import Blockchain
+from data.chain_cache import ChainCache
+from data.data_handler import DataHandler
+from ui.transaction_ui import TransactionUI
+from bench_bloom import synthetic_chain
+from load_generator import Workload, create_workload_dir
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+DEFAULT_TOLERANCE = 0.25
+SEED = 0
+WALLETS = 100
+TX_PER_BLOCK = 3
+SENDS_BETWEEN_BLOCKS = 500
+
+
+def quiet() -> contextlib.redirect_stdout:
+    """Swallow the application's progress messages."""
+    return contextlib.redirect_stdout(io.StringIO())
+
+
+def write_chain(root: str, blocks: int) -> None:
+    """
+    Write a synthetic chain to a data directory and load it once, so the
+    timed loads find Bloom filters and a transaction index like a real node's.
+    """
+    chain, _ = synthetic_chain(blocks, WALLETS, TX_PER_BLOCK, SEED)
+    genesis = Block(0, 0.0, "Genesis Block", "0")
+    handler = DataHandler(root)
+    handler.save_blockchain([block.to_dict() for block in [genesis] + chain])
+    with quiet():
+        Blockchain(handler).chain_cache.wait()
+
+
+def scenario_load(blocks: int, warm: bool) -> Callable[[str], Tuple[Callable[[], Any],
+                                                                   Optional[List[float]]]]:
+    """Time a restart on a chain of the given length, with or without its chain cache."""
+    def setup(root: str):
+        write_chain(root, blocks)
+        elapsed = [0.0]
+
+        def run():
+            handler = DataHandler(root)
+            if not warm:
+                os.remove(ChainCache(handler).cache_file)
+            started = time.perf_counter()
+            with quiet():
+                blockchain = Blockchain(handler)
+            elapsed[0] = time.perf_counter() - started
+            # A cold load rewrites the cache in the background, which shouldn't
+            # overlap the next scenario
+            blockchain.chain_cache.wait()
+            return len(blockchain.chain)
+        return run, elapsed
+    return setup
+
+
+def setup_validate(root: str):
+    """Time validating a loaded 10,000 block chain."""
+    write_chain(root, 10_000)
+    with quiet():
+        blockchain = Blockchain(DataHandler(root))
+    return blockchain.validate_chain, None
+
+
+def setup_mine(root: str):
+    """Time proof of work for fixed blocks, which always find the same nonces."""
+    with quiet():
+        blockchain = Blockchain(DataHandler(root), difficulty=4)
+    blocks = [Block(1, float(i), [{"sender": "a", "receiver": "b", "amount": 1.0,
+                                   "timestamp": float(i)}], "0" * 64) for i in range(8)]
+
+    def run():
+        return [blockchain.proof_of_work(block) for block in blocks]
+    return run, None
+
+
+def setup_send(root: str):
+    """
+    Time 10,000 sends between wallets. The pending pool is emptied every
+    SENDS_BETWEEN_BLOCKS sends outside the timing, as if a block had been mined,
+    so the pool stays at a realistic size; mining is timed by mine_d4.
+    """
+    with quiet():
+        addresses = create_workload_dir(root, WALLETS, 2)
+        workload = Workload(root, addresses, 2, reload_pending=False)
+    # Only the sends are timed, not draining the pool
+    elapsed = [0.0]
+
+    def run():
+        for i in range(10_000):
+            if i and i % SENDS_BETWEEN_BLOCKS == 0:
+                workload.blockchain.pending_transactions = []
+                workload.blockchain.save_pending_transactions()
+            started = time.perf_counter()
+            workload.run({"op": "send", "sender": i % WALLETS, "receiver": (i * 7 + 1) % WALLETS,
+                          "amount": 0.01})
+            elapsed[0] += time.perf_counter() - started
+        return 10_000
+    return run, elapsed
+
+
+def setup_history(root: str):
+    """Time rendering a 10,000 row history with named contacts and wallets."""
+    chain, addresses = synthetic_chain(2_000, WALLETS, 9, SEED)
+    transactions = [tx for block in chain for tx in block.transactions][:10_000]
+    wallets = [{"address": address, "nickname": f"Wallet {i}", "balance": 0.0}
+               for i, address in enumerate(addresses[:WALLETS // 2])]
+    contacts = [{"first_name": "Contact", "last_name": str(i), "address": address}
+                for i, address in enumerate(addresses[WALLETS // 2:])]
+    ui = TransactionUI(DataHandler(root), None)
+
+    def run():
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            ui._print_history(transactions, contacts, wallets)
+        return output.getvalue().count("\n")
+    return run, None
+
+
+# Scenario name -> (setup, default number of runs). A setup takes a fresh data
+# directory and returns the timed function, plus a one-item list the function
+# fills with its own timing when only part of it should count.
+SCENARIOS = {
+    "load_10k": (scenario_load(10_000, warm=False), 3),
+    "load_100k": (scenario_load(100_000, warm=False), 1),
+    "load_100k_warm": (scenario_load(100_000, warm=True), 1),
+    "validate_10k": (setup_validate, 3),
+    "mine_d4": (setup_mine, 5),
+    "send_10k": (setup_send, 1),
+    "history_10k": (setup_history, 3),
+}
+
+
+def calibrate(repeat: int = 5) -> float:
+    """
+    Time a fixed pure-Python loop of hashing and JSON work, the kind of work
+    the scenarios do, to scale timings between machines.
+
+    Returns:
+        Fastest of the runs in seconds
+    """
+    data = [{"sender": f"{i:032x}", "receiver": f"{i + 1:032x}", "amount": i / 3} for i in range(2_000)]
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(5):
+            text = json.dumps(data, indent=2)
+            json.loads(text)
+            for i in range(5_000):
+                hashlib.sha256(f"{text[:64]}{i}".encode()).hexdigest()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def run_scenario(name: str, repeat: Optional[int]) -> Dict[str, Any]:
+    """
+    Run one scenario in a fresh temporary data directory.
+
+    Returns:
+        Dictionary with the fastest time in seconds and the result check
+    """
+    setup, default_repeat = SCENARIOS[name]
+    times = []
+    check = None
+    for _ in range(repeat or default_repeat):
+        root = tempfile.mkdtemp(prefix=f"regression_{name}_")
+        try:
+            run, elapsed = setup(root)
+            started = time.perf_counter()
+            check = run()
+            times.append(elapsed[0] if elapsed else time.perf_counter() - started)
+        finally:
+            shutil.rmtree(root, ignore_errors=True)
+    return {"seconds": min(times), "check": check}
+
+
+def compare(result: Dict[str, Any], expected: Optional[Dict[str, Any]], scale: float,
+            tolerance: float) -> Tuple[str, Optional[float]]:
+    """
+    Compare a scenario result with its baseline entry.
+
+    Args:
+        result: Result of run_scenario
+        expected: Baseline entry, or None if the scenario has none
+        scale: Baseline calibration time divided by the current one
+        tolerance: Allowed slowdown as a fraction, unless the entry sets its own
+
+    Returns:
+        (status, ratio of the scaled time to the baseline time)
+    """
+    if expected is None:
+        return "no baseline", None
+    ratio = result["seconds"] * scale / expected["seconds"]
+    if expected.get("check") is not None and result["check"] != expected["check"]:
+        return "CHANGED RESULT", ratio
+    if ratio > 1 + expected.get("tolerance", tolerance):
+        return "REGRESSION", ratio
+    if ratio < 1 - expected.get("tolerance", tolerance):
+        return "faster", ratio
+    return "ok", ratio
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare scenario timings with a stored baseline")
+    parser.add_argument("--only", help="Comma-separated scenarios to run (default: all)")
+    parser.add_argument("--repeat", type=int, help="Runs per scenario (default: 1 to 5 depending on its length)")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Allowed slowdown as a fraction for scenarios without their own "
+                             f"(default: {DEFAULT_TOLERANCE})")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline file")
+    parser.add_argument("--update", action="store_true",
+                        help="Write the results to the baseline file instead of comparing")
+    parser.add_argument("--no-calibrate", action="store_true",
+                        help="Compare raw times, e.g. when the baseline is from this machine")
+    args = parser.parse_args()
+
+    names = args.only.split(",") if args.only else list(SCENARIOS)
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(unknown)}; choose from {', '.join(SCENARIOS)}")
+
+    baseline: Dict[str, Any] = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    calibration = calibrate()
+    results = {}
+    for name in names:
+        print(f"Running {name}...", flush=True)
+        results[name] = run_scenario(name, args.repeat)
+
+    # Calibrated on both sides of the run, since other load on the machine slows it down
+    calibration = min(calibration, calibrate())
+    scale = 1.0
+    if baseline and not args.no_calibrate and not args.update:
+        scale = baseline["calibration"] / calibration
+    print(f"Calibration: {calibration * 1000:.1f} ms"
+          + (f" (baseline {baseline['calibration'] * 1000:.1f} ms)" if baseline else ""))
+
+    rows = []
+    failed = False
+    for name, result in results.items():
+        expected = baseline.get("scenarios", {}).get(name)
+        status, ratio = compare(result, expected, scale, args.tolerance)
+        failed = failed or status in ("REGRESSION", "CHANGED RESULT")
+        rows.append([name, f"{result['seconds']:.3f}", f"{result['seconds'] * scale:.3f}",
+                     f"{expected['seconds']:.3f}" if expected else "-",
+                     f"{ratio:.2f}x" if ratio is not None else "-", status])
+
+    print(tabulate(rows, headers=["Scenario", "Seconds", "Scaled", "Baseline", "Ratio", "Status"],
+                   tablefmt="simple_grid", disable_numparse=True))
+
+    if args.update:
+        scenarios = baseline.get("scenarios", {})
+        # Entries that were not rerun are rescaled to this machine's calibration
+        for entry in scenarios.values():
+            entry["seconds"] *= calibration / baseline["calibration"]
+        for name, result in results.items():
+            # Keep tolerances tuned by hand for noisy scenarios
+            if "tolerance" in scenarios.get(name, {}):
+                result["tolerance"] = scenarios[name]["tolerance"]
+            scenarios[name] = result
+        with open(args.baseline, "w") as f:
+            json.dump({
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "calibration": calibration,
+                "scenarios": scenarios
+            }, f, indent=2)
+            f.write("\n")
+        print(f"Baseline written to {args.baseline}")
+        return
+    if failed:
+        print("Performance regression detected")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
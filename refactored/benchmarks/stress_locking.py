@@ -0,0 +1,190 @@
+#!/usr/bin/env python
+"""
+Data Directory Locking Stress Test
+----------------------------------
+Runs one writer process that sends transactions and mines blocks on a
+temporary data directory while several reader processes, each with several
+threads, keep loading balances, wallet histories and the chain from the
+same directory. Every read must parse, and every consistent snapshot (all
+files read under one read lock) must balance: the wallet total equals the
+starting total plus one mining reward per block.
+
+The writer first runs alone for --baseline-seconds. Exits with status 1 if
+any reader saw a torn or inconsistent state, or if the readers starved the
+writer: it must mine at least one block and keep at least --min-writer-share
+of its transaction rate without readers.
+
+Usage:
+    python benchmarks/stress_locking.py [--seconds 10] [--readers 4] [--threads 4]
+"""
+
+import argparse
+import contextlib
+import io
+import multiprocessing
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from blockchain.blockchain import Blockchain
+from data.data_handler import DataHandler
+from bench_api import create_data_dir
+
+# Wallet balance set by create_data_dir
+STARTING_BALANCE = 1_000_000
+MINING_REWARD = 10
+
+
+def run_writer(root: str, addresses, seconds: float, difficulty: int, tx_per_block: int, results) -> None:
+    """Send transactions and mine a block every tx_per_block sends."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        handler = DataHandler(root)
+        blockchain = Blockchain(handler, difficulty=difficulty, mining_reward=MINING_REWARD)
+        rng = random.Random(0)
+        sends = blocks = 0
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            sender, receiver = rng.sample(addresses, 2)
+            # The send flow of TransactionUI.send_transaction
+            with blockchain.lock.write():
+                tx = blockchain.create_transaction(sender, receiver, 1.0)
+                handler.update_wallet_balance(sender, -1.0)
+                handler.update_wallet_balance(receiver, 1.0)
+                handler.record_transaction(tx, sender, "sent")
+                handler.record_transaction(tx, receiver, "received")
+            sends += 1
+            if sends % tx_per_block == 0:
+                blockchain.mine_pending_transactions(addresses[0])
+                blocks += 1
+    results.put(("writer", {"sends": sends, "blocks": blocks}))
+
+
+def read_loop(handler: DataHandler, addresses, deadline: float, counts, latencies, errors) -> None:
+    """One reader thread: mix of balance, history, chain and snapshot reads."""
+    rng = random.Random(threading.get_ident())
+    starting_total = STARTING_BALANCE * len(addresses)
+    while time.perf_counter() < deadline:
+        kind = rng.choice(("balance", "history", "chain", "snapshot"))
+        started = time.perf_counter()
+        if kind == "balance":
+            wallets = handler.load_wallets()
+            if len(wallets) != len(addresses):
+                errors.append(f"wallets.json read {len(wallets)} wallets")
+        elif kind == "history":
+            history = handler.load_data(handler.get_transaction_file(rng.choice(addresses)))
+            if not isinstance(history, list):
+                errors.append("history is not a list")
+        elif kind == "chain":
+            chain = handler.load_blockchain()
+            if not chain:
+                errors.append("blockchain.json read empty")
+            elif any(chain[i]["previous_hash"] != chain[i - 1]["hash"] for i in range(1, len(chain))):
+                errors.append("chain links broken")
+        else:
+            with handler.lock.read():
+                wallets = handler.load_wallets()
+                chain = handler.load_blockchain()
+            total = sum(wallet["balance"] for wallet in wallets)
+            expected = starting_total + MINING_REWARD * (len(chain) - 1)
+            if abs(total - expected) > 1e-6:
+                errors.append(f"snapshot total {total} != {expected}")
+        latencies.setdefault(kind, []).append(time.perf_counter() - started)
+        counts[kind] = counts.get(kind, 0) + 1
+
+
+def run_reader(root: str, addresses, seconds: float, threads: int, results) -> None:
+    """Reader process: several reader threads sharing one DataHandler."""
+    handler = DataHandler(root)
+    deadline = time.perf_counter() + seconds
+    per_thread = [({}, {}, []) for _ in range(threads)]
+    workers = [threading.Thread(target=read_loop, args=(handler, addresses, deadline) + state)
+               for state in per_thread]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    counts, latencies, errors = {}, {}, []
+    for thread_counts, thread_latencies, thread_errors in per_thread:
+        for kind, count in thread_counts.items():
+            counts[kind] = counts.get(kind, 0) + count
+        for kind, values in thread_latencies.items():
+            latencies.setdefault(kind, []).extend(values)
+        errors.extend(thread_errors)
+    results.put(("reader", {"counts": counts, "latencies": latencies, "errors": errors}))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Stress concurrent readers against one writer")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--readers", type=int, default=4, help="Reader processes")
+    parser.add_argument("--threads", type=int, default=4, help="Threads per reader process")
+    parser.add_argument("--wallets", type=int, default=20)
+    parser.add_argument("--difficulty", type=int, default=2)
+    parser.add_argument("--tx-per-block", type=int, default=10)
+    parser.add_argument("--baseline-seconds", type=float, default=2.0,
+                        help="How long the writer runs alone first")
+    parser.add_argument("--min-writer-share", type=float, default=0.05,
+                        help="Smallest acceptable writer rate with readers, as a share of the rate without")
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="stress_locking_")
+    context = multiprocessing.get_context("spawn")
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            addresses = create_data_dir(root, args.wallets, args.difficulty)
+
+        results = context.Queue()
+        baseline = context.Process(target=run_writer, args=(
+            root, addresses, args.baseline_seconds, args.difficulty, args.tx_per_block, results))
+        baseline.start()
+        _, alone = results.get()
+        baseline.join()
+
+        processes = [context.Process(target=run_writer, args=(
+            root, addresses, args.seconds, args.difficulty, args.tx_per_block, results))]
+        processes += [context.Process(target=run_reader, args=(
+            root, addresses, args.seconds, args.threads, results)) for _ in range(args.readers)]
+        for process in processes:
+            process.start()
+        reports = [results.get() for _ in processes]
+        for process in processes:
+            process.join()
+
+        writer = next(report for role, report in reports if role == "writer")
+        readers = [report for role, report in reports if role == "reader"]
+        print(f"{args.readers} reader processes x {args.threads} threads, 1 writer, "
+              f"{args.seconds:.0f}s on {os.cpu_count()} CPUs")
+        alone_rate = alone["sends"] / args.baseline_seconds
+        print(f"writer alone: {alone['sends']} transactions ({alone_rate:,.0f}/s), {alone['blocks']} blocks")
+        print(f"writer: {writer['sends']} transactions ({writer['sends'] / args.seconds:,.0f}/s), "
+              f"{writer['blocks']} blocks")
+        errors = [error for report in readers for error in report["errors"]]
+        for kind in ("balance", "history", "chain", "snapshot"):
+            values = sorted(value for report in readers for value in report["latencies"].get(kind, []))
+            if not values:
+                continue
+            print(f"{kind:>9}: {len(values):>7,} reads ({len(values) / args.seconds:,.0f}/s), "
+                  f"p50 {statistics.median(values) * 1000:.2f} ms, "
+                  f"p99 {values[int(len(values) * 0.99)] * 1000:.2f} ms")
+        if errors:
+            print(f"FAILED: {len(errors)} inconsistent reads, e.g. {errors[0]}")
+            sys.exit(1)
+        if not writer["blocks"] or writer["sends"] / args.seconds < alone_rate * args.min_writer_share:
+            print(f"FAILED: readers starved the writer (at least 1 block and "
+                  f"{alone_rate * args.min_writer_share:,.0f} transactions/s required)")
+            sys.exit(1)
+        print("OK: every read parsed, every snapshot balanced and the writer kept up")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
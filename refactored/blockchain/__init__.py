@@ -1 +1,3 @@
-
+# Implementations of the nonce search: a hashlib loop, or batched NumPy SHA-256.
+# Defined here so the command line can offer them without importing the chain.
+MINING_BACKENDS = ("hashlib", "numpy")
@@ -0,0 +1,244 @@
+import functools
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+
+# Nonces hashed together in one set of array operations
+DEFAULT_CHUNK = 32768
+
+_K = np.array([
+    0x428a2f98, 0x71374491, 0xb5c0fbcf, 0xe9b5dba5, 0x3956c25b, 0x59f111f1, 0x923f82a4, 0xab1c5ed5,
+    0xd807aa98, 0x12835b01, 0x243185be, 0x550c7dc3, 0x72be5d74, 0x80deb1fe, 0x9bdc06a7, 0xc19bf174,
+    0xe49b69c1, 0xefbe4786, 0x0fc19dc6, 0x240ca1cc, 0x2de92c6f, 0x4a7484aa, 0x5cb0a9dc, 0x76f988da,
+    0x983e5152, 0xa831c66d, 0xb00327c8, 0xbf597fc7, 0xc6e00bf3, 0xd5a79147, 0x06ca6351, 0x14292967,
+    0x27b70a85, 0x2e1b2138, 0x4d2c6dfc, 0x53380d13, 0x650a7354, 0x766a0abb, 0x81c2c92e, 0x92722c85,
+    0xa2bfe8a1, 0xa81a664b, 0xc24b8b70, 0xc76c51a3, 0xd192e819, 0xd6990624, 0xf40e3585, 0x106aa070,
+    0x19a4c116, 0x1e376c08, 0x2748774c, 0x34b0bcb5, 0x391c0cb3, 0x4ed8aa4a, 0x5b9cca4f, 0x682e6ff3,
+    0x748f82ee, 0x78a5636f, 0x84c87814, 0x8cc70208, 0x90befffa, 0xa4506ceb, 0xbef9a3f7, 0xc67178f2,
+], dtype=np.uint32)
+
+_H0 = np.array([0x6a09e667, 0xbb67ae85, 0x3c6ef372, 0xa54ff53a,
+                0x510e527f, 0x9b05688c, 0x1f83d9ab, 0x5be0cd19], dtype=np.uint32)
+
+
+def _rotr(x: np.ndarray, n: int) -> np.ndarray:
+    """Rotate 32-bit words right."""
+    return (x >> n) | (x << (32 - n))
+
+
+def _schedule(words: List[np.ndarray]) -> List[np.ndarray]:
+    """
+    Expand 16 message words into the 64 round constants K[i] + W[i].
+
+    Args:
+        words: 16 arrays of big-endian message words
+
+    Returns:
+        64 arrays
+    """
+    w = list(words)
+    for i in range(16, 64):
+        s0 = _rotr(w[i - 15], 7) ^ _rotr(w[i - 15], 18) ^ (w[i - 15] >> 3)
+        s1 = _rotr(w[i - 2], 17) ^ _rotr(w[i - 2], 19) ^ (w[i - 2] >> 10)
+        w.append(w[i - 16] + s0 + w[i - 7] + s1)
+    return [w[i] + _K[i] for i in range(64)]
+
+
+def _compress(state: List[np.ndarray], kw: List[np.ndarray]) -> List[np.ndarray]:
+    """
+    Run the 64 SHA-256 rounds of one block over every lane at once.
+
+    Args:
+        state: 8 arrays of chaining values
+        kw: 64 arrays (or length-1 arrays shared by all lanes) of K[i] + W[i]
+
+    Returns:
+        The 8 arrays of the new chaining value
+    """
+    a, b, c, d, e, f, g, h = state
+    for i in range(64):
+        t1 = h + (_rotr(e, 6) ^ _rotr(e, 11) ^ _rotr(e, 25)) + (g ^ (e & (f ^ g))) + kw[i]
+        t2 = (_rotr(a, 2) ^ _rotr(a, 13) ^ _rotr(a, 22)) + ((a & b) | (c & (a | b)))
+        h, g, f, e, d, c, b, a = g, f, e, d + t1, c, b, a, t1 + t2
+    return [x + y for x, y in zip(state, (a, b, c, d, e, f, g, h))]
+
+
+def _compress_lanes(state: List[np.ndarray], kw: List[np.ndarray]) -> List[np.ndarray]:
+    """
+    Same as _compress for a state that already has one value per lane, using
+    preallocated buffers and in-place operations to avoid temporary arrays.
+
+    Args:
+        state: 8 arrays of chaining values, one entry per lane
+        kw: 64 length-1 arrays of K[i] + W[i]
+
+    Returns:
+        The 8 arrays of the new chaining value
+    """
+    a, b, c, d, e, f, g, h = [x.copy() for x in state]
+    t1, t2, u, v = (np.empty_like(a) for _ in range(4))
+    for i in range(64):
+        # t1 = h + S1(e) + Ch(e, f, g) + K[i] + W[i]
+        np.right_shift(e, 6, out=u)
+        u |= np.left_shift(e, 26, out=v)
+        u ^= np.right_shift(e, 11, out=v)
+        u ^= np.left_shift(e, 21, out=v)
+        u ^= np.right_shift(e, 25, out=v)
+        u ^= np.left_shift(e, 7, out=v)
+        np.bitwise_xor(f, g, out=t1)
+        t1 &= e
+        t1 ^= g
+        t1 += u
+        t1 += h
+        t1 += kw[i]
+        # t2 = S0(a) + Maj(a, b, c)
+        np.right_shift(a, 2, out=u)
+        u |= np.left_shift(a, 30, out=v)
+        u ^= np.right_shift(a, 13, out=v)
+        u ^= np.left_shift(a, 19, out=v)
+        u ^= np.right_shift(a, 22, out=v)
+        u ^= np.left_shift(a, 10, out=v)
+        np.bitwise_or(a, b, out=t2)
+        t2 &= c
+        t2 |= np.bitwise_and(a, b, out=v)
+        t2 += u
+        # Shift the registers, reusing the buffers of d and h for the new e and a
+        h, g, f, e, d, c, b, a = g, f, e, d, c, b, a, h
+        e += t1
+        np.add(t1, t2, out=a)
+    return [x + y for x, y in zip(state, (a, b, c, d, e, f, g, h))]
+
+
+def _pad(message_length: int) -> bytes:
+    """SHA-256 padding for a message of the given length in bytes."""
+    zeros = (55 - message_length) % 64
+    return b"\x80" + b"\x00" * zeros + (message_length * 8).to_bytes(8, "big")
+
+
+def _words(data: bytes) -> List[np.ndarray]:
+    """Split a 64-byte block into 16 length-1 word arrays."""
+    return [np.array([int.from_bytes(data[i:i + 4], "big")], dtype=np.uint32) for i in range(0, 64, 4)]
+
+
+@functools.lru_cache(maxsize=16)
+def _template(prefix: bytes, suffix: bytes, digits: int) -> Tuple:
+    """
+    Precompute everything about the message that doesn't depend on the nonce
+    for nonces with a given number of digits: the chaining value after the
+    blocks before the nonce, the padded bytes of the blocks holding the nonce,
+    and the round constants of the blocks after it, whose words are the same
+    for every nonce.
+
+    Returns:
+        (midstate, padded bytes of the blocks holding the nonce, nonce offset in them,
+         K+W of each later block)
+    """
+    length = len(prefix) + digits + len(suffix)
+    padded = prefix + b"0" * digits + suffix + _pad(length)
+    first = len(prefix) // 64
+    last = (len(prefix) + digits - 1) // 64
+
+    state = [_H0[i:i + 1] for i in range(8)]
+    for block in range(first):
+        state = _compress(state, _schedule(_words(padded[block * 64:(block + 1) * 64])))
+
+    varying = padded[first * 64:(last + 1) * 64]
+    constant = [_schedule(_words(padded[block * 64:(block + 1) * 64]))
+                for block in range(last + 1, len(padded) // 64)]
+    return state, varying, len(prefix) - first * 64, constant
+
+
+def sha256_batch(prefix: bytes, suffix: bytes, nonces: np.ndarray) -> np.ndarray:
+    """
+    Hash prefix + str(nonce) + suffix for many nonces with NumPy.
+    All nonces must have the same number of decimal digits.
+
+    Args:
+        prefix: Bytes before the nonce
+        suffix: Bytes after the nonce
+        nonces: Non-negative integer nonces
+
+    Returns:
+        (len(nonces), 8) uint32 array of digest words
+    """
+    nonces = np.asarray(nonces, dtype=np.uint64)
+    digits = len(str(int(nonces[0])))
+    midstate, varying, offset, constant = _template(prefix, suffix, digits)
+
+    # Write the nonce's ASCII digits into a copy of the varying blocks per lane
+    message = np.tile(np.frombuffer(varying, dtype=np.uint8), (len(nonces), 1))
+    remaining = nonces.copy()
+    for position in range(offset + digits - 1, offset - 1, -1):
+        message[:, position] = (remaining % 10).astype(np.uint8) + ord("0")
+        remaining //= 10
+    words = message.view(">u4").astype(np.uint32)
+
+    # Words without nonce bytes stay length-1 arrays, so the schedule steps and
+    # the early rounds that only depend on them are computed once, not per lane
+    shared = [word for block in range(0, len(varying), 64) for word in _words(varying[block:block + 64])]
+    state = midstate
+    for block in range(words.shape[1] // 16):
+        block_words = []
+        for i in range(16):
+            index = block * 16 + i
+            if index * 4 + 4 <= offset or index * 4 >= offset + digits:
+                block_words.append(shared[index])
+            else:
+                block_words.append(words[:, index])
+        state = _compress(state, _schedule(block_words))
+    for kw in constant:
+        state = _compress_lanes(state, kw)
+    return np.stack(state, axis=1)
+
+
+def meets_difficulty(digests: np.ndarray, difficulty: int) -> np.ndarray:
+    """
+    Check which digests start with `difficulty` zero hex digits.
+
+    Args:
+        digests: (n, 8) uint32 digest words
+        difficulty: Required leading zero hex digits
+
+    Returns:
+        Boolean array, one entry per digest
+    """
+    ok = np.ones(len(digests), dtype=bool)
+    for word in range(8):
+        bits = min(32, 4 * difficulty - 32 * word)
+        if bits <= 0:
+            break
+        if bits == 32:
+            ok &= digests[:, word] == 0
+        else:
+            ok &= (digests[:, word] >> (32 - bits)) == 0
+    return ok
+
+
+def search_nonce_batch(prefix: bytes, suffix: bytes, difficulty: int, start: int, count: int,
+                       chunk: int = DEFAULT_CHUNK) -> Optional[int]:
+    """
+    Find the first nonce in a range whose hash meets the difficulty, hashing
+    `chunk` nonces at a time. Chunks never cross a change in digit count.
+
+    Args:
+        prefix: Bytes before the nonce (see Block.hash_template)
+        suffix: Bytes after the nonce
+        difficulty: Required leading zero hex digits
+        start: First nonce to try
+        count: Number of nonces to try
+        chunk: Nonces hashed per set of array operations
+
+    Returns:
+        The first matching nonce, or None
+    """
+    end = start + count
+    nonce = start
+    while nonce < end:
+        stop = min(end, nonce + chunk, 10 ** len(str(nonce)))
+        hits = np.flatnonzero(meets_difficulty(
+            sha256_batch(prefix, suffix, np.arange(nonce, stop, dtype=np.uint64)), difficulty))
+        if len(hits):
+            return nonce + int(hits[0])
+        nonce = stop
+    return None
@@ -1,6 +1,8 @@
 import hashlib
 import json
-from typing import List, Union, Dict, Any
+from typing import List, Union, Dict, Any, Tuple
+from blockchain.bloom import BloomFilter
+from utils import perf
 
 
 class Block:
@@ -27,7 +29,10 @@ class Block:
         self.previous_hash = previous_hash
         self.nonce = nonce
         self.hash = self.calculate_hash()
+        # Metadata that is not covered by the hash
+        self.bloom = None  # BloomFilter of sender and receiver addresses
 
+    @perf.timed()
     def calculate_hash(self) -> str:
         """
         Calculate a SHA-256 hash of the block's contents.
@@ -45,6 +50,67 @@ class Block:
         
         return hashlib.sha256(block_string).hexdigest()
 
+    def hash_template(self) -> Tuple[bytes, bytes]:
+        """
+        Split the hashed serialization of the block around its nonce.
+        Keys are serialized in sorted order, so the nonce follows the index and
+        sha256(prefix + str(nonce) + suffix) equals calculate_hash() for that
+        nonce. Miners can then try nonces without re-serializing the block.
+        
+        Returns:
+            (prefix, suffix) as bytes
+        """
+        block_string = json.dumps({
+            "index": self.index,
+            "timestamp": self.timestamp,
+            "transactions": self.transactions,
+            "previous_hash": self.previous_hash,
+            "nonce": 0
+        }, sort_keys=True)
+        marker = '"nonce": '
+        start = block_string.index(marker) + len(marker)
+        return block_string[:start].encode(), block_string[start + 1:].encode()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the block to a dictionary for storage or transmission.
+        
+        Returns:
+            Dictionary representation of the block, including its hash and metadata
+        """
+        return {
+            'index': self.index,
+            'timestamp': self.timestamp,
+            'transactions': self.transactions,
+            'previous_hash': self.previous_hash,
+            'nonce': self.nonce,
+            'hash': self.hash,
+            'bloom': self.bloom.to_dict() if self.bloom else None
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Block':
+        """
+        Create a Block object from a dictionary.
+        The hash is recalculated from the contents, never taken from the input.
+        
+        Args:
+            data: Dictionary containing block data
+            
+        Returns:
+            A new Block object
+        """
+        block = cls(
+            data['index'],
+            data['timestamp'],
+            data['transactions'],
+            data['previous_hash'],
+            data['nonce']
+        )
+        if data.get('bloom'):
+            block.bloom = BloomFilter.from_dict(data['bloom'])
+        return block
+
     def __str__(self) -> str:
         """String representation of the block."""
-        return json.dumps(self.__dict__, indent=4)
+        return json.dumps(self.to_dict(), indent=4)
@@ -0,0 +1,160 @@
+from typing import Dict, List, Optional
+from blockchain.block import Block
+
+
+# Blocks whose parent is unknown kept while waiting for the parent to arrive
+MAX_ORPHANS = 1000
+
+
+class TreeEntry:
+    """
+    A block in the tree with its height and the cumulative work of its branch.
+    """
+    __slots__ = ("block", "height", "work")
+
+    def __init__(self, block: Block, height: int, work: int):
+        """
+        Initialize a tree entry.
+
+        Args:
+            block: The block
+            height: Distance from the root block
+            work: Total work of the branch ending at this block
+        """
+        self.block = block
+        self.height = height
+        self.work = work
+
+
+class BlockTree:
+    """
+    Every known block keyed by hash, including blocks on competing branches.
+    Each entry records the cumulative work of the branch it ends, so the
+    most-work tip can be chosen and the fork point between two tips found by
+    walking back only as far as the branches differ.
+    """
+    def __init__(self, block_work: int):
+        """
+        Initialize an empty tree.
+
+        Args:
+            block_work: Work credited for each block (expected hashes per block)
+        """
+        self.block_work = block_work
+        self.entries: Dict[str, TreeEntry] = {}
+        self.orphans: Dict[str, List[Block]] = {}
+        self.best_tip: Optional[str] = None
+
+    def __contains__(self, block_hash: str) -> bool:
+        """Whether a block is in the tree."""
+        return block_hash in self.entries
+
+    def __len__(self) -> int:
+        """Number of blocks in the tree."""
+        return len(self.entries)
+
+    def add(self, block: Block) -> Optional[TreeEntry]:
+        """
+        Add a block whose parent is already in the tree (or the root block).
+
+        Args:
+            block: Block to add
+
+        Returns:
+            The block's entry, or None if its parent is unknown
+        """
+        if block.hash in self.entries:
+            return self.entries[block.hash]
+
+        parent = self.entries.get(block.previous_hash)
+        if parent is None and self.entries:
+            return None
+
+        entry = TreeEntry(
+            block,
+            parent.height + 1 if parent else 0,
+            (parent.work if parent else 0) + self.block_work
+        )
+        self.entries[block.hash] = entry
+        if self.best_tip is None or entry.work > self.entries[self.best_tip].work:
+            self.best_tip = block.hash
+        return entry
+
+    def work(self, block_hash: str) -> int:
+        """
+        Cumulative work of the branch ending at a block.
+
+        Args:
+            block_hash: Hash of a block in the tree
+
+        Returns:
+            Total work from the root to the block
+        """
+        return self.entries[block_hash].work
+
+    def fork_point(self, first_hash: str, second_hash: str) -> str:
+        """
+        Find the most recent common ancestor of two blocks.
+        Cost is proportional to how far the blocks are from that ancestor.
+
+        Args:
+            first_hash: Hash of a block in the tree
+            second_hash: Hash of another block in the tree
+
+        Returns:
+            Hash of the common ancestor
+        """
+        first = self.entries[first_hash]
+        second = self.entries[second_hash]
+        while first.height > second.height:
+            first = self.entries[first.block.previous_hash]
+        while second.height > first.height:
+            second = self.entries[second.block.previous_hash]
+        while first is not second:
+            first = self.entries[first.block.previous_hash]
+            second = self.entries[second.block.previous_hash]
+        return first.block.hash
+
+    def branch(self, ancestor_hash: str, tip_hash: str) -> List[Block]:
+        """
+        Blocks from just above an ancestor up to a tip.
+
+        Args:
+            ancestor_hash: Hash of an ancestor of the tip
+            tip_hash: Hash of the tip
+
+        Returns:
+            Blocks in height order, excluding the ancestor
+        """
+        blocks = []
+        entry = self.entries[tip_hash]
+        while entry.block.hash != ancestor_hash:
+            blocks.append(entry.block)
+            entry = self.entries[entry.block.previous_hash]
+        blocks.reverse()
+        return blocks
+
+    def add_orphan(self, block: Block) -> None:
+        """
+        Keep a block whose parent hasn't arrived yet.
+
+        Args:
+            block: Block with an unknown parent
+        """
+        if sum(len(blocks) for blocks in self.orphans.values()) >= MAX_ORPHANS:
+            self.orphans.pop(next(iter(self.orphans)))
+        waiting = self.orphans.setdefault(block.previous_hash, [])
+        if all(orphan.hash != block.hash for orphan in waiting):
+            waiting.append(block)
+
+    def pop_orphans(self, parent_hash: str) -> List[Block]:
+        """
+        Take the orphans waiting for a parent.
+
+        Args:
+            parent_hash: Hash of a block that was just added
+
+        Returns:
+            Blocks whose parent is that block
+        """
+        return self.orphans.pop(parent_hash, [])
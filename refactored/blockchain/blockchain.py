@@ -1,7 +1,58 @@
+import functools
+import hashlib
+import math
 import time
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable, Tuple
+from blockchain import MINING_BACKENDS
 from blockchain.block import Block
-from blockchain.transaction import Transaction
+from blockchain.block_tree import BlockTree
+from blockchain.transaction import Transaction, is_well_formed, transaction_id
+from blockchain.time_index import TimeIndex
+from blockchain.tx_index import TransactionIndex
+from blockchain.bloom import BloomFilter, BloomProbe
+from data.chain_cache import ChainCache
+from metrics.registry import REGISTRY
+from utils import perf
+
+
+# Nonces tried per call to search_nonce with the hashlib backend (see Blockchain.nonce_batch)
+NONCE_BATCH = 10_000
+
+# Metrics served with --metrics-port (see metrics/server.py)
+HEIGHT = REGISTRY.gauge("blockchain_height", "Index of the block at the chain tip")
+PENDING_TRANSACTIONS = REGISTRY.gauge("blockchain_pending_transactions",
+                                      "Transactions waiting to be mined")
+LAST_BLOCK_TIMESTAMP = REGISTRY.gauge("blockchain_last_block_timestamp_seconds",
+                                      "Timestamp of the block at the chain tip")
+BLOCKS_ADDED = REGISTRY.counter("blockchain_blocks_added_total", "Blocks appended to the main chain")
+BLOCKS_DISCONNECTED = REGISTRY.counter("blockchain_blocks_disconnected_total",
+                                       "Blocks removed from the main chain by reorganizations")
+TRANSACTIONS_CONFIRMED = REGISTRY.counter("blockchain_transactions_confirmed_total",
+                                          "Transactions in blocks appended to the main chain")
+BLOCK_INTERVAL = REGISTRY.histogram("blockchain_block_interval_seconds",
+                                    "Time between the timestamps of a block and its parent",
+                                    buckets=(1, 5, 10, 30, 60, 120, 300, 600, 1800, 3600))
+HASHES = REGISTRY.counter("mining_hashes_total", "Nonces tried by Blockchain.search_nonce")
+HASHRATE = REGISTRY.gauge("mining_hashrate", "Hashes per second of the most recent nonce range")
+BLOCKS_MINED = REGISTRY.counter("mining_blocks_mined_total", "Mined blocks committed to the chain")
+
+
+def _write_locked(method: Callable) -> Callable:
+    """Run a Blockchain method while holding the instance's lock for writing."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.lock.write():
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+def _read_locked(method: Callable) -> Callable:
+    """Run a Blockchain method while holding the instance's lock for reading."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.lock.read():
+            return method(self, *args, **kwargs)
+    return wrapper
 
 
 class Blockchain:
@@ -9,7 +60,8 @@ class Blockchain:
     Represents a blockchain, which is a chain of blocks containing transaction records.
     Implements methods for adding blocks, validating the chain, and managing transactions.
     """
-    def __init__(self, data_handler, difficulty: int = 4, mining_reward: int = 10):
+    def __init__(self, data_handler, difficulty: int = 4, mining_reward: int = 10,
+                 bloom_fp_rate: float = 0.01, mining_backend: str = "hashlib"):
         """
         Initialize a new blockchain.
         
@@ -17,16 +69,79 @@ class Blockchain:
             data_handler: Handler for loading and saving blockchain data
             difficulty: Difficulty level for proof-of-work (more zeros required)
             mining_reward: Reward amount for mining a block
+            bloom_fp_rate: False-positive rate of the per-block address Bloom filters
+            mining_backend: Nonce search implementation, one of MINING_BACKENDS
+            
+        Raises:
+            ValueError: If the mining backend is unknown
         """
+        if mining_backend not in MINING_BACKENDS:
+            raise ValueError(f"Unknown mining backend {mining_backend!r}, "
+                             f"expected one of {', '.join(MINING_BACKENDS)}")
         self.data_handler = data_handler
         self.difficulty = difficulty
         self.mining_reward = mining_reward
-        self.chain = self.load_blockchain()
-        if not self.chain:
-            self.chain = [self.create_genesis_block()]
-            self.save_blockchain()
+        self.bloom_fp_rate = bloom_fp_rate
+        self.mining_backend = mining_backend
+        # Nonces per search_nonce call: a whole NumPy chunk, so the batched
+        # backend never hashes a partly filled array
+        self.nonce_batch = NONCE_BATCH
+        if mining_backend == "numpy":
+            from blockchain.batch_hash import DEFAULT_CHUNK
+            self.nonce_batch = DEFAULT_CHUNK
+        # Reader/writer lock shared with the data handler: guards the chain,
+        # the pending pool and their files against other threads (such as the
+        # background auto-miner) and other processes using the same data directory
+        self.lock = data_handler.lock
+        # A restart on an unchanged blockchain.json unpickles the chain and its indexes
+        self.chain_cache = ChainCache(data_handler)
+        cached = self.chain_cache.load()
+        if cached:
+            print("Loading blockchain from cache...")
+            self.chain = cached["chain"]
+        else:
+            self.chain = self.load_blockchain()
+            if not self.chain:
+                self.chain = [self.create_genesis_block()]
+                self.save_blockchain()
         self.pending_transactions = []
         self.load_pending_transactions()
+        self.block_listeners: List[Callable[[Block], None]] = []
+        self.disconnect_listeners: List[Callable[[Block], None]] = []
+        if cached and cached["block_tree"].block_work == 16 ** difficulty:
+            self.block_tree = cached["block_tree"]
+        else:
+            self.block_tree = BlockTree(16 ** difficulty)
+            for block in self.chain:
+                self.block_tree.add(block)
+        self.add_block_listener(self.block_tree.add)
+        self.time_index = cached["time_index"] if cached else TimeIndex(self.chain)
+        self.add_block_listener(self.time_index.add_block)
+        self.add_disconnect_listener(self.time_index.remove_last_block)
+        self.tx_index = TransactionIndex(self.data_handler)
+        if cached and cached["tx_index"]:
+            self.tx_index.locations, self.tx_index.height = cached["tx_index"]
+        else:
+            self.tx_index.sync(self.chain)
+        self.add_block_listener(self.tx_index.add_block)
+        self.add_disconnect_listener(self.tx_index.remove_block)
+        # Keep the cache in step with the chain, after the indexes above have caught up
+        if not cached or not cached["tx_index"]:
+            self.chain_cache.rebuild_async(self)
+        self.add_block_listener(lambda block: self.chain_cache.rebuild_async(self))
+        self.add_disconnect_listener(lambda block: self.chain_cache.rebuild_async(self))
+
+    def bind_metrics(self) -> None:
+        """
+        Make the chain gauges (height, pending pool size, tip timestamp) read
+        this blockchain when scraped, instead of being updated on every change.
+        The gauges are shared by the process, so only the application's own
+        blockchain should call this, once; other instances, such as the nodes
+        of a benchmark, leave them alone and are not kept alive by them.
+        """
+        HEIGHT.set_function(lambda: len(self.chain) - 1)
+        PENDING_TRANSACTIONS.set_function(lambda: len(self.pending_transactions))
+        LAST_BLOCK_TIMESTAMP.set_function(lambda: self.chain[-1].timestamp)
 
     def load_blockchain(self) -> List[Block]:
         """
@@ -40,13 +155,7 @@ class Blockchain:
         if chain_data:
             print("Loading existing blockchain...")
             # Convert dictionary objects back to Block objects
-            chain = [Block(
-                block['index'],
-                block['timestamp'],
-                block['transactions'],
-                block['previous_hash'],
-                block['nonce']
-            ) for block in chain_data]
+            chain = [Block.from_dict(block) for block in chain_data]
             
             # Recalculate all block hashes to ensure chain integrity
             for i in range(len(chain)):
@@ -58,6 +167,11 @@ class Blockchain:
                     # Recalculate current block's hash
                     chain[i].hash = chain[i].calculate_hash()
             
+            # Backfill address Bloom filters for blocks stored without one
+            for block in chain:
+                if block.bloom is None:
+                    block.bloom = self.build_bloom(block)
+            
             # Save the chain with updated hashes
             self.chain = chain
             self.save_blockchain()
@@ -88,6 +202,7 @@ class Blockchain:
                     chain[-1].hash
                 )
                 new_block.hash = new_block.calculate_hash()
+                new_block.bloom = self.build_bloom(new_block)
                 chain.append(new_block)
                 current_block_txs = []  # Start a new block
         
@@ -100,6 +215,7 @@ class Blockchain:
                 chain[-1].hash
             )
             new_block.hash = new_block.calculate_hash()
+            new_block.bloom = self.build_bloom(new_block)
             chain.append(new_block)
         
         print(f"Created blockchain with {len(chain)} blocks")
@@ -113,14 +229,7 @@ class Blockchain:
         """Save the current blockchain state to storage."""
         try:
             # Convert Block objects to dictionaries for JSON serialization
-            chain_data = [{
-                'index': block.index,
-                'timestamp': block.timestamp,
-                'transactions': block.transactions,
-                'previous_hash': block.previous_hash,
-                'nonce': block.nonce,
-                'hash': block.hash
-            } for block in self.chain]
+            chain_data = [block.to_dict() for block in self.chain]
             self.data_handler.save_blockchain(chain_data)
             print(f"Saved blockchain with {len(chain_data)} blocks")
         except Exception as e:
@@ -141,7 +250,139 @@ class Blockchain:
         Returns:
             A Block object representing the genesis block
         """
-        return Block(0, time.time(), "Genesis Block", "0")
+        genesis = Block(0, time.time(), "Genesis Block", "0")
+        genesis.bloom = self.build_bloom(genesis)
+        return genesis
+
+    def build_bloom(self, block: Block) -> BloomFilter:
+        """
+        Build the Bloom filter of every sender and receiver address in a block.
+        
+        Args:
+            block: Block to summarize
+            
+        Returns:
+            BloomFilter sized for the block's addresses at bloom_fp_rate
+        """
+        addresses = []
+        if isinstance(block.transactions, list):
+            for tx in block.transactions:
+                addresses.append(tx['sender'])
+                addresses.append(tx['receiver'])
+        return BloomFilter.from_items(addresses, self.bloom_fp_rate)
+
+    def add_block_listener(self, listener: Callable[[Block], None]) -> None:
+        """
+        Register a callback that is invoked after a new block is appended to the chain.
+        
+        Args:
+            listener: Function receiving the newly appended Block
+        """
+        self.block_listeners.append(listener)
+
+    def notify_block_added(self, block: Block) -> None:
+        """
+        Inform all registered listeners that a block has been appended.
+        Listener failures are reported but never interrupt the caller.
+        
+        Args:
+            block: The block that was appended
+        """
+        BLOCKS_ADDED.inc()
+        if isinstance(block.transactions, list):
+            TRANSACTIONS_CONFIRMED.inc(len(block.transactions))
+        if 0 < block.index < len(self.chain) and self.chain[block.index] is block:
+            BLOCK_INTERVAL.observe(max(0.0, block.timestamp - self.chain[block.index - 1].timestamp))
+        for listener in self.block_listeners:
+            try:
+                listener(block)
+            except Exception as e:
+                print(f"Error in block listener: {str(e)}")
+
+    def add_disconnect_listener(self, listener: Callable[[Block], None]) -> None:
+        """
+        Register a callback that is invoked after the tip block is removed during a reorganization.
+        
+        Args:
+            listener: Function receiving the removed Block
+        """
+        self.disconnect_listeners.append(listener)
+
+    def notify_block_disconnected(self, block: Block) -> None:
+        """
+        Inform all registered listeners that the tip block has been removed.
+        Listener failures are reported but never interrupt the caller.
+        
+        Args:
+            block: The block that was removed
+        """
+        BLOCKS_DISCONNECTED.inc()
+        for listener in self.disconnect_listeners:
+            try:
+                listener(block)
+            except Exception as e:
+                print(f"Error in disconnect listener: {str(e)}")
+
+    @_read_locked
+    def get_transactions_between(self, start_time: float, end_time: float,
+                                 address: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Get confirmed transactions within a time range using the time index.
+        
+        Args:
+            start_time: Range start as a Unix timestamp (inclusive)
+            end_time: Range end as a Unix timestamp (inclusive)
+            address: Only return transactions sent or received by this address
+            
+        Returns:
+            List of transactions in chain order
+        """
+        return [tx for _, tx in self.time_index.transactions_between(
+            self.chain, start_time, end_time, address)]
+
+    @_read_locked
+    def get_address_transactions(self, address: str) -> List[Dict[str, Any]]:
+        """
+        Get every confirmed transaction sent or received by an address.
+        Blocks whose Bloom filter rules the address out are skipped unread.
+        
+        Args:
+            address: Wallet address
+            
+        Returns:
+            List of transactions in chain order
+        """
+        probe = BloomProbe(address)
+        history = []
+        for block in self.chain:
+            if not isinstance(block.transactions, list) or not probe.might_be_in(block.bloom):
+                continue
+            history.extend(tx for tx in block.transactions
+                           if address in (tx['sender'], tx['receiver']))
+        return history
+
+    @_read_locked
+    def get_transaction(self, tx_id: str) -> Optional[Tuple[Dict[str, Any], int]]:
+        """
+        Look up a transaction by id using the transaction index.
+        
+        Args:
+            tx_id: Transaction id
+            
+        Returns:
+            (transaction, confirmations) where confirmations is the number of
+            blocks from the containing block to the tip inclusive (0 while the
+            transaction is still pending), or None if the id is unknown
+        """
+        location = self.tx_index.locate(tx_id)
+        if location:
+            height, position = location
+            return self.chain[height].transactions[position], len(self.chain) - height
+        
+        for tx in self.pending_transactions:
+            if tx.get('id') == tx_id:
+                return tx, 0
+        return None
 
     def get_last_block(self) -> Block:
         """
@@ -152,6 +393,7 @@ class Blockchain:
         """
         return self.chain[-1]
 
+    @_write_locked
     def create_transaction(self, sender: str, receiver: str, amount: float) -> Dict[str, Any]:
         """
         Create a new transaction and add it to pending transactions.
@@ -170,6 +412,273 @@ class Blockchain:
         self.save_pending_transactions()
         return tx_dict
 
+    @_write_locked
+    def add_pending_transaction(self, tx: Dict[str, Any]) -> bool:
+        """
+        Add a transaction created elsewhere (e.g. received from a peer) to the pending pool.
+        
+        Args:
+            tx: Transaction dictionary with an "id"
+            
+        Returns:
+            True if the transaction was added, False if it is malformed (see
+            is_well_formed) or already pending or confirmed
+        """
+        if not is_well_formed(tx):
+            return False
+        if tx.get('id') in self.tx_index:
+            return False
+        if any(pending.get('id') == tx.get('id') for pending in self.pending_transactions):
+            return False
+        self.pending_transactions.append(tx)
+        self.save_pending_transactions()
+        return True
+
+    def is_valid_new_block(self, block: Block) -> bool:
+        """
+        Check whether a block can be appended to the tip of the chain.
+        
+        Args:
+            block: Candidate block
+            
+        Returns:
+            True if the block extends the tip, its hash matches its contents
+            and the hash satisfies the proof-of-work difficulty
+        """
+        return (block.index == len(self.chain)
+                and block.previous_hash == self.chain[-1].hash
+                and block.hash == block.calculate_hash()
+                and block.hash.startswith('0' * self.difficulty)
+                and isinstance(block.transactions, list))
+
+    def add_block(self, block: Block) -> bool:
+        """
+        Validate and append a block mined elsewhere (e.g. received from a peer).
+        
+        Args:
+            block: Block to append
+            
+        Returns:
+            True if the block was appended, False if it was rejected
+        """
+        return self.add_blocks([block]) == 1
+
+    def has_valid_work(self, block: Block) -> bool:
+        """
+        Check a block on its own, regardless of where it attaches.
+        
+        Args:
+            block: Candidate block
+            
+        Returns:
+            True if the hash matches the contents, meets the difficulty and
+            the transactions are valid (see has_valid_transactions)
+        """
+        return (block.hash == block.calculate_hash()
+                and block.hash.startswith('0' * self.difficulty)
+                and self.has_valid_transactions(block))
+
+    def has_valid_transactions(self, block: Block) -> bool:
+        """
+        Check the transactions of a block mined elsewhere before it is stored,
+        indexed or relayed. The indexes read every transaction's id and
+        timestamp, so a malformed one would otherwise leave them out of step
+        with the chain.
+        
+        Args:
+            block: Candidate block
+            
+        Returns:
+            True if the block has a finite timestamp, every transaction is well
+            formed (see is_well_formed) and has a timestamp, and the last one,
+            and only the last one, is a mining reward of mining_reward
+        """
+        timestamp = block.timestamp
+        if isinstance(timestamp, bool) or not isinstance(timestamp, (int, float)) or not math.isfinite(timestamp):
+            return False
+        transactions = block.transactions
+        if not isinstance(transactions, list) or not transactions:
+            return False
+        if not all(is_well_formed(tx) and tx.get('timestamp') is not None for tx in transactions):
+            return False
+        *transfers, reward = transactions
+        if any(tx.get('type') == 'REWARD' or tx['sender'] == "Network Reward" for tx in transfers):
+            return False
+        return (reward.get('type') == 'REWARD'
+                and reward['sender'] == "Network Reward"
+                and reward['amount'] == self.mining_reward)
+
+    @_write_locked
+    def receive_block(self, block: Block) -> str:
+        """
+        Accept a block that may extend the tip, a side branch, or an unknown parent.
+        A side branch that ends up with more cumulative work than the current
+        chain becomes the new chain through a reorganization. Blocks that were
+        waiting for this one as their parent are attached afterwards.
+        
+        Args:
+            block: Block received from a peer
+            
+        Returns:
+            "connected" if it extended the tip, "reorg" if it caused a reorganization,
+            "side" if it was stored on a lighter branch, "orphan" if its parent is
+            unknown, "duplicate" if it is already known, or "invalid"
+        """
+        status = self._attach_block(block)
+        if status in ("connected", "reorg", "side"):
+            tip_hash = self.chain[-1].hash
+            waiting = self.block_tree.pop_orphans(block.hash)
+            while waiting:
+                child = waiting.pop()
+                if self._attach_block(child) in ("connected", "reorg", "side"):
+                    waiting.extend(self.block_tree.pop_orphans(child.hash))
+            if status == "side" and self.chain[-1].hash != tip_hash:
+                status = "reorg"
+        return status
+
+    def _attach_block(self, block: Block) -> str:
+        """
+        Place a single block in the block tree and on the chain if it wins.
+        
+        Args:
+            block: Block to attach
+            
+        Returns:
+            Status as described in receive_block
+        """
+        if block.hash in self.block_tree:
+            return "duplicate"
+        if not self.has_valid_work(block):
+            return "invalid"
+        parent = self.block_tree.entries.get(block.previous_hash)
+        if parent is None:
+            self.block_tree.add_orphan(block)
+            return "orphan"
+        if block.index != parent.height + 1:
+            return "invalid"
+
+        if block.previous_hash == self.chain[-1].hash:
+            return "connected" if self.add_block(block) else "invalid"
+        self.block_tree.add(block)
+        if self.block_tree.work(block.hash) > self.block_tree.work(self.chain[-1].hash):
+            self.reorganize(block.hash)
+            return "reorg"
+        return "side"
+
+    def reorganize(self, new_tip_hash: str) -> int:
+        """
+        Switch the chain to the branch ending at another block in the block tree.
+        Only blocks above the fork point are disconnected and connected, and the
+        indexes, pending pool and completed transactions are updated for just
+        those blocks, so the cost depends on the depth of the reorganization.
+        
+        Args:
+            new_tip_hash: Hash of the tip of the branch to switch to
+            
+        Returns:
+            Number of blocks disconnected from the old chain
+        """
+        fork_hash = self.block_tree.fork_point(self.chain[-1].hash, new_tip_hash)
+        fork_height = self.block_tree.entries[fork_hash].height
+        new_blocks = self.block_tree.branch(fork_hash, new_tip_hash)
+
+        disconnected = []
+        while len(self.chain) - 1 > fork_height:
+            block = self.chain.pop()
+            disconnected.append(block)
+            self.notify_block_disconnected(block)
+        for block in new_blocks:
+            # A bloom sent by a peer is not covered by the block hash, so never trust it
+            block.bloom = self.build_bloom(block)
+            self.chain.append(block)
+        self.save_blockchain()
+
+        removed = [tx for block in reversed(disconnected) for tx in block.transactions]
+        confirmed = [tx for block in new_blocks for tx in block.transactions]
+        removed_ids = {transaction_id(tx) for tx in removed}
+        confirmed_ids = {transaction_id(tx) for tx in confirmed}
+
+        completed_transactions = [tx for tx in self.data_handler.load_completed_transactions()
+                                  if transaction_id(tx) not in removed_ids]
+        completed_transactions.extend(confirmed)
+        self.data_handler.save_completed_transactions(completed_transactions)
+
+        # Transfers dropped from the chain go back to the pending pool; rewards
+        # belong to the block that created them and are discarded with it
+        restored = [tx for tx in removed
+                    if tx.get('type') != 'REWARD' and transaction_id(tx) not in confirmed_ids]
+        for tx in removed:
+            if tx.get('type') == 'REWARD' and transaction_id(tx) not in confirmed_ids:
+                self.revert_reward(tx)
+        restored_ids = {transaction_id(tx) for tx in restored}
+        self.pending_transactions = restored + [
+            tx for tx in self.pending_transactions
+            if transaction_id(tx) not in confirmed_ids and transaction_id(tx) not in restored_ids]
+        self.save_pending_transactions()
+
+        for block in new_blocks:
+            self.notify_block_added(block)
+        print(f"Reorganized chain: {len(disconnected)} blocks replaced by {len(new_blocks)}")
+        return len(disconnected)
+
+    def revert_reward(self, reward: Dict[str, Any]) -> None:
+        """
+        Take back a mining reward credited by this node for a block that left the chain.
+        Only rewards recorded in a local wallet's history were credited, so other
+        rewards are ignored.
+        
+        Args:
+            reward: Reward transaction from the disconnected block
+        """
+        tx_file = self.data_handler.get_transaction_file(reward['receiver'])
+        history = self.data_handler.load_data(tx_file)
+        kept = [tx for tx in history if tx.get('id') != reward.get('id')]
+        if len(kept) == len(history):
+            return
+        self.data_handler.save_data(kept, tx_file)
+        self.data_handler.update_wallet_balance(reward['receiver'], -reward['amount'])
+
+    @_write_locked
+    def add_blocks(self, blocks: List[Block]) -> int:
+        """
+        Validate and append consecutive blocks mined elsewhere, stopping at the
+        first invalid one. Storage is written once for the whole batch.
+        Their transactions are recorded as completed and dropped from the pending pool.
+        Wallet balances are not touched: they are updated when a transaction is
+        sent and by the mining node when a reward is earned.
+        
+        Args:
+            blocks: Blocks to append, in chain order
+            
+        Returns:
+            Number of blocks appended
+        """
+        appended = []
+        for block in blocks:
+            if not self.is_valid_new_block(block) or not self.has_valid_transactions(block):
+                break
+            block.bloom = self.build_bloom(block)
+            self.chain.append(block)
+            appended.append(block)
+        if not appended:
+            return 0
+        
+        self.save_blockchain()
+        
+        confirmed = [tx for block in appended for tx in block.transactions]
+        completed_transactions = self.data_handler.load_completed_transactions()
+        completed_transactions.extend(confirmed)
+        self.data_handler.save_completed_transactions(completed_transactions)
+        
+        included = {tx.get('id') for tx in confirmed}
+        self.pending_transactions = [tx for tx in self.pending_transactions
+                                     if tx.get('id') not in included]
+        self.save_pending_transactions()
+        
+        for block in appended:
+            self.notify_block_added(block)
+        return len(appended)
+
     def mine_pending_transactions(self, miner_address: str) -> int:
         """
         Mine pending transactions and create a new block.
@@ -183,51 +692,90 @@ class Blockchain:
         Raises:
             ValueError: If there are no pending transactions
         """
+        new_block = self.prepare_block(miner_address)
+        if new_block is None:
+            return 0  # Return number of transactions processed
+
+        # Mine the block
+        new_block.nonce = self.proof_of_work(new_block)
+        new_block.hash = new_block.calculate_hash()
+        self.commit_block(new_block, miner_address)
+
+        return len(new_block.transactions) - 1  # Return number of transactions processed
+
+    @_write_locked
+    def prepare_block(self, miner_address: str) -> Optional[Block]:
+        """
+        Build an unmined block of the pending transactions plus the mining reward.
+        Proof of work can then run without holding any lock on the chain.
+        
+        Args:
+            miner_address: Address of the miner who will receive the reward
+            
+        Returns:
+            The candidate block, or None if there are no pending transactions
+        """
         # Load pending transactions
         pending_transactions = self.data_handler.load_pending_transactions()
         if not pending_transactions:
-            return 0  # Return number of transactions processed
+            return None
 
         # Create mining reward transaction
-        reward_transaction = {
-            'sender': "Network Reward",
-            'receiver': miner_address,
-            'amount': self.mining_reward,
-            'timestamp': time.time(),
-            'type': 'REWARD'
-        }
+        reward_transaction = Transaction(
+            "Network Reward", miner_address, self.mining_reward, tx_type='REWARD'
+        ).to_dict()
 
         # Create new block with pending transactions and reward
-        new_block = Block(
+        return Block(
             len(self.chain),
             time.time(),
             pending_transactions + [reward_transaction],
             self.chain[-1].hash if self.chain else "0"
         )
 
-        # Mine the block
-        new_block.nonce = self.proof_of_work(new_block)
-        new_block.hash = new_block.calculate_hash()
+    @_write_locked
+    def commit_block(self, new_block: Block, miner_address: str) -> bool:
+        """
+        Append a block built by prepare_block once its proof of work is found.
+        Transactions that arrived while it was being mined stay pending.
+        
+        Args:
+            new_block: Mined block
+            miner_address: Address of the miner who receives the reward
+            
+        Returns:
+            True if the block was appended, False if the chain moved on meanwhile
+        """
+        if not self.is_valid_new_block(new_block):
+            return False
+        new_block.bloom = self.build_bloom(new_block)
         self.chain.append(new_block)
         self.save_blockchain()  # Save the updated chain
 
         # Update completed transactions
         completed_transactions = self.data_handler.load_completed_transactions()
-        completed_transactions.extend(pending_transactions + [reward_transaction])
+        completed_transactions.extend(new_block.transactions)
         self.data_handler.save_completed_transactions(completed_transactions)
 
-        # Clear pending transactions
-        self.data_handler.save_pending_transactions([])
-        self.pending_transactions = []
+        # Drop the mined transactions from the pending pool
+        included = {transaction_id(tx) for tx in new_block.transactions}
+        self.pending_transactions = [tx for tx in self.data_handler.load_pending_transactions()
+                                     if transaction_id(tx) not in included]
+        self.save_pending_transactions()
 
         # Update miner's wallet with reward
-        self.data_handler.update_wallet_balance(miner_address, self.mining_reward)
+        reward_transaction = new_block.transactions[-1]
+        self.data_handler.update_wallet_balance(miner_address, reward_transaction['amount'])
         
         # Record reward transaction
         self.data_handler.record_transaction(reward_transaction, miner_address, "Network Reward")
 
-        return len(pending_transactions)  # Return number of transactions processed
+        # Let indexes and exporters catch up with the new block
+        BLOCKS_MINED.inc()
+        self.notify_block_added(new_block)
+        return True
 
+    @perf.timed()
     def proof_of_work(self, block: Block) -> int:
         """
         Implement proof-of-work algorithm by finding a nonce that produces a hash
@@ -239,13 +787,51 @@ class Blockchain:
         Returns:
             The nonce value that satisfies the difficulty requirement
         """
-        block.nonce = 0
-        computed_hash = block.calculate_hash()
-        while not computed_hash.startswith('0' * self.difficulty):
-            block.nonce += 1
-            computed_hash = block.calculate_hash()
-        return block.nonce
+        start = 0
+        while True:
+            nonce = self.search_nonce(block, start, self.nonce_batch)
+            if nonce is not None:
+                block.nonce = nonce
+                return nonce
+            start += self.nonce_batch
+
+    def search_nonce(self, block: Block, start: int, count: int) -> Optional[int]:
+        """
+        Try one range of nonces, so callers can report progress or stop between ranges.
+        The "numpy" backend hashes the range in vectorized batches instead of one at a time.
+        
+        Args:
+            block: The block to mine
+            start: First nonce to try
+            count: Number of nonces to try
+            
+        Returns:
+            The first nonce in the range that satisfies the difficulty, or None
+        """
+        # Hash the serialized block around the nonce instead of re-encoding it each try
+        prefix, suffix = block.hash_template()
+        started = time.perf_counter()
+        found = None
+        if self.mining_backend == "numpy":
+            from blockchain.batch_hash import search_nonce_batch
+            found = search_nonce_batch(prefix, suffix, self.difficulty, start, count)
+        else:
+            target = '0' * self.difficulty
+            for nonce in range(start, start + count):
+                if hashlib.sha256(prefix + str(nonce).encode() + suffix).hexdigest().startswith(target):
+                    found = nonce
+                    break
+        
+        # One update per range keeps the metrics out of the per-nonce loop
+        tried = count if found is None else found - start + 1
+        elapsed = time.perf_counter() - started
+        HASHES.inc(tried)
+        if elapsed > 0:
+            HASHRATE.set(tried / elapsed)
+        return found
 
+    @perf.timed()
+    @_read_locked
     def validate_chain(self) -> bool:
         """
         Validate the integrity of the blockchain by checking each block's hash
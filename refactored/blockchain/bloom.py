@@ -0,0 +1,164 @@
+import hashlib
+import math
+from typing import Dict, Any, Iterable, Optional, Tuple
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings.
+    Membership checks can return false positives but never false negatives,
+    so a negative answer proves the item was never added.
+    The bits are held in a single integer so a membership check is one AND.
+    """
+    def __init__(self, size: int, num_hashes: int, bits: int = 0):
+        """
+        Initialize a Bloom filter.
+
+        Args:
+            size: Number of bits in the filter
+            num_hashes: Number of bit positions set per item
+            bits: Existing bit set (defaults to all zeros)
+        """
+        self.size = size
+        self.num_hashes = num_hashes
+        self.bits = bits
+
+    @classmethod
+    def for_capacity(cls, capacity: int, fp_rate: float) -> 'BloomFilter':
+        """
+        Create a filter sized for a number of items and a target false-positive rate.
+
+        Args:
+            capacity: Expected number of distinct items
+            fp_rate: Desired false-positive probability (0 < fp_rate < 1)
+
+        Returns:
+            An empty BloomFilter
+        """
+        capacity = max(capacity, 1)
+        size = max(8, math.ceil(-capacity * math.log(fp_rate) / math.log(2) ** 2))
+        num_hashes = max(1, round(size / capacity * math.log(2)))
+        return cls(size, num_hashes)
+
+    @classmethod
+    def from_items(cls, items: Iterable[str], fp_rate: float) -> 'BloomFilter':
+        """
+        Create a filter holding the given items.
+
+        Args:
+            items: Strings to add
+            fp_rate: Desired false-positive probability
+
+        Returns:
+            A populated BloomFilter
+        """
+        items = set(items)
+        bloom = cls.for_capacity(len(items), fp_rate)
+        for item in items:
+            bloom.add(item)
+        return bloom
+
+    @staticmethod
+    def hash_pair(item: str) -> Tuple[int, int]:
+        """
+        Derive the two base hashes used for double hashing.
+
+        Args:
+            item: String to hash
+
+        Returns:
+            Two 64-bit integers taken from the item's SHA-256 digest
+        """
+        digest = hashlib.sha256(item.encode()).digest()
+        return int.from_bytes(digest[:8], "big"), int.from_bytes(digest[8:16], "big") | 1
+
+    def mask(self, hashes: Tuple[int, int]) -> int:
+        """
+        Bit mask of the positions an item occupies in filters of this shape.
+
+        Args:
+            hashes: Result of hash_pair() for the item
+
+        Returns:
+            Integer with the item's bits set
+        """
+        h1, h2 = hashes
+        mask = 0
+        for i in range(self.num_hashes):
+            mask |= 1 << ((h1 + i * h2) % self.size)
+        return mask
+
+    def add(self, item: str) -> None:
+        """
+        Add an item to the filter.
+
+        Args:
+            item: String to add
+        """
+        self.bits |= self.mask(self.hash_pair(item))
+
+    def __contains__(self, item: str) -> bool:
+        """Whether an item may have been added."""
+        mask = self.mask(self.hash_pair(item))
+        return self.bits & mask == mask
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the filter to a dictionary for storage.
+
+        Returns:
+            Dictionary with the bit count, hash count and hex-encoded bits
+        """
+        return {
+            "size": self.size,
+            "hashes": self.num_hashes,
+            "bits": self.bits.to_bytes((self.size + 7) // 8, "little").hex()
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'BloomFilter':
+        """
+        Create a BloomFilter from a dictionary.
+
+        Args:
+            data: Dictionary produced by to_dict()
+
+        Returns:
+            A new BloomFilter
+        """
+        return cls(data["size"], data["hashes"], int.from_bytes(bytes.fromhex(data["bits"]), "little"))
+
+
+class BloomProbe:
+    """
+    Checks one item against many Bloom filters.
+    The item is hashed once and its bit mask is cached per filter shape, so
+    each check is a dictionary lookup and an integer AND.
+    """
+    def __init__(self, item: str):
+        """
+        Initialize a probe.
+
+        Args:
+            item: String to look for
+        """
+        self.hashes = BloomFilter.hash_pair(item)
+        self._masks: Dict[Tuple[int, int], int] = {}
+
+    def might_be_in(self, bloom: Optional[BloomFilter]) -> bool:
+        """
+        Check whether the item may be in a filter.
+
+        Args:
+            bloom: Filter to check; None (no filter) always matches
+
+        Returns:
+            False if the item is definitely absent, True if it may be present
+        """
+        if bloom is None:
+            return True
+        shape = (bloom.size, bloom.num_hashes)
+        mask = self._masks.get(shape)
+        if mask is None:
+            mask = self._masks[shape] = bloom.mask(self.hashes)
+        return bloom.bits & mask == mask
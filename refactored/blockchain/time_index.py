@@ -0,0 +1,141 @@
+from bisect import bisect_left, bisect_right
+from typing import List, Dict, Any, Optional, Tuple
+from blockchain.block import Block
+from blockchain.bloom import BloomProbe
+
+
+class TimeIndex:
+    """
+    Sorted index over block timestamps and per-block transaction time ranges.
+    Lets time-range queries binary-search straight to the blocks that can
+    contain matching transactions instead of scanning the whole chain.
+
+    Transaction times are not strictly ordered across blocks, so two monotonic
+    helper arrays are kept: the running maximum of each block's latest
+    transaction time (searched for the start of a range) and the running
+    minimum from the end of the chain of each block's earliest transaction
+    time (searched for the end of a range).
+    """
+    def __init__(self, chain: Optional[List[Block]] = None):
+        """
+        Initialize the index, optionally from an existing chain.
+
+        Args:
+            chain: Blocks to index, in chain order
+        """
+        self.block_times: List[float] = []
+        self.tx_ranges: List[Tuple[float, float]] = []
+        self._max_prefix: List[float] = []
+        self._min_suffix: List[float] = []
+        for block in chain or []:
+            self.add_block(block)
+
+    def __len__(self) -> int:
+        """Number of indexed blocks."""
+        return len(self.block_times)
+
+    def add_block(self, block: Block) -> None:
+        """
+        Index a block appended to the end of the chain.
+
+        Args:
+            block: The newly appended block
+        """
+        # The block's own timestamp is part of its range so the same search
+        # also serves lookups by block time
+        times = [block.timestamp]
+        if isinstance(block.transactions, list):
+            times.extend(tx['timestamp'] for tx in block.transactions)
+        low, high = min(times), max(times)
+
+        self.block_times.append(block.timestamp)
+        self.tx_ranges.append((low, high))
+        self._max_prefix.append(max(high, self._max_prefix[-1]) if self._max_prefix else high)
+
+        # Lower the tail of the suffix minima that now exceeds this block's minimum.
+        # Blocks normally arrive in time order, so this touches nothing.
+        start = bisect_right(self._min_suffix, low)
+        self._min_suffix[start:] = [low] * (len(self._min_suffix) - start)
+        self._min_suffix.append(low)
+
+    def remove_last_block(self, block: Block) -> None:
+        """
+        Drop the last indexed block when it is disconnected from the chain.
+
+        Args:
+            block: The removed tip block
+        """
+        self.block_times.pop()
+        self.tx_ranges.pop()
+        self._max_prefix.pop()
+        self._min_suffix.pop()
+
+        # Raise the tail of the suffix minima the removed block had lowered.
+        # Entries stop changing at the first one that was not affected.
+        following = float("inf")
+        for height in range(len(self._min_suffix) - 1, -1, -1):
+            value = min(self.tx_ranges[height][0], following)
+            if value == self._min_suffix[height]:
+                break
+            self._min_suffix[height] = value
+            following = value
+
+    def block_range(self, start_time: float, end_time: float) -> range:
+        """
+        Heights of the blocks that may hold transactions in a time range.
+
+        Args:
+            start_time: Range start (inclusive)
+            end_time: Range end (inclusive)
+
+        Returns:
+            Range of candidate block heights
+        """
+        first = bisect_left(self._max_prefix, start_time)
+        last = bisect_right(self._min_suffix, end_time)
+        return range(first, max(first, last))
+
+    def blocks_between(self, start_time: float, end_time: float) -> List[int]:
+        """
+        Heights of blocks whose own timestamp falls in a time range.
+
+        Args:
+            start_time: Range start (inclusive)
+            end_time: Range end (inclusive)
+
+        Returns:
+            List of block heights
+        """
+        return [height for height in self.block_range(start_time, end_time)
+                if start_time <= self.block_times[height] <= end_time]
+
+    def transactions_between(self, chain: List[Block], start_time: float, end_time: float,
+                             address: Optional[str] = None) -> List[Tuple[int, Dict[str, Any]]]:
+        """
+        Find confirmed transactions in a time range, optionally for one address.
+
+        Args:
+            chain: The indexed chain
+            start_time: Range start (inclusive)
+            end_time: Range end (inclusive)
+            address: Only return transactions sent or received by this address
+
+        Returns:
+            List of (block height, transaction) pairs in chain order
+        """
+        probe = BloomProbe(address) if address is not None else None
+        results = []
+        for height in self.block_range(start_time, end_time):
+            low, high = self.tx_ranges[height]
+            block = chain[height]
+            if high < start_time or low > end_time or not isinstance(block.transactions, list):
+                continue
+            if probe and not probe.might_be_in(block.bloom):
+                continue
+            for tx in block.transactions:
+                if not start_time <= tx['timestamp'] <= end_time:
+                    continue
+                if address is not None and address not in (tx['sender'], tx['receiver']):
+                    continue
+                results.append((height, tx))
+        return results
@@ -1,4 +1,7 @@
 from uuid import uuid4
+import hashlib
+import json
+import math
 import time
 from typing import Dict, Any, Optional
 
@@ -72,3 +75,43 @@ class Transaction:
     def __str__(self) -> str:
         """String representation of the transaction."""
         return f"Transaction(id={self.id}, sender={self.sender}, receiver={self.receiver}, amount={self.amount})"
+
+
+
+def transaction_id(tx: Dict[str, Any]) -> str:
+    """
+    Get a transaction's id. Transactions recorded before every transaction
+    carried an id get a stable one derived from their contents.
+    
+    Args:
+        tx: Transaction dictionary
+        
+    Returns:
+        The transaction's "id", or a SHA-256 hex digest of its contents
+    """
+    return tx.get("id") or hashlib.sha256(json.dumps(tx, sort_keys=True).encode()).hexdigest()
+
+
+def is_well_formed(tx: Any) -> bool:
+    """
+    Check the fields of a transaction received from outside, such as from a peer.
+    
+    Args:
+        tx: Decoded transaction
+        
+    Returns:
+        True if tx is a dictionary with a non-empty "id", "sender" and "receiver",
+        a finite positive "amount" and, if present, a finite "timestamp"
+    """
+    if not isinstance(tx, dict):
+        return False
+    if not all(isinstance(tx.get(field), str) and tx[field] for field in ("id", "sender", "receiver")):
+        return False
+    # JSON decoding accepts NaN and Infinity, and bool is a subclass of int
+    amount = tx.get("amount")
+    if isinstance(amount, bool) or not isinstance(amount, (int, float)) or not math.isfinite(amount) \
+            or amount <= 0:
+        return False
+    timestamp = tx.get("timestamp")
+    return timestamp is None or (not isinstance(timestamp, bool) and isinstance(timestamp, (int, float))
+                                 and math.isfinite(timestamp))
@@ -0,0 +1,141 @@
+from typing import List, Dict, Any, Optional, Tuple
+from blockchain.block import Block
+from blockchain.transaction import transaction_id
+
+
+class TransactionIndex:
+    """
+    Maps every confirmed transaction id to its (block height, position) so any
+    transaction can be located without scanning the chain. The index is kept
+    in an append-only log through the data handler and extended as blocks are
+    appended. Blocks removed by a reorganization are logged as tombstone
+    entries without a height.
+    """
+    def __init__(self, data_handler):
+        """
+        Initialize an empty index.
+
+        Args:
+            data_handler: Handler used to persist the index log
+        """
+        self.data_handler = data_handler
+        self.locations: Dict[str, Tuple[int, int]] = {}
+        self.height = -1
+
+    def __len__(self) -> int:
+        """Number of indexed transactions."""
+        return len(self.locations)
+
+    def __contains__(self, tx_id: str) -> bool:
+        """Whether a transaction id is indexed."""
+        return tx_id in self.locations
+
+    def sync(self, chain: List[Block]) -> None:
+        """
+        Load the persisted index and bring it up to date with the chain.
+        The log is rebuilt if it doesn't match the chain it is loaded for.
+
+        Args:
+            chain: The current chain
+        """
+        self.locations = {}
+        self.height = -1
+        for tx_id, height, position in self.data_handler.load_tx_index():
+            if height is None:
+                self.locations.pop(tx_id, None)
+            else:
+                self.locations[tx_id] = (height, position)
+        self.height = max((height for height, _ in self.locations.values()), default=-1)
+
+        if not self._matches(chain):
+            self.rebuild(chain)
+            return
+
+        for block in chain[self.height + 1:]:
+            self.add_block(block)
+
+    def rebuild(self, chain: List[Block]) -> None:
+        """
+        Re-index the whole chain and rewrite the persisted log.
+
+        Args:
+            chain: The current chain
+        """
+        entries = [entry for block in chain for entry in self._entries(block)]
+        self.locations = {tx_id: (height, position) for tx_id, height, position in entries}
+        self.height = len(chain) - 1
+        self.data_handler.save_tx_index(entries)
+
+    def add_block(self, block: Block) -> None:
+        """
+        Index the transactions of a newly appended block.
+
+        Args:
+            block: The appended block
+        """
+        entries = self._entries(block)
+        for tx_id, height, position in entries:
+            self.locations[tx_id] = (height, position)
+        self.height = block.index
+        self.data_handler.append_tx_index(entries)
+
+    def remove_block(self, block: Block) -> None:
+        """
+        Un-index the transactions of a block disconnected from the chain.
+
+        Args:
+            block: The removed tip block
+        """
+        tombstones = []
+        for tx_id, height, _ in self._entries(block):
+            if self.locations.get(tx_id, (None, None))[0] == height:
+                del self.locations[tx_id]
+                tombstones.append([tx_id, None, None])
+        self.height = block.index - 1
+        self.data_handler.append_tx_index(tombstones)
+
+    def locate(self, tx_id: str) -> Optional[Tuple[int, int]]:
+        """
+        Find where a transaction is stored.
+
+        Args:
+            tx_id: Transaction id
+
+        Returns:
+            (block height, position in block), or None if the id is unknown
+        """
+        return self.locations.get(tx_id)
+
+    def _matches(self, chain: List[Block]) -> bool:
+        """
+        Check the loaded log against the chain by re-deriving the entries of
+        its last indexed block.
+
+        Args:
+            chain: The current chain
+
+        Returns:
+            True if the log can be extended, False if it must be rebuilt
+        """
+        if self.height < 0:
+            return not self.locations
+        if self.height >= len(chain):
+            return False
+        return all(self.locations.get(tx_id) == (height, position)
+                   for tx_id, height, position in self._entries(chain[self.height]))
+
+    @staticmethod
+    def _entries(block: Block) -> List[List[Any]]:
+        """
+        Build index entries for a block.
+
+        Args:
+            block: Block to index
+
+        Returns:
+            List of [tx_id, block height, position] entries
+        """
+        if not isinstance(block.transactions, list):
+            return []
+        return [[transaction_id(tx), block.index, position]
+                for position, tx in enumerate(block.transactions)]
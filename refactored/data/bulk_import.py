@@ -0,0 +1,181 @@
+import csv
+import json
+import math
+import os
+import unicodedata
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+from uuid import uuid4
+
+from utils.validation import validate_name
+
+
+# Balance of a new wallet, as for wallets created from the menu
+STARTING_BALANCE = 100
+
+# Record types: a wallet (which also gets a contact entry) or a contact only
+RECORD_TYPES = ("wallet", "contact")
+
+
+def normalize_name(first_name: str, last_name: str) -> Tuple[str, str]:
+    """
+    Key under which names count as duplicates: Unicode-normalized,
+    case-folded and with surrounding whitespace removed.
+
+    Args:
+        first_name: First name
+        last_name: Last name
+
+    Returns:
+        (normalized first name, normalized last name)
+    """
+    return (unicodedata.normalize("NFKC", first_name).strip().casefold(),
+            unicodedata.normalize("NFKC", last_name).strip().casefold())
+
+
+def _field(record: Dict[str, Any], name: str) -> str:
+    """A record field as a stripped string, "" if it is missing or empty."""
+    value = record.get(name)
+    return "" if value is None else str(value).strip()
+
+
+def read_records(file_path: str) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Read import records from a CSV file with a header row, or a JSONL file
+    with one object per line. Both use the fields first_name, last_name and
+    optionally type ("wallet" or "contact"), balance and address.
+
+    Args:
+        file_path: Path of a .csv, .jsonl or .ndjson file
+
+    Returns:
+        Iterator of (line number, record); the record is None for a JSONL
+        line that isn't a JSON object
+
+    Raises:
+        ValueError: If the file extension is not one of the above
+    """
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension == ".csv":
+        with open(file_path, newline='', encoding='utf-8-sig') as f:
+            reader = csv.DictReader(f)
+            for record in reader:
+                yield reader.line_num, record
+    elif extension in (".jsonl", ".ndjson"):
+        with open(file_path, encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    record = None
+                yield line_number, record if isinstance(record, dict) else None
+    else:
+        raise ValueError(f"Unsupported import file {file_path}: expected .csv, .jsonl or .ndjson")
+
+
+class BulkImporter:
+    """
+    Creates many wallets and contacts at once. Wallets and contacts are loaded
+    once, duplicates are found in a set of normalized names instead of by
+    rescanning the contacts, and both files are written in a single
+    DataHandler.save_files() call while holding the write lock.
+
+    Names follow the same rules as the menu (letters only, at least two), and
+    a name that is already a contact, or appears earlier in the batch, is
+    skipped. Like the menu, every wallet also gets a contact entry.
+    """
+    def __init__(self, data_handler):
+        """
+        Initialize the importer.
+
+        Args:
+            data_handler: Handler whose wallets and contacts are added to
+        """
+        self.data_handler = data_handler
+
+    def import_records(self, records: Iterator[Tuple[int, Optional[Dict[str, Any]]]], default_type: str = "wallet",
+                       dry_run: bool = False) -> Dict[str, Any]:
+        """
+        Validate records and add them to the wallets and contacts.
+
+        Args:
+            records: (line number, record) pairs, e.g. from read_records()
+            default_type: Type of records without a type field, one of RECORD_TYPES
+            dry_run: Check the records without saving anything
+
+        Returns:
+            Dictionary with "wallets" and "contacts" (numbers added), "duplicates"
+            ([line, name]) and "invalid" ([line, reason])
+        """
+        result: Dict[str, Any] = {"wallets": 0, "contacts": 0, "duplicates": [], "invalid": []}
+        with self.data_handler.lock.write():
+            wallets = self.data_handler.load_wallets()
+            contacts = self.data_handler.load_contacts()
+            names: Set[Tuple[str, str]] = {
+                normalize_name(contact["first_name"], contact["last_name"]) for contact in contacts
+            }
+            # Wallets in the older format carry their own names
+            names.update(normalize_name(wallet["first_name"], wallet["last_name"])
+                         for wallet in wallets if "first_name" in wallet and "last_name" in wallet)
+            addresses: Set[str] = {wallet["address"] for wallet in wallets}
+            addresses.update(contact["address"] for contact in contacts)
+
+            for line, record in records:
+                error = self._check(record, default_type) if record is not None else "not a JSON object"
+                if error:
+                    result["invalid"].append([line, error])
+                    continue
+                first_name = _field(record, "first_name")
+                last_name = _field(record, "last_name")
+                key = normalize_name(first_name, last_name)
+                if key in names:
+                    result["duplicates"].append([line, f"{first_name} {last_name}"])
+                    continue
+                address = _field(record, "address") or uuid4().hex
+                if address in addresses:
+                    result["invalid"].append([line, f"address {address} is already in use"])
+                    continue
+                names.add(key)
+                addresses.add(address)
+
+                contacts.append({"first_name": first_name, "last_name": last_name, "address": address})
+                result["contacts"] += 1
+                if (_field(record, "type") or default_type).lower() == "wallet":
+                    balance = _field(record, "balance")
+                    wallets.append({
+                        "address": address,
+                        "nickname": f"{first_name} {last_name}",
+                        "balance": float(balance) if balance else STARTING_BALANCE
+                    })
+                    result["wallets"] += 1
+
+            if not dry_run and result["contacts"]:
+                self.data_handler.save_files({
+                    self.data_handler.wallets_file: wallets,
+                    self.data_handler.contacts_file: contacts
+                })
+        return result
+
+    def _check(self, record: Dict[str, Any], default_type: str) -> Optional[str]:
+        """
+        Check one record's fields.
+
+        Returns:
+            Why the record can't be imported, or None if it can
+        """
+        for field in ("first_name", "last_name"):
+            if not validate_name(_field(record, field)):
+                return f"{field} must contain only letters and be at least 2 characters"
+        record_type = (_field(record, "type") or default_type).lower()
+        if record_type not in RECORD_TYPES:
+            return f"type must be one of {', '.join(RECORD_TYPES)}"
+        balance = _field(record, "balance")
+        if record_type == "wallet" and balance:
+            try:
+                value = float(balance)
+            except ValueError:
+                return "balance must be a number"
+            if not math.isfinite(value) or value < 0:
+                return "balance must be a non-negative number"
+        return None
@@ -0,0 +1,159 @@
+import gc
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+
+# Bumped whenever the pickled classes change shape, so old caches are ignored
+CACHE_VERSION = 1
+
+
+def file_key(file_path: str) -> Optional[Tuple[int, int]]:
+    """
+    Cheap identity of a file's current contents.
+
+    Returns:
+        (size in bytes, modification time in nanoseconds), or None if the file doesn't exist
+    """
+    try:
+        stat = os.stat(file_path)
+    except FileNotFoundError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+def content_hash(file_path: str) -> str:
+    """SHA-256 of a file, read in 1 MiB chunks."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ChainCache:
+    """
+    Sidecar pickle of the decoded chain and its derived indexes, next to
+    blockchain.json. A restart whose blockchain.json still has the size,
+    modification time and SHA-256 recorded in the cache unpickles the Block
+    objects instead of parsing, rehashing and rewriting the JSON.
+
+    The cache is rebuilt on a background thread whenever the chain changes.
+    Like the JSON files it is trusted data: only load caches this
+    application wrote.
+    """
+    def __init__(self, data_handler):
+        """
+        Initialize the cache of a data directory.
+
+        Args:
+            data_handler: Handler whose blockchain.json is cached
+        """
+        self.data_handler = data_handler
+        self.cache_file = os.path.join(data_handler.data_dir, "blockchain.cache")
+        self._thread: Optional[threading.Thread] = None
+        self._dirty = False
+        self._state_lock = threading.Lock()
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """
+        Load the cached chain if it matches blockchain.json.
+
+        Returns:
+            Dictionary with "chain", "block_tree", "time_index" and "tx_index"
+            ((locations, height), or None if the index log changed since),
+            or None if there is no usable cache
+        """
+        try:
+            with self.data_handler.lock.read(), open(self.cache_file, 'rb') as f:
+                # The small header is checked before the chain is unpickled
+                header = pickle.load(f)
+                if (header.get("version") != CACHE_VERSION
+                        or header.get("chain_key") != file_key(self.data_handler.blockchain_file)
+                        or header.get("chain_hash") != content_hash(self.data_handler.blockchain_file)):
+                    return None
+                # Unpickling creates millions of objects; without the cyclic
+                # collector running on them it takes about half the time
+                gc_was_enabled = gc.isenabled()
+                gc.disable()
+                try:
+                    cached = pickle.load(f)
+                finally:
+                    if gc_was_enabled:
+                        gc.enable()
+                if header.get("tx_index_key") != file_key(self.data_handler.tx_index_file):
+                    cached["tx_index"] = None
+                return cached
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError,
+                TypeError, ValueError):
+            return None
+
+    def save(self, blockchain) -> None:
+        """
+        Write the cache of a blockchain. The state is captured under the read
+        lock, so it matches the files it is keyed by; the file is written after.
+
+        Args:
+            blockchain: Blockchain whose chain and indexes are cached
+        """
+        with self.data_handler.lock.read():
+            header = {
+                "version": CACHE_VERSION,
+                "chain_key": file_key(self.data_handler.blockchain_file),
+                "chain_hash": content_hash(self.data_handler.blockchain_file),
+                "tx_index_key": file_key(self.data_handler.tx_index_file)
+            }
+            body = pickle.dumps({
+                "chain": blockchain.chain,
+                "block_tree": blockchain.block_tree,
+                "time_index": blockchain.time_index,
+                "tx_index": (blockchain.tx_index.locations, blockchain.tx_index.height)
+            }, protocol=pickle.HIGHEST_PROTOCOL)
+        fd, temp_path = tempfile.mkstemp(prefix=".tmp-", dir=os.path.dirname(self.cache_file) or ".")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+                f.write(body)
+            os.replace(temp_path, self.cache_file)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+    def rebuild_async(self, blockchain) -> None:
+        """
+        Rewrite the cache on a background thread. Requests made while a rebuild
+        runs are folded into one more rebuild after it.
+
+        Args:
+            blockchain: Blockchain whose chain and indexes are cached
+        """
+        with self._state_lock:
+            if self._thread is not None:
+                self._dirty = True
+                return
+            # Not a daemon thread, so a short-lived command still leaves a cache behind
+            self._thread = threading.Thread(target=self._rebuild, args=(blockchain,),
+                                            name="chain-cache")
+            self._thread.start()
+
+    def wait(self) -> None:
+        """Block until any background rebuild has finished."""
+        thread = self._thread
+        if thread is not None:
+            thread.join()
+
+    def _rebuild(self, blockchain) -> None:
+        """Save the cache until no further rebuild was requested."""
+        while True:
+            try:
+                self.save(blockchain)
+            except Exception as e:
+                print(f"Error saving chain cache: {str(e)}")
+            with self._state_lock:
+                if not self._dirty:
+                    self._thread = None
+                    return
+                self._dirty = False
@@ -1,13 +1,32 @@
+import contextlib
 import json
 import os
+import tempfile
+import time
 from typing import Dict, List, Any, Optional
 
+from data.locking import FileLock, ReadWriteLock
+from metrics.registry import REGISTRY
+from utils import perf
+
+# Metrics served with --metrics-port (see metrics/server.py)
+IO_SECONDS = REGISTRY.histogram("data_io_seconds",
+                                "Time to load or save a data file, including waiting for the lock",
+                                ("operation", "file"))
+IO_BYTES = REGISTRY.counter("data_io_bytes_total", "Bytes of data files read and written",
+                            ("operation", "file"))
+FILE_SIZE = REGISTRY.gauge("data_file_size_bytes", "Size of a data file", ("file",))
+
 
 class DataHandler:
     """
     Handles the storage and retrieval of blockchain data, wallets, contacts, and transactions.
     All file operations are centralized in this class to allow for changing storage mechanisms
     in the future (e.g., switching from JSON files to a database).
+    
+    Reads hold `lock` shared and writes hold it exclusively, both within the
+    process and, through a lock file in the data directory, across processes.
+    Files are replaced atomically, so a reader never sees half-written JSON.
     """
     def __init__(self, data_dir: str = ""):
         """
@@ -25,10 +44,27 @@ class DataHandler:
         self.pending_transactions_file = os.path.join(data_dir, "pending_transactions.json")
         self.completed_transactions_file = os.path.join(data_dir, "completed_transactions.json")
         self.blockchain_file = os.path.join(data_dir, "blockchain.json")
+        self.tx_index_file = os.path.join(data_dir, "tx_index.jsonl")
+        self.lock_file = os.path.join(data_dir, ".data.lock")
         
         # Ensure transactions directory exists
         os.makedirs(self.transactions_dir, exist_ok=True)
+        
+        self.lock = ReadWriteLock(FileLock(self.lock_file))
+
+    def bind_metrics(self) -> None:
+        """
+        Make the data file size gauges read this handler's files when scraped.
+        The gauges are shared by the process, so only the application's own
+        handler should call this, once; handlers of temporary directories,
+        such as in benchmarks, leave them alone.
+        """
+        for path in (self.wallets_file, self.contacts_file, self.pending_transactions_file,
+                     self.completed_transactions_file, self.blockchain_file, self.tx_index_file):
+            FILE_SIZE.labels(file=os.path.basename(path)).set_function(
+                lambda path=path: os.path.getsize(path))
     
+    @perf.timed()
     def load_data(self, file_path: str) -> Any:
         """
         Load data from a JSON file.
@@ -39,12 +75,19 @@ class DataHandler:
         Returns:
             Loaded data, or empty list if file doesn't exist or is invalid
         """
+        started = time.perf_counter()
         try:
-            with open(file_path, 'r') as f:
-                return json.load(f)
+            with self.lock.read(), open(file_path, 'r') as f:
+                size = os.fstat(f.fileno()).st_size
+                if perf.enabled:
+                    perf.add_bytes(read=size)
+                data = json.load(f)
         except (FileNotFoundError, json.JSONDecodeError):
             return []
+        self._record_io("load", file_path, size, time.perf_counter() - started)
+        return data
     
+    @perf.timed()
     def save_data(self, data: Any, file_path: str) -> None:
         """
         Save data to a JSON file.
@@ -53,8 +96,56 @@ class DataHandler:
             data: Data to save
             file_path: Path where data will be saved
         """
-        with open(file_path, 'w') as f:
+        started = time.perf_counter()
+        with self.lock.write(), _AtomicFile(file_path) as f:
             json.dump(data, f, indent=2)
+            f.flush()
+            size = os.fstat(f.fileno()).st_size
+            if perf.enabled:
+                perf.add_bytes(written=size)
+        self._record_io("save", file_path, size, time.perf_counter() - started)
+    
+    @perf.timed()
+    def save_files(self, data_by_path: Dict[str, Any]) -> None:
+        """
+        Save several JSON files as one change. Every file is written to a
+        temporary file first, and they are only moved into place once all of
+        them were written, so an error leaves all the files as they were.
+        
+        Args:
+            data_by_path: Data to save, keyed by the path it is saved to
+        """
+        started = time.perf_counter()
+        sizes = {}
+        with self.lock.write(), contextlib.ExitStack() as stack:
+            for file_path, data in data_by_path.items():
+                f = stack.enter_context(_AtomicFile(file_path))
+                json.dump(data, f, indent=2)
+                f.flush()
+                sizes[file_path] = os.fstat(f.fileno()).st_size
+                if perf.enabled:
+                    perf.add_bytes(written=sizes[file_path])
+        seconds = time.perf_counter() - started
+        for file_path, size in sizes.items():
+            self._record_io("save", file_path, size, seconds / len(sizes))
+    
+    def _record_io(self, operation: str, file_path: str, size: int, seconds: float) -> None:
+        """
+        Update the I/O metrics for one load or save.
+        Wallet history files share one label so the number of series stays fixed.
+        
+        Args:
+            operation: "load" or "save"
+            file_path: Path of the file
+            size: Bytes read or written
+            seconds: Time the operation took
+        """
+        if os.path.dirname(file_path) == self.transactions_dir:
+            name = "transactions/"
+        else:
+            name = os.path.basename(file_path)
+        IO_SECONDS.labels(operation, name).observe(seconds)
+        IO_BYTES.labels(operation, name).inc(size)
     
     def load_blockchain(self) -> List[Dict[str, Any]]:
         """
@@ -74,6 +165,40 @@ class DataHandler:
         """
         self.save_data(chain_data, self.blockchain_file)
     
+    def load_tx_index(self) -> List[List[Any]]:
+        """
+        Load the transaction-id index log.
+        
+        Returns:
+            List of [tx_id, block height, position] entries, or empty list if not found
+        """
+        try:
+            with self.lock.read(), open(self.tx_index_file, 'r') as f:
+                return [json.loads(line) for line in f if line.strip()]
+        except (FileNotFoundError, json.JSONDecodeError):
+            return []
+    
+    def append_tx_index(self, entries: List[List[Any]]) -> None:
+        """
+        Append entries to the transaction-id index log.
+        The log is one JSON entry per line so new blocks never rewrite it.
+        
+        Args:
+            entries: List of [tx_id, block height, position] entries
+        """
+        with self.lock.write(), open(self.tx_index_file, 'a') as f:
+            f.writelines(json.dumps(entry) + "\n" for entry in entries)
+    
+    def save_tx_index(self, entries: List[List[Any]]) -> None:
+        """
+        Replace the transaction-id index log.
+        
+        Args:
+            entries: List of [tx_id, block height, position] entries
+        """
+        with self.lock.write(), _AtomicFile(self.tx_index_file) as f:
+            f.writelines(json.dumps(entry) + "\n" for entry in entries)
+    
     def load_pending_transactions(self) -> List[Dict[str, Any]]:
         """
         Load pending transactions from storage.
@@ -168,7 +293,6 @@ class DataHandler:
             tx_type: Type of transaction ("sent", "received", or "Network Reward")
         """
         tx_file = self.get_transaction_file(wallet_address)
-        transactions = self.load_data(tx_file)
         
         # Add type and block time if not present
         tx_copy = transaction.copy()
@@ -183,8 +307,10 @@ class DataHandler:
         if "block_time" not in tx_copy:
             tx_copy["block_time"] = transaction.get("timestamp")
             
-        transactions.append(tx_copy)
-        self.save_data(transactions, tx_file)
+        with self.lock.write():
+            transactions = self.load_data(tx_file)
+            transactions.append(tx_copy)
+            self.save_data(transactions, tx_file)
     
     def update_wallet_balance(self, address: str, amount_change: float) -> None:
         """
@@ -194,12 +320,13 @@ class DataHandler:
             address: Address of the wallet
             amount_change: Amount to change (positive for receiving, negative for sending)
         """
-        wallets = self.load_wallets()
-        for wallet in wallets:
-            if wallet["address"] == address:
-                wallet["balance"] = wallet.get("balance", 0) + amount_change
-                self.save_wallets(wallets)
-                return
+        with self.lock.write():
+            wallets = self.load_wallets()
+            for wallet in wallets:
+                if wallet["address"] == address:
+                    wallet["balance"] = wallet.get("balance", 0) + amount_change
+                    self.save_wallets(wallets)
+                    return
         
         # If wallet not found, print error
         print(f"Error: Wallet with address {address} not found")
@@ -221,3 +348,33 @@ class DataHandler:
                 contact["last_name"].lower() == last_name.lower()):
                 return True
         return False
+
+
+class _AtomicFile:
+    """
+    Writable file that is written under a temporary name in the same
+    directory and moved over the target with os.replace() on success.
+    """
+    def __init__(self, file_path: str):
+        """
+        Initialize an atomic file.
+        
+        Args:
+            file_path: Path of the file to replace
+        """
+        self.file_path = file_path
+        directory = os.path.dirname(file_path) or "."
+        fd, self.temp_path = tempfile.mkstemp(prefix=".tmp-", dir=directory)
+        self.file = os.fdopen(fd, 'w')
+    
+    def __enter__(self):
+        """Return the temporary file for writing."""
+        return self.file
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        """Move the temporary file into place, or discard it on error."""
+        self.file.close()
+        if exc_type is None:
+            os.replace(self.temp_path, self.file_path)
+        else:
+            os.remove(self.temp_path)
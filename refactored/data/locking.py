@@ -0,0 +1,253 @@
+import contextlib
+import os
+import threading
+from typing import Dict, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class FileLock:
+    """
+    Advisory lock on a file, shared between processes.
+    Uses flock() on POSIX. On Windows msvcrt only offers exclusive locks, so
+    shared requests are taken exclusively there.
+
+    flock() itself lets a steady stream of overlapping shared holders starve
+    an exclusive one, so writers first announce themselves on a second
+    "intent" file, which they hold exclusively until they have the lock.
+    Readers call wait_for_writers() before a shared hold, which blocks while
+    a writer is announced.
+    """
+    def __init__(self, path: str):
+        """
+        Initialize a file lock. The lock and intent files are created on first use.
+
+        Args:
+            path: Path of the lock file (the intent file is next to it, ending in ".intent")
+        """
+        self.path = path
+        self.intent_path = path + ".intent"
+        self._fd: Optional[int] = None
+        self._intent_fd: Optional[int] = None
+        # flock() holds belong to the open file, not the thread, so the
+        # threads of one process take turns on the intent file
+        self._intent_mutex = threading.Lock()
+        self._held = False
+
+    def acquire(self, shared: bool = False) -> None:
+        """
+        Block until the lock is held. Calling it again while held converts
+        the lock between shared and exclusive. A shared request does not wait
+        for announced writers; call wait_for_writers() first for that.
+
+        Args:
+            shared: Take a shared (reader) lock instead of an exclusive one
+        """
+        if self._fd is None:
+            self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        if fcntl is not None:
+            if shared:
+                fcntl.flock(self._fd, fcntl.LOCK_SH)
+            else:
+                with self._intent_mutex:
+                    fd = self._open_intent()
+                    fcntl.flock(fd, fcntl.LOCK_EX)
+                    try:
+                        fcntl.flock(self._fd, fcntl.LOCK_EX)
+                    finally:
+                        fcntl.flock(fd, fcntl.LOCK_UN)
+        elif not self._held:
+            while True:
+                try:
+                    os.lseek(self._fd, 0, os.SEEK_SET)
+                    msvcrt.locking(self._fd, msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    # LK_LOCK gives up after ten one-second retries
+                    continue
+        self._held = True
+
+    def wait_for_writers(self) -> None:
+        """Block while a writer in any process is waiting for the lock."""
+        if fcntl is None:
+            return
+        with self._intent_mutex:
+            fd = self._open_intent()
+            fcntl.flock(fd, fcntl.LOCK_SH)
+            fcntl.flock(fd, fcntl.LOCK_UN)
+
+    def _open_intent(self) -> int:
+        """The intent file's descriptor, opened on first use."""
+        if self._intent_fd is None:
+            self._intent_fd = os.open(self.intent_path, os.O_RDWR | os.O_CREAT, 0o644)
+        return self._intent_fd
+
+    def release(self) -> None:
+        """Release the lock."""
+        if not self._held:
+            return
+        if fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        else:
+            os.lseek(self._fd, 0, os.SEEK_SET)
+            msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+        self._held = False
+
+
+class ReadWriteLock:
+    """
+    In-process reader/writer lock. Any number of threads may read at once;
+    a writer waits for them to finish and new readers wait behind a waiting
+    writer, so a stream of readers can't starve it. Both sides are re-entrant,
+    and the writing thread may also read. Upgrading a read to a write would
+    deadlock and raises RuntimeError instead.
+
+    Using the lock itself as a context manager takes it for writing.
+    If a FileLock is given, it is held shared while any thread reads and
+    exclusively while a thread writes, which extends the same rules to
+    other processes: each new read first waits for writers announced on the
+    file lock, so a process whose threads keep overlapping reads still lets
+    go of its shared hold. The blocking file lock calls are made without
+    holding the in-process condition, so a lock held by another process only
+    stalls the threads that need it; the others wait for the pending call
+    to finish instead.
+    """
+    def __init__(self, file_lock: Optional[FileLock] = None):
+        """
+        Initialize the lock.
+
+        Args:
+            file_lock: Cross-process lock to hold alongside this one
+        """
+        self.file_lock = file_lock
+        self._cond = threading.Condition(threading.Lock())
+        self._readers: Dict[int, int] = {}
+        self._writer: Optional[int] = None
+        self._write_depth = 0
+        self._waiting_writers = 0
+        # A thread is taking or converting the file lock outside _cond
+        self._file_pending = False
+
+    def acquire_read(self) -> None:
+        """Block until the current thread may read."""
+        me = threading.get_ident()
+        with self._cond:
+            if me in self._readers or self._writer == me:
+                self._readers[me] = self._readers.get(me, 0) + 1
+                return
+        if self.file_lock:
+            self.file_lock.wait_for_writers()
+        with self._cond:
+            while self._writer is not None or self._waiting_writers or self._file_pending:
+                self._cond.wait()
+            if not self._readers and self.file_lock:
+                self._lock_file(shared=True)
+            self._readers[me] = 1
+
+    def release_read(self) -> None:
+        """Release one read hold of the current thread."""
+        me = threading.get_ident()
+        with self._cond:
+            self._readers[me] -= 1
+            if self._readers[me]:
+                return
+            del self._readers[me]
+            if not self._readers and self._writer is None:
+                if self.file_lock:
+                    self.file_lock.release()
+                self._cond.notify_all()
+
+    def acquire_write(self) -> None:
+        """
+        Block until the current thread may write.
+
+        Raises:
+            RuntimeError: If the thread holds a read lock without the write lock
+        """
+        me = threading.get_ident()
+        with self._cond:
+            if self._writer == me:
+                self._write_depth += 1
+                return
+            if me in self._readers:
+                raise RuntimeError("Cannot upgrade a read lock to a write lock")
+            self._waiting_writers += 1
+            try:
+                while self._writer is not None or self._readers or self._file_pending:
+                    self._cond.wait()
+            finally:
+                self._waiting_writers -= 1
+            # Claimed in this process first, so other threads wait while the file lock is pending
+            self._writer = me
+            self._write_depth = 1
+            if self.file_lock:
+                try:
+                    self._lock_file(shared=False)
+                except BaseException:
+                    self._writer = None
+                    self._write_depth = 0
+                    self._cond.notify_all()
+                    raise
+
+    def release_write(self) -> None:
+        """Release one write hold of the current thread."""
+        with self._cond:
+            self._write_depth -= 1
+            if self._write_depth:
+                return
+            if self.file_lock:
+                # Reads taken inside the write may still be open
+                if self._readers:
+                    self._lock_file(shared=True)
+                else:
+                    self.file_lock.release()
+            self._writer = None
+            self._cond.notify_all()
+
+    def _lock_file(self, shared: bool) -> None:
+        """
+        Take or convert the file lock with _cond released, marking it pending
+        meanwhile. Must be called with _cond held.
+
+        Args:
+            shared: Take the file lock shared instead of exclusively
+        """
+        self._file_pending = True
+        self._cond.release()
+        try:
+            self.file_lock.acquire(shared=shared)
+        finally:
+            self._cond.acquire()
+            self._file_pending = False
+            self._cond.notify_all()
+
+    @contextlib.contextmanager
+    def read(self) -> Iterator[None]:
+        """Hold the lock for reading."""
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextlib.contextmanager
+    def write(self) -> Iterator[None]:
+        """Hold the lock for writing."""
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+    def __enter__(self) -> "ReadWriteLock":
+        """Hold the lock for writing."""
+        self.acquire_write()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Release the write hold."""
+        self.release_write()
@@ -7,46 +7,133 @@ a simple blockchain implementation, allowing for wallet management,
 transaction sending, block mining, and more.
 """
 
+import argparse
+import atexit
 import os
 import sys
+from functools import cached_property
+from typing import Any, Callable, Optional
 
 # Add the current directory to the Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from blockchain.blockchain import Blockchain
-from data.data_handler import DataHandler
-from ui.wallet_ui import WalletUI
-from ui.transaction_ui import TransactionUI
-from ui.blockchain_ui import BlockchainUI
-from ui.contacts_ui import ContactsUI
+# Everything else is imported where it is first needed, so one-shot commands
+# only pay for the modules they use (see --startup-profile)
+from blockchain import MINING_BACKENDS
+from utils import perf, startup
 
 print("Starting blockchain application...")
 
 class BlockchainApp:
     """
     Main application class that ties together all components.
+    
+    Only the data handler is created up front. The blockchain, which loads and
+    checks the whole chain, and the UI components are created the first time
+    they are used, so commands that only read the data files start quickly.
     """
-    def __init__(self):
-        """Initialize the application with all required components."""
+    def __init__(self, mining_backend: str = "hashlib", profile_dir: Optional[str] = None):
+        """
+        Initialize the application.
+        
+        Args:
+            mining_backend: Nonce search implementation (see Blockchain)
+            profile_dir: Directory for a cProfile profile of every action (None to not profile)
+        """
         # Set up data directory - using parent directory for compatibility with original data
         self.base_dir = os.path.dirname(os.path.abspath(__file__))
         self.parent_dir = os.path.dirname(self.base_dir)
+        self.mining_backend = mining_backend
         
         # Create data handler pointing to parent directory for data
-        self.data_handler = DataHandler(self.parent_dir)
+        with startup.phase("data handler"):
+            from data.data_handler import DataHandler
+            self.data_handler = DataHandler(self.parent_dir)
         
-        # Initialize blockchain
-        self.blockchain = Blockchain(self.data_handler)
-        
-        # Initialize UI components
-        self.wallet_ui = WalletUI(self.data_handler)
-        self.transaction_ui = TransactionUI(self.data_handler, self.blockchain)
-        self.blockchain_ui = BlockchainUI(self.data_handler, self.blockchain)
-        self.contacts_ui = ContactsUI(self.data_handler)
+        # Profile each dispatched action when asked to; the chain height is
+        # recorded once the blockchain has been loaded
+        self.profiler = None
+        if profile_dir:
+            from utils.profiling import ActionProfiler
+            self.profiler = ActionProfiler(profile_dir, self.data_handler, None)
         
         # Initialize current wallet
         self.current_wallet = None
 
+    @cached_property
+    def blockchain(self):
+        """The blockchain, loaded on first use."""
+        with startup.phase("chain load"):
+            from blockchain.blockchain import Blockchain
+            blockchain = Blockchain(self.data_handler, mining_backend=self.mining_backend)
+        blockchain.bind_metrics()
+        self.data_handler.bind_metrics()
+        if self.profiler:
+            self.profiler.blockchain = blockchain
+        return blockchain
+
+    @cached_property
+    def columnar_exporter(self):
+        """The columnar analytics export, kept in step with the chain from first use."""
+        blockchain = self.blockchain
+        with startup.phase("columnar sync"):
+            from analytics.columnar import ColumnarExporter
+            exporter = ColumnarExporter(self.data_handler)
+            exporter.sync(blockchain.chain)
+            exporter.follow(blockchain)
+        return exporter
+
+    @cached_property
+    def wallet_ui(self):
+        from ui.wallet_ui import WalletUI
+        return WalletUI(self.data_handler)
+
+    @cached_property
+    def transaction_ui(self):
+        from ui.transaction_ui import TransactionUI
+        return TransactionUI(self.data_handler, self.blockchain)
+
+    @cached_property
+    def blockchain_ui(self):
+        from ui.blockchain_ui import BlockchainUI
+        return BlockchainUI(self.data_handler, self.blockchain)
+
+    @cached_property
+    def contacts_ui(self):
+        from ui.contacts_ui import ContactsUI
+        return ContactsUI(self.data_handler)
+
+    @cached_property
+    def stats_ui(self):
+        from ui.stats_ui import StatsUI
+        return StatsUI(self.columnar_exporter, self.blockchain)
+
+    @cached_property
+    def diagnostics_ui(self):
+        from ui.diagnostics_ui import DiagnosticsUI
+        return DiagnosticsUI(self.data_handler, self.blockchain, self.blockchain_ui)
+
+    def stop_auto_miner(self) -> None:
+        """Stop the auto-miner, if the blockchain UI that runs it was ever created."""
+        if "blockchain_ui" in self.__dict__:
+            self.blockchain_ui.stop_auto_miner()
+
+    def dispatch(self, action: str, func: Callable[..., Any], *args) -> Any:
+        """
+        Run a menu action or command, under the profiler if profiling is on.
+        
+        Args:
+            action: Action name the profile is filed under
+            func: Function performing the action
+            args: Arguments for the function
+            
+        Returns:
+            The function's result
+        """
+        if self.profiler:
+            return self.profiler.run(action, func, *args)
+        return func(*args)
+
     def run(self):
         """
         Run the main application loop, displaying the menu and processing user input.
@@ -60,6 +147,7 @@ class BlockchainApp:
             
             if initial_choice == '2':
                 print("\nExiting application. Goodbye!")
+                self.stop_auto_miner()
                 sys.exit(0)
             elif initial_choice != '1':
                 print("\nInvalid choice. Please enter 1 to continue or 2 to exit.")
@@ -73,6 +161,12 @@ class BlockchainApp:
                     continue
                 self.current_wallet = wallet
 
+            # Reload wallet to pick up balance changes, e.g. rewards from the auto-miner
+            for wallet in self.data_handler.load_wallets():
+                if wallet["address"] == self.current_wallet["address"]:
+                    self.current_wallet = wallet
+                    break
+
             # Display current user info
             print("\n" + "="*50)
             # Handle both old and new wallet formats
@@ -82,6 +176,11 @@ class BlockchainApp:
                 user_name = self.current_wallet['nickname']
             print(f"Current User: {user_name}")
             print(f"Balance: {self.current_wallet['balance']}")
+            # The auto-miner can only be running once the blockchain UI exists
+            if "blockchain_ui" in self.__dict__:
+                auto_miner_summary = self.blockchain_ui.auto_miner_summary()
+                if auto_miner_summary:
+                    print(auto_miner_summary)
             print("="*50)
 
             print("\n=== Blockchain Main Menu ===")
@@ -92,9 +191,12 @@ class BlockchainApp:
             print("5. View Contact Transactions")
             print("6. Manage Contacts")
             print("7. Switch Wallet")
-            print("8. Exit")
+            print("8. Auto-Miner")
+            print("9. Exit")
+            if perf.enabled:
+                print("P. Performance Breakdown")
 
-            choice = input("\nEnter choice (1-8): ").strip()
+            choice = input("\nEnter choice (1-9): ").strip()
             if not choice:
                 continue  # In main menu, Enter just refreshes the menu
 
@@ -110,14 +212,14 @@ class BlockchainApp:
                         print("\n No contacts available! Please add contacts first.")
                         continue
 
-                    self.transaction_ui.send_transaction(self.current_wallet)
+                    self.dispatch("send", self.transaction_ui.send_transaction, self.current_wallet)
 
                 elif choice == '2':
                     if not self.current_wallet:
                         print("\n Please select or create a wallet first!")
                         continue
 
-                    self.blockchain_ui.mine_transactions(self.current_wallet)
+                    self.dispatch("mine", self.blockchain_ui.mine_transactions, self.current_wallet)
                     # Reload wallet to get updated balance
                     wallets = self.data_handler.load_wallets()
                     for wallet in wallets:
@@ -126,28 +228,40 @@ class BlockchainApp:
                             break
 
                 elif choice == '3':
-                    self.blockchain_ui.view_blockchain()
+                    self.dispatch("view-blockchain", self.blockchain_ui.view_blockchain)
 
                 elif choice == '4':
                     if not self.current_wallet:
                         print("\n No wallet selected!")
                         continue
                         
-                    self.transaction_ui.view_transaction_history(self.current_wallet['address'])
+                    self.dispatch("history", self.transaction_ui.view_transaction_history,
+                                  self.current_wallet['address'])
 
                 elif choice == '5':
-                    self.transaction_ui.view_contact_transactions()
+                    self.dispatch("contact-history", self.transaction_ui.view_contact_transactions)
 
                 elif choice == '6':
-                    self.contacts_ui.manage_contacts()
+                    self.dispatch("contacts", self.contacts_ui.manage_contacts)
 
                 elif choice == '7':
                     self.current_wallet = self.wallet_ui.select_wallet()
 
                 elif choice == '8':
+                    if not self.current_wallet:
+                        print("\n Please select or create a wallet first!")
+                        continue
+
+                    self.dispatch("auto-miner", self.blockchain_ui.manage_auto_miner, self.current_wallet)
+
+                elif choice == '9':
                     print("\n Exiting...")
+                    self.stop_auto_miner()
                     sys.exit(0)
 
+                elif choice.upper() == 'P' and perf.enabled:
+                    print_perf_report()
+
                 else:
                     print("\n Invalid choice")
 
@@ -158,6 +272,181 @@ class BlockchainApp:
             input("\nPress Enter to continue...")
 
 
+def print_perf_report() -> None:
+    """Print the time spent in instrumented functions so far (see utils/perf.py)."""
+    print("\n=== Performance Breakdown ===")
+    print(perf.format_report())
+
+
+def print_startup_report() -> None:
+    """Print the startup phases and slowest imports recorded with --startup-profile."""
+    # Rendering the report imports tabulate, which shouldn't show up in it
+    startup.disable()
+    print("\n=== Startup Profile ===")
+    print(startup.format_report())
+
+
+def positive_seconds(value: str) -> int:
+    """
+    argparse type for durations that must be a positive whole number of seconds.
+
+    Raises:
+        argparse.ArgumentTypeError: If the value is not an integer above zero
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}")
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"must be a positive number of seconds, got {number}")
+    return number
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """
+    Parse command-line arguments. Without a command the interactive menu is started.
+    
+    Args:
+        argv: Argument list (defaults to sys.argv[1:])
+        
+    Returns:
+        Parsed arguments
+    """
+    parser = argparse.ArgumentParser(description="Simple Blockchain Application")
+    parser.add_argument("--mining-backend", choices=MINING_BACKENDS, default="hashlib",
+                        help="Nonce search implementation: a hashlib loop or batched NumPy "
+                             "SHA-256, which is slower than hashlib and meant for experiments "
+                             "(default: hashlib)")
+    parser.add_argument("--perf", action="store_true",
+                        help="Time hot paths (file I/O, hashing, mining, validation, table "
+                             "rendering) and print the breakdown on exit")
+    parser.add_argument("--profile", metavar="DIR", default=os.environ.get("BLOCKCHAIN_PROFILE"),
+                        help="Profile every menu action or command with cProfile, writing .pstats, "
+                             "collapsed stacks and .json tags to DIR (default: $BLOCKCHAIN_PROFILE)")
+    parser.add_argument("--metrics-port", type=int,
+                        help="Serve Prometheus metrics at http://<metrics-host>:<port>/metrics")
+    parser.add_argument("--metrics-host", default="127.0.0.1",
+                        help="Interface the metrics endpoint listens on (default: 127.0.0.1)")
+    parser.add_argument("--startup-profile", action="store_true",
+                        help="Time startup phases and the imports made after argument parsing, "
+                             "and print them on exit")
+    commands = parser.add_subparsers(dest="command")
+    
+    stats_parser = commands.add_parser("stats", help="Show chain statistics and exit")
+    stats_parser.add_argument("--period", type=positive_seconds, default=3600,
+                              help="Reporting period in seconds (default: 3600)")
+    stats_parser.add_argument("--top", type=int, default=10,
+                              help="Number of addresses in top lists (default: 10)")
+    
+    memory_parser = commands.add_parser("memory", help="Show the memory footprint and exit")
+    memory_parser.add_argument("--tracemalloc", nargs="?", const="memory_trace", metavar="DIR",
+                               help="Also trace allocations while loading, mining and viewing a "
+                                    "copy of the data, writing snapshots and diffs to DIR "
+                                    "(default: memory_trace)")
+    memory_parser.add_argument("--top", type=int, default=10,
+                               help="Number of allocation sites per step (default: 10)")
+    
+    balance_parser = commands.add_parser("balance",
+                                         help="Show a wallet's balance and exit, without loading the chain")
+    balance_parser.add_argument("wallet", help="Wallet address or nickname")
+    
+    history_parser = commands.add_parser("history",
+                                         help="Show a wallet's transactions and exit, without loading "
+                                              "the chain")
+    history_parser.add_argument("wallet", help="Wallet address or nickname")
+    
+    import_parser = commands.add_parser("import",
+                                        help="Create wallets and contacts from a CSV or JSONL file and exit")
+    import_parser.add_argument("file", help="CSV file with a header row, or JSONL file, with first_name, "
+                                            "last_name and optional type, balance and address fields")
+    import_parser.add_argument("--type", choices=("wallet", "contact"), default="wallet",
+                               help="Type of records without a type field (default: wallet)")
+    import_parser.add_argument("--dry-run", action="store_true",
+                               help="Check the file and report what would be added, without saving")
+    
+    tx_parser = commands.add_parser("tx", help="Look up a transaction by id and exit")
+    tx_parser.add_argument("tx_id", help="Transaction id")
+    
+    node_parser = commands.add_parser("node", help="Run a peer-to-peer network node")
+    node_parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on")
+    node_parser.add_argument("--port", type=int, default=8333, help="Port to listen on")
+    node_parser.add_argument("--peer", action="append", default=[],
+                             help="Peer address as host:port (repeatable)")
+    
+    api_parser = commands.add_parser("api", help="Run the HTTP/JSON API server")
+    api_parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on")
+    api_parser.add_argument("--port", type=int, default=8080, help="Port to listen on")
+    
+    pool_parser = commands.add_parser("pool", help="Mine with a pool of worker processes")
+    pool_parser.add_argument("--miner", required=True, help="Address receiving the mining rewards")
+    pool_parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on")
+    pool_parser.add_argument("--port", type=int, default=3333, help="Port to listen on")
+    pool_parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                             help="Local worker processes to start (default: one per CPU)")
+    pool_parser.add_argument("--blocks", type=int, default=1, help="Blocks to mine (default: 1)")
+    
+    return parser.parse_args(argv)
+
+
 if __name__ == "__main__":
-    app = BlockchainApp()
-    app.run()
+    args = parse_args()
+    if args.startup_profile:
+        startup.enable()
+        atexit.register(print_startup_report)
+    if args.perf:
+        perf.enable()
+        atexit.register(print_perf_report)
+    if args.metrics_port is not None:
+        from metrics.server import MetricsServer
+        metrics_server = MetricsServer(host=args.metrics_host, port=args.metrics_port)
+        metrics_server.start()
+        print(f"Serving metrics on http://{metrics_server.host}:{metrics_server.port}/metrics")
+    app = BlockchainApp(args.mining_backend, args.profile)
+    if args.command == "balance":
+        sys.exit(0 if app.dispatch("balance", app.wallet_ui.show_balance, args.wallet) else 1)
+    elif args.command == "history":
+        from ui.transaction_ui import TransactionUI
+        wallet = app.wallet_ui.find_wallet(args.wallet)
+        if not wallet:
+            print(f"\n Wallet not found: {args.wallet}")
+            sys.exit(1)
+        # Reads the wallet's transaction file only; no blockchain needed
+        app.dispatch("history", TransactionUI(app.data_handler, None).show_history, wallet["address"])
+    elif args.command == "import":
+        sys.exit(0 if app.dispatch("import", app.wallet_ui.import_file, args.file, args.type,
+                                   args.dry_run) else 1)
+    elif args.command == "stats":
+        app.dispatch("stats", app.stats_ui.show_stats, args.period, args.top)
+    elif args.command == "memory":
+        app.dispatch("memory", app.diagnostics_ui.show_memory)
+        if args.tracemalloc:
+            app.diagnostics_ui.trace_allocations(args.tracemalloc, args.top)
+    elif args.command == "tx":
+        sys.exit(0 if app.dispatch("tx", app.blockchain_ui.show_transaction, args.tx_id) else 1)
+    elif args.command == "node":
+        import asyncio
+        from network.node import run_node
+        try:
+            asyncio.run(run_node(app.blockchain, args.host, args.port, args.peer))
+        except KeyboardInterrupt:
+            print("\nNode stopped.")
+    elif args.command == "api":
+        import asyncio
+        from api.server import run_api
+        try:
+            asyncio.run(run_api(app.blockchain, app.data_handler, args.host, args.port))
+        except KeyboardInterrupt:
+            print("\nAPI server stopped.")
+    elif args.command == "pool":
+        import asyncio
+        from mining.pool import PoolError, run_pool
+        try:
+            asyncio.run(run_pool(app.blockchain, args.miner, args.host, args.port,
+                                 args.workers, args.blocks))
+        except PoolError as e:
+            print(f"Mining pool failed: {e}.")
+            sys.exit(1)
+        except KeyboardInterrupt:
+            print("\nMining pool stopped.")
+    else:
+        app.run()
@@ -0,0 +1,341 @@
+import bisect
+import math
+import threading
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+
+# Default histogram buckets in seconds, from 100 microseconds to 10 seconds
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+                   0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value the way the Prometheus text format expects."""
+    if value == math.inf:
+        return "+Inf"
+    if value == -math.inf:
+        return "-Inf"
+    if value != value:
+        return "NaN"
+    if float(value).is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    """Format a label set as {name="value",...}, or an empty string."""
+    if not names:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+               for value in values)
+    return "{" + ",".join(f'{name}="{value}"' for name, value in zip(names, escaped)) + "}"
+
+
+class _Metric:
+    """
+    Base class of a metric family: one metric name with a child per label set.
+    Without label names the family has a single child and can be updated directly.
+    """
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        """
+        Initialize a metric family.
+
+        Args:
+            name: Metric name, e.g. "blockchain_height"
+            documentation: Help text
+            labelnames: Names of the labels that tell children apart
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._children: Dict[Tuple[str, ...], "_Metric"] = {}
+        if not self.labelnames:
+            self._children[()] = self
+
+    def labels(self, *values, **labels) -> "_Metric":
+        """
+        Get the child for a label set, creating it on first use.
+
+        Args:
+            values: Label values in the order of labelnames
+            labels: Label values by name
+
+        Returns:
+            The child metric
+
+        Raises:
+            ValueError: If the label names don't match
+        """
+        if labels:
+            if values or set(labels) != set(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {', '.join(self.labelnames)}")
+            values = tuple(labels[name] for name in self.labelnames)
+        # Fast path for string label values that were seen before
+        child = self._children.get(values)
+        if child is None:
+            key = tuple(str(value) for value in values)
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {', '.join(self.labelnames)}")
+            with self._lock:
+                child = self._children.get(key)
+                if child is None:
+                    child = self._children[key] = self._new_child()
+        return child
+
+    def _new_child(self) -> "_Metric":
+        """Create an unlabelled metric of the same kind for one label set."""
+        return type(self)(self.name, self.documentation)
+
+    def _samples(self) -> List[Tuple[str, Sequence[str], Sequence[str], float]]:
+        """Samples of one child as (suffix, extra label names, extra label values, value)."""
+        raise NotImplementedError
+
+    def expose(self) -> str:
+        """
+        Render the family in the Prometheus text format.
+
+        Returns:
+            HELP and TYPE lines followed by one line per sample
+        """
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for key, child in sorted(self._children.items()):
+            try:
+                samples = child._samples()
+            except Exception:
+                continue  # e.g. a gauge function reading a file that doesn't exist yet
+            for suffix, names, values, value in samples:
+                labels = _format_labels(self.labelnames + tuple(names), key + tuple(values))
+                lines.append(f"{self.name}{suffix}{labels} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+class Counter(_Metric):
+    """
+    Value that only goes up, such as blocks mined or bytes written.
+    """
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        """
+        Initialize a counter at zero.
+
+        Args:
+            name: Metric name, ending in "_total" by convention
+            documentation: Help text
+            labelnames: Names of the labels that tell children apart
+        """
+        self._value = 0.0
+        super().__init__(name, documentation, labelnames)
+
+    def inc(self, amount: float = 1) -> None:
+        """
+        Increase the counter.
+
+        Args:
+            amount: Non-negative amount to add
+
+        Raises:
+            ValueError: If the amount is negative
+        """
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> float:
+        """Current value."""
+        return self._value
+
+    def _samples(self):
+        """The counter's single sample."""
+        return [("", (), (), self._value)]
+
+
+class Gauge(_Metric):
+    """
+    Value that goes up and down, such as the pending pool size. The value can
+    also come from a function called at scrape time, which costs nothing
+    between scrapes.
+    """
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        """
+        Initialize a gauge at zero.
+
+        Args:
+            name: Metric name
+            documentation: Help text
+            labelnames: Names of the labels that tell children apart
+        """
+        self._value = 0.0
+        self._function: Optional[Callable[[], float]] = None
+        super().__init__(name, documentation, labelnames)
+
+    def set(self, value: float) -> None:
+        """Set the gauge."""
+        self._value = value
+
+    def inc(self, amount: float = 1) -> None:
+        """Increase the gauge."""
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1) -> None:
+        """Decrease the gauge."""
+        with self._lock:
+            self._value -= amount
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        """
+        Read the value from a function whenever the gauge is scraped.
+
+        Args:
+            function: Returns the current value
+        """
+        self._function = function
+
+    @property
+    def value(self) -> float:
+        """Current value."""
+        return self._function() if self._function else self._value
+
+    def _samples(self):
+        """The gauge's single sample."""
+        return [("", (), (), self.value)]
+
+
+class Histogram(_Metric):
+    """
+    Distribution of observed values, such as I/O latencies, counted into
+    cumulative buckets with a running sum and count.
+    """
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """
+        Initialize an empty histogram.
+
+        Args:
+            name: Metric name
+            documentation: Help text
+            labelnames: Names of the labels that tell children apart
+            buckets: Increasing upper bounds; +Inf is added automatically
+        """
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self) -> "Histogram":
+        """Create an unlabelled histogram with the same buckets."""
+        return Histogram(self.name, self.documentation, buckets=self.buckets)
+
+    def observe(self, value: float) -> None:
+        """
+        Record one value.
+
+        Args:
+            value: Observed value
+        """
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    @property
+    def count(self) -> int:
+        """Number of observed values."""
+        return sum(self._counts)
+
+    @property
+    def sum(self) -> float:
+        """Sum of observed values."""
+        return self._sum
+
+    def _samples(self):
+        """Cumulative bucket counts, then the sum and count."""
+        with self._lock:
+            counts = list(self._counts)
+            total = self._sum
+        samples = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (math.inf,), counts):
+            cumulative += count
+            samples.append(("_bucket", ("le",), (_format_value(bound),), cumulative))
+        samples.append(("_sum", (), (), total))
+        samples.append(("_count", (), (), cumulative))
+        return samples
+
+
+class Registry:
+    """
+    Collection of metric families exposed together.
+    Metrics are looked up by name, so modules and repeated instances (several
+    Blockchains in one process, for example) share the same family.
+    """
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, documentation: str, labelnames: Sequence[str],
+                       **kwargs) -> _Metric:
+        """
+        Return the registered family with this name, registering it first if needed.
+
+        Raises:
+            ValueError: If the name is registered with another type or labels
+        """
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, documentation, labelnames, **kwargs)
+            elif type(metric) is not cls or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"Metric {name} is already registered as a different metric")
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Get or register a Counter (see Counter)."""
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        """Get or register a Gauge (see Gauge)."""
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        """Get or register a Histogram (see Histogram)."""
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def get(self, name: str) -> Optional[_Metric]:
+        """
+        Look up a registered family.
+
+        Args:
+            name: Metric name
+
+        Returns:
+            The metric family, or None
+        """
+        return self._metrics.get(name)
+
+    def expose(self) -> str:
+        """
+        Render every family in the Prometheus text exposition format (version 0.0.4).
+
+        Returns:
+            The metrics page
+        """
+        with self._lock:
+            metrics = sorted(self._metrics.items())
+        return "".join(metric.expose() for _, metric in metrics)
+
+
+# Registry the application's metrics are registered in and served from
+REGISTRY = Registry()
@@ -0,0 +1,65 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+from metrics.registry import REGISTRY, Registry
+
+
+# Content type of the Prometheus text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class MetricsServer:
+    """
+    Serves a metrics registry at /metrics in the Prometheus text format from a
+    background thread, so it runs alongside the menu, the node or the API.
+    """
+    def __init__(self, registry: Registry = REGISTRY, host: str = "127.0.0.1", port: int = 9100):
+        """
+        Initialize the server.
+
+        Args:
+            registry: Metrics to serve
+            host: Interface to listen on
+            port: Port to listen on (0 picks a free port)
+        """
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self.httpd: Optional[ThreadingHTTPServer] = None
+        self.thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start listening in a daemon thread."""
+        registry = self.registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                """Answer /metrics with the exposition, anything else with 404."""
+                if self.path.split("?", 1)[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry.expose().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                """Don't log every scrape to stderr."""
+
+        self.httpd = ThreadingHTTPServer((self.host, self.port), Handler)
+        self.httpd.daemon_threads = True
+        self.port = self.httpd.server_address[1]
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name="metrics-server",
+                                       daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        """Stop serving and close the socket."""
+        if self.httpd:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+            self.thread.join()
+            self.httpd = None
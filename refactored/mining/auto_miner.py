@@ -0,0 +1,170 @@
+import threading
+import time
+from typing import Dict, Any, Optional
+
+from blockchain.block import Block
+
+
+# Mine once this many transactions are pending
+DEFAULT_MIN_TRANSACTIONS = 5
+# ... or once the oldest pending transaction is this many seconds old
+DEFAULT_MAX_AGE = 60.0
+# Seconds between checks of the pending pool
+DEFAULT_POLL_INTERVAL = 1.0
+
+
+class AutoMiner:
+    """
+    Background thread that mines whenever the pending pool passes a size or
+    age threshold. The chain lock is only held while a block is prepared and
+    committed; the proof of work runs in nonce batches outside it, so new
+    transactions can be sent meanwhile and go into the next block.
+    """
+    def __init__(self, blockchain, miner_address: str,
+                 min_transactions: int = DEFAULT_MIN_TRANSACTIONS,
+                 max_age: float = DEFAULT_MAX_AGE,
+                 poll_interval: float = DEFAULT_POLL_INTERVAL):
+        """
+        Initialize the auto-miner.
+
+        Args:
+            blockchain: Blockchain to mine on
+            miner_address: Address receiving the mining rewards
+            min_transactions: Pending pool size that triggers mining
+            max_age: Age in seconds of the oldest pending transaction that triggers mining
+            poll_interval: Seconds between checks of the pending pool
+        """
+        self.blockchain = blockchain
+        self.miner_address = miner_address
+        self.min_transactions = min_transactions
+        self.max_age = max_age
+        self.poll_interval = poll_interval
+        self.blocks_mined = 0
+        self.transactions_mined = 0
+        self.last_block: Optional[Block] = None
+        self.current_block: Optional[Block] = None
+        self.current_hashes = 0
+        self.current_started = 0.0
+        self.total_hashes = 0
+        self.mining_seconds = 0.0
+        self.error: Optional[str] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the background thread is active."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start mining in the background."""
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="auto-miner", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop after the current nonce batch; a half-mined block is discarded."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    @property
+    def hashrate(self) -> float:
+        """Hashes per second, for the block in progress or else over all mining so far."""
+        if self.current_block is not None:
+            elapsed = time.perf_counter() - self.current_started
+            return self.current_hashes / elapsed if elapsed > 0 else 0.0
+        return self.total_hashes / self.mining_seconds if self.mining_seconds else 0.0
+
+    def status(self) -> Dict[str, Any]:
+        """
+        Describe what the auto-miner is doing.
+
+        Returns:
+            Dictionary with state, progress and totals
+        """
+        block = self.current_block
+        if not self.running:
+            state = "stopped"
+        elif block is not None:
+            state = f"mining block {block.index} ({len(block.transactions) - 1} transactions)"
+        else:
+            state = "waiting for transactions"
+        return {
+            "state": state,
+            "miner": self.miner_address,
+            "hashes": self.current_hashes if block is not None else 0,
+            "hashrate": self.hashrate,
+            "blocks_mined": self.blocks_mined,
+            "transactions_mined": self.transactions_mined,
+            "last_block": self.last_block.index if self.last_block else None,
+            "error": self.error,
+        }
+
+    def should_mine(self) -> bool:
+        """
+        Check the pending pool against the size and age thresholds.
+
+        Returns:
+            True if a block should be mined now
+        """
+        with self.blockchain.lock.read():
+            pending = list(self.blockchain.pending_transactions)
+        if not pending:
+            return False
+        if len(pending) >= self.min_transactions:
+            return True
+        oldest = min(tx.get("timestamp", time.time()) for tx in pending)
+        return time.time() - oldest >= self.max_age
+
+    def mine_once(self) -> Optional[Block]:
+        """
+        Mine one block of the pending transactions.
+
+        Returns:
+            The committed block, or None if there was nothing to mine, the
+            miner was stopped, or the chain changed while mining
+        """
+        block = self.blockchain.prepare_block(self.miner_address)
+        if block is None:
+            return None
+        self.current_block = block
+        self.current_hashes = 0
+        self.current_started = time.perf_counter()
+        try:
+            nonce = None
+            while nonce is None:
+                if self._stop.is_set():
+                    return None
+                # Ranges sized for the chain's mining backend, between progress updates and stop checks
+                start = self.current_hashes
+                count = self.blockchain.nonce_batch
+                nonce = self.blockchain.search_nonce(block, start, count)
+                self.current_hashes = start + count if nonce is None else nonce + 1
+        finally:
+            self.total_hashes += self.current_hashes
+            self.mining_seconds += time.perf_counter() - self.current_started
+            self.current_block = None
+
+        block.nonce = nonce
+        block.hash = block.calculate_hash()
+        if not self.blockchain.commit_block(block, self.miner_address):
+            return None
+        self.blocks_mined += 1
+        self.transactions_mined += len(block.transactions) - 1
+        self.last_block = block
+        return block
+
+    def _run(self) -> None:
+        """Thread body: poll the pending pool and mine when a threshold is reached."""
+        while not self._stop.is_set():
+            try:
+                if self.should_mine():
+                    self.mine_once()
+                    continue
+            except Exception as e:
+                self.error = str(e)
+            self._stop.wait(self.poll_interval)
@@ -0,0 +1,212 @@
+import asyncio
+import threading
+import time
+from typing import AsyncIterator, Callable, List, Optional
+
+from blockchain.block import Block
+
+
+# Seconds between progress events
+DEFAULT_PROGRESS_INTERVAL = 0.5
+
+
+class MiningCancelled(Exception):
+    """Raised when awaiting a mining job that was cancelled."""
+
+
+class MiningTimeout(MiningCancelled):
+    """Raised when awaiting a mining job that ran out of time."""
+
+
+class MiningProgress:
+    """
+    Snapshot of a mining job's progress.
+    """
+    def __init__(self, nonces: int, elapsed: float):
+        """
+        Initialize a progress snapshot.
+
+        Args:
+            nonces: Nonces tried so far
+            elapsed: Seconds since the search started
+        """
+        self.nonces = nonces
+        self.elapsed = elapsed
+        self.hashrate = nonces / elapsed if elapsed > 0 else 0.0
+
+    def __str__(self) -> str:
+        """String representation of the progress."""
+        return f"{self.nonces:,} nonces in {self.elapsed:.1f}s ({self.hashrate:,.0f} H/s)"
+
+
+class MiningJob:
+    """
+    Handle for mining the pending transactions without blocking the event loop.
+    The block is prepared and committed under the chain lock; the nonce search
+    runs in an executor thread in batches, checking between batches whether the
+    job was cancelled or timed out and publishing progress to the event loop.
+
+    Await the job for its result. Progress is available as `progress`, through
+    an `on_progress` callback and as an async iterator from `progress_events()`.
+    """
+    def __init__(self, blockchain, miner_address: str, timeout: Optional[float] = None,
+                 on_progress: Optional[Callable[[MiningProgress], None]] = None,
+                 progress_interval: float = DEFAULT_PROGRESS_INTERVAL):
+        """
+        Initialize a mining job. It starts running once start() is called.
+
+        Args:
+            blockchain: Blockchain to mine on
+            miner_address: Address receiving the mining reward
+            timeout: Seconds of nonce search before giving up (None for no limit)
+            on_progress: Called on the event loop with each progress event
+            progress_interval: Seconds between progress events
+        """
+        self.blockchain = blockchain
+        self.miner_address = miner_address
+        self.timeout = timeout
+        self.on_progress = on_progress
+        self.progress_interval = progress_interval
+        self.block: Optional[Block] = None
+        self.progress = MiningProgress(0, 0.0)
+        self.task: Optional[asyncio.Task] = None
+        self._stop = threading.Event()
+        self._timed_out = False
+        self._listeners: List[asyncio.Queue] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def start(self) -> "MiningJob":
+        """
+        Start mining on the running event loop.
+
+        Returns:
+            This job
+        """
+        self._loop = asyncio.get_running_loop()
+        self.task = self._loop.create_task(self._run())
+        self.task.add_done_callback(self._finish)
+        return self
+
+    def cancel(self) -> None:
+        """Stop the search after the current batch; awaiting the job raises MiningCancelled."""
+        self._stop.set()
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether the job was cancelled or timed out."""
+        return self._stop.is_set()
+
+    def done(self) -> bool:
+        """Whether the job has finished."""
+        return self.task is not None and self.task.done()
+
+    def __await__(self):
+        """Wait for the committed block (None if there was nothing to mine or the chain moved on)."""
+        return self.task.__await__()
+
+    async def progress_events(self) -> AsyncIterator[MiningProgress]:
+        """
+        Iterate over progress events until the job finishes.
+
+        Yields:
+            MiningProgress snapshots
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        self._listeners.append(queue)
+        try:
+            while not self.done():
+                progress = await queue.get()
+                if progress is None:
+                    break
+                yield progress
+        finally:
+            self._listeners.remove(queue)
+
+    async def _run(self) -> Optional[Block]:
+        """Prepare, search and commit one block."""
+        loop = asyncio.get_running_loop()
+        try:
+            block = await loop.run_in_executor(None, self.blockchain.prepare_block, self.miner_address)
+            if block is None:
+                return None
+            self.block = block
+            nonce = await loop.run_in_executor(None, self._search, block)
+        except asyncio.CancelledError:
+            # Don't leave the search thread running when the awaiting task goes away
+            self._stop.set()
+            raise
+        if nonce is None:
+            if self._timed_out:
+                raise MiningTimeout(f"No proof of work found within {self.timeout}s")
+            raise MiningCancelled("Mining was cancelled")
+
+        block.nonce = nonce
+        block.hash = block.calculate_hash()
+        committed = await loop.run_in_executor(None, self.blockchain.commit_block, block,
+                                               self.miner_address)
+        return block if committed else None
+
+    def _search(self, block: Block) -> Optional[int]:
+        """
+        Search nonces on an executor thread, in ranges of Blockchain.nonce_batch
+        (sized for the chain's mining backend) between stop checks.
+
+        Args:
+            block: Block from Blockchain.prepare_block
+
+        Returns:
+            The winning nonce, or None if the job was stopped
+        """
+        started = last_report = time.perf_counter()
+        start = 0
+        count = self.blockchain.nonce_batch
+        while not self._stop.is_set():
+            nonce = self.blockchain.search_nonce(block, start, count)
+            now = time.perf_counter()
+            tried = start + count if nonce is None else nonce + 1
+            if nonce is None and self.timeout is not None and now - started >= self.timeout:
+                self._timed_out = True
+                self._stop.set()
+            # Report at each interval and once more when the search ends
+            if nonce is not None or self._stop.is_set() or now - last_report >= self.progress_interval:
+                last_report = now
+                try:
+                    self._loop.call_soon_threadsafe(self._publish, MiningProgress(tried, now - started))
+                except RuntimeError:
+                    pass  # The event loop has already closed
+            if nonce is not None:
+                return nonce
+            start += count
+        return None
+
+    def _publish(self, progress: MiningProgress) -> None:
+        """Record a progress event and hand it to the callback and iterators."""
+        self.progress = progress
+        if self.on_progress:
+            self.on_progress(progress)
+        for queue in self._listeners:
+            queue.put_nowait(progress)
+
+    def _finish(self, task: asyncio.Task) -> None:
+        """End every progress iterator once the job is done."""
+        for queue in self._listeners:
+            queue.put_nowait(None)
+
+
+def start_mining(blockchain, miner_address: str, timeout: Optional[float] = None,
+                 on_progress: Optional[Callable[[MiningProgress], None]] = None,
+                 progress_interval: float = DEFAULT_PROGRESS_INTERVAL) -> MiningJob:
+    """
+    Start mining the pending transactions on the running event loop.
+
+    Args:
+        blockchain: Blockchain to mine on
+        miner_address: Address receiving the mining reward
+        timeout: Seconds of nonce search before giving up (None for no limit)
+        on_progress: Called on the event loop with each progress event
+        progress_interval: Seconds between progress events
+
+    Returns:
+        The running MiningJob
+    """
+    return MiningJob(blockchain, miner_address, timeout, on_progress, progress_interval).start()
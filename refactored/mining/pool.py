@@ -0,0 +1,394 @@
+import asyncio
+import hashlib
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, List, Any, Optional, Set, Tuple
+
+from blockchain.block import Block
+from network.protocol import encode_message, read_message, ProtocolError
+
+
+# Nonces handed to a worker per job
+DEFAULT_RANGE_SIZE = 200_000
+# Shares are hashes with this many fewer leading zeros than the block needs
+SHARE_DIFFICULTY_OFFSET = 2
+
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "worker.py")
+
+
+class PoolError(Exception):
+    """Raised when the pool has no workers left to mine with."""
+
+
+class WorkerConnection:
+    """
+    A connected worker and its share accounting.
+    """
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        Initialize a worker connection.
+
+        Args:
+            reader: Stream for incoming messages
+            writer: Stream for outgoing messages
+        """
+        self.reader = reader
+        self.writer = writer
+        self.name = str(writer.get_extra_info("peername"))
+        self.shares = 0
+        self.stale_shares = 0
+        self.invalid_shares = 0
+        self.hashes = 0
+        self.connected_at = time.perf_counter()
+        self.task = asyncio.current_task()
+
+    async def send(self, message: Dict[str, Any]) -> None:
+        """Send a message to the worker."""
+        self.writer.write(encode_message(message))
+        await self.writer.drain()
+
+
+class BlockTemplate:
+    """
+    A prepared block being mined, with the next unassigned nonce.
+    """
+    def __init__(self, job_id: int, block: Block):
+        """
+        Initialize a template.
+
+        Args:
+            job_id: Identifier sent with every job for this block
+            block: Block from Blockchain.prepare_block
+        """
+        self.job_id = job_id
+        self.block = block
+        self.prefix, self.suffix = block.hash_template()
+        self.next_nonce = 0
+        # [start, end) nonce ranges handed to each worker for this template
+        self.ranges: Dict[WorkerConnection, List[Tuple[int, int]]] = {}
+        # Nonces already credited as shares, so a share can't be counted twice
+        self.accepted: Set[int] = set()
+        self.solution: asyncio.Future = asyncio.get_running_loop().create_future()
+
+    def assigned(self, worker: WorkerConnection, nonce: int) -> bool:
+        """Whether a nonce lies in one of the ranges handed to a worker."""
+        return any(start <= nonce < end for start, end in self.ranges.get(worker, ()))
+
+
+class PoolCoordinator:
+    """
+    Distributes proof-of-work for one block at a time over local TCP.
+    The coordinator builds a block template from the pending transactions and
+    hands each worker a range of nonces to try. Workers report every hash that
+    meets the lower share difficulty, which measures their hashrate; the first
+    share that also meets the block difficulty completes the block, which is
+    then committed to the chain. Messages use the node's length-prefixed JSON
+    framing (network/protocol.py).
+    """
+    def __init__(self, blockchain, miner_address: str, host: str = "127.0.0.1", port: int = 0,
+                 share_difficulty: Optional[int] = None, range_size: int = DEFAULT_RANGE_SIZE):
+        """
+        Initialize the coordinator.
+
+        Args:
+            blockchain: Blockchain to mine on
+            miner_address: Address receiving the mining rewards
+            host: Interface to listen on
+            port: Port to listen on (0 picks a free port)
+            share_difficulty: Leading zeros required for a share
+            range_size: Nonces per job
+        """
+        self.blockchain = blockchain
+        self.miner_address = miner_address
+        self.host = host
+        self.port = port
+        if share_difficulty is None:
+            share_difficulty = max(1, blockchain.difficulty - SHARE_DIFFICULTY_OFFSET)
+        self.share_difficulty = share_difficulty
+        self.range_size = range_size
+        self.workers: List[WorkerConnection] = []
+        self.template: Optional[BlockTemplate] = None
+        self.server: Optional[asyncio.AbstractServer] = None
+        self._next_job_id = 0
+        # Found blocks that commit_block refused because the chain moved on
+        self.blocks_rejected = 0
+
+    async def start(self) -> None:
+        """Start accepting workers."""
+        self.server = await asyncio.start_server(self._serve_worker, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        """Tell workers to exit and stop accepting new ones."""
+        workers = list(self.workers)
+        for worker in workers:
+            try:
+                await worker.send({"type": "stop"})
+            except ConnectionError:
+                pass
+            worker.writer.close()
+        # Closed connections end their handlers at the next read
+        await asyncio.gather(*(worker.task for worker in workers), return_exceptions=True)
+        if self.server:
+            self.server.close()
+            await self.server.wait_closed()
+
+    async def mine_block(self) -> Optional[Block]:
+        """
+        Mine the pending transactions with the connected workers.
+
+        Returns:
+            The committed block, or None if there was nothing to mine or the
+            chain moved on before the block was found (counted in blocks_rejected)
+
+        Raises:
+            PoolError: If no worker is connected, or the last one disconnects
+                       before the block is found
+        """
+        if not self.workers:
+            raise PoolError("No workers connected")
+        loop = asyncio.get_running_loop()
+        block = await loop.run_in_executor(None, self.blockchain.prepare_block, self.miner_address)
+        if block is None:
+            return None
+        if not self.workers:
+            raise PoolError("All workers disconnected")
+
+        self._next_job_id += 1
+        self.template = BlockTemplate(self._next_job_id, block)
+        for worker in list(self.workers):
+            await self._assign(worker)
+        try:
+            block = await self.template.solution
+        finally:
+            self.template = None
+            for worker in list(self.workers):
+                await self._send(worker, {"type": "idle"})
+
+        committed = await loop.run_in_executor(
+            None, self.blockchain.commit_block, block, self.miner_address)
+        if not committed:
+            self.blocks_rejected += 1
+            return None
+        return block
+
+    def hashrate(self, worker: Optional[WorkerConnection] = None) -> float:
+        """
+        Estimate hashes per second from accepted shares.
+        Each share stands for 16 ** share_difficulty hashes on average.
+
+        Args:
+            worker: One worker, or None for the whole pool
+
+        Returns:
+            Estimated hashes per second
+        """
+        workers = [worker] if worker else self.workers
+        now = time.perf_counter()
+        return sum(w.shares * 16 ** self.share_difficulty / max(now - w.connected_at, 1e-9)
+                   for w in workers)
+
+    def report(self) -> List[Dict[str, Any]]:
+        """
+        Summarize each worker's contribution.
+
+        Returns:
+            One dictionary per worker with share counts and hashrates
+        """
+        now = time.perf_counter()
+        return [{
+            "worker": worker.name,
+            "shares": worker.shares,
+            "stale": worker.stale_shares,
+            "invalid": worker.invalid_shares,
+            "estimated_hashrate": self.hashrate(worker),
+            "reported_hashrate": worker.hashes / max(now - worker.connected_at, 1e-9),
+        } for worker in self.workers]
+
+    async def _assign(self, worker: WorkerConnection) -> None:
+        """Give a worker the next nonce range of the current template."""
+        template = self.template
+        if template is None:
+            return
+        start = template.next_nonce
+        template.next_nonce += self.range_size
+        template.ranges.setdefault(worker, []).append((start, start + self.range_size))
+        await self._send(worker, {
+            "type": "job",
+            "job_id": template.job_id,
+            "prefix": template.prefix.decode(),
+            "suffix": template.suffix.decode(),
+            "start": start,
+            "end": start + self.range_size,
+            "share_difficulty": self.share_difficulty,
+        })
+
+    async def _send(self, worker: WorkerConnection, message: Dict[str, Any]) -> None:
+        """Send a message, dropping the worker if its connection is gone."""
+        try:
+            await worker.send(message)
+        except ConnectionError:
+            self._remove(worker)
+
+    def _on_share(self, worker: WorkerConnection, message: Dict[str, Any]) -> None:
+        """Check a share and complete the block if it meets the full difficulty."""
+        template = self.template
+        if template is None or message.get("job_id") != template.job_id:
+            worker.stale_shares += 1
+            return
+        nonce = message.get("nonce")
+        # Only nonces from the worker's own ranges count, and each one only once
+        if (not isinstance(nonce, int) or isinstance(nonce, bool) or nonce in template.accepted
+                or not template.assigned(worker, nonce)):
+            worker.invalid_shares += 1
+            return
+        digest = hashlib.sha256(template.prefix + str(nonce).encode() + template.suffix).hexdigest()
+        if not digest.startswith("0" * self.share_difficulty):
+            worker.invalid_shares += 1
+            return
+        template.accepted.add(nonce)
+        worker.shares += 1
+        if digest.startswith("0" * self.blockchain.difficulty) and not template.solution.done():
+            template.block.nonce = nonce
+            template.block.hash = digest
+            template.solution.set_result(template.block)
+
+    def _on_progress(self, worker: WorkerConnection, message: Dict[str, Any]) -> None:
+        """Add a worker's reported hash count, counting a malformed report as an invalid share."""
+        hashes = message.get("hashes", 0)
+        if isinstance(hashes, bool) or not isinstance(hashes, int) or hashes < 0:
+            worker.invalid_shares += 1
+            return
+        worker.hashes += hashes
+
+    async def _serve_worker(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Handle one worker connection until it closes."""
+        worker = WorkerConnection(reader, writer)
+        self.workers.append(worker)
+        try:
+            while True:
+                message = await read_message(reader)
+                if message["type"] == "hello":
+                    worker.name = str(message.get("worker", worker.name))
+                    await self._assign(worker)
+                elif message["type"] == "share":
+                    self._on_share(worker, message)
+                elif message["type"] == "progress":
+                    self._on_progress(worker, message)
+                elif message["type"] == "done":
+                    if self.template and message.get("job_id") == self.template.job_id:
+                        await self._assign(worker)
+        except (asyncio.IncompleteReadError, ConnectionError, ProtocolError):
+            pass
+        finally:
+            self._remove(worker)
+            writer.close()
+
+    def _remove(self, worker: WorkerConnection) -> None:
+        """Forget a disconnected worker, failing the open template if it was the last one."""
+        if worker in self.workers:
+            self.workers.remove(worker)
+        template = self.template
+        if not self.workers and template is not None and not template.solution.done():
+            template.solution.set_exception(PoolError("All workers disconnected"))
+
+
+async def wait_for_workers(coordinator: PoolCoordinator, processes: List[subprocess.Popen],
+                           count: int) -> None:
+    """
+    Wait until local worker processes have connected.
+
+    Args:
+        coordinator: Started coordinator
+        processes: Processes from spawn_workers
+        count: Connected workers to wait for
+
+    Raises:
+        PoolError: If a worker process exits before enough workers are connected
+    """
+    while len(coordinator.workers) < count:
+        for process in processes:
+            if process.poll() is not None:
+                raise PoolError(f"Worker process exited with status {process.returncode} during startup")
+        await asyncio.sleep(0.05)
+
+
+def spawn_workers(host: str, port: int, count: int) -> List[subprocess.Popen]:
+    """
+    Start local worker processes.
+
+    Args:
+        host: Coordinator host
+        port: Coordinator port
+        count: Number of processes
+
+    Returns:
+        The started processes
+    """
+    return [subprocess.Popen([sys.executable, WORKER_SCRIPT, f"{host}:{port}", "--name", f"local{i}"])
+            for i in range(count)]
+
+
+def stop_workers(processes: List[subprocess.Popen], timeout: float = 5) -> None:
+    """
+    Wait for local worker processes to exit after PoolCoordinator.stop(),
+    killing any that don't, such as workers that never connected.
+
+    Args:
+        processes: Processes from spawn_workers
+        timeout: Seconds to wait for each process
+    """
+    for process in processes:
+        try:
+            process.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+
+async def run_pool(blockchain, miner_address: str, host: str, port: int, workers: int,
+                   blocks: int) -> None:
+    """
+    Start a coordinator with local worker processes and mine blocks.
+
+    Args:
+        blockchain: Blockchain to mine on
+        miner_address: Address receiving the mining rewards
+        host: Interface to listen on
+        port: Port to listen on
+        workers: Local worker processes to start (more may connect remotely)
+        blocks: Blocks to mine before exiting
+    """
+    coordinator = PoolCoordinator(blockchain, miner_address, host, port)
+    await coordinator.start()
+    print(f"Pool coordinator listening on {coordinator.host}:{coordinator.port} "
+          f"(share difficulty {coordinator.share_difficulty})")
+    processes = spawn_workers(coordinator.host, coordinator.port, workers)
+    try:
+        await wait_for_workers(coordinator, processes, workers)
+        for _ in range(blocks):
+            started = time.perf_counter()
+            rejected = coordinator.blocks_rejected
+            try:
+                block = await coordinator.mine_block()
+            except PoolError as e:
+                print(f"Mining stopped: {e}.")
+                break
+            if block is None and coordinator.blocks_rejected > rejected:
+                print("Block rejected: the chain changed while it was being mined. "
+                      "Its transactions stay pending.")
+                continue
+            if block is None:
+                print("No transactions available for mining.")
+                break
+            print(f"Block {block.index} mined by the pool in {time.perf_counter() - started:.2f}s "
+                  f"(nonce {block.nonce})")
+            for row in coordinator.report():
+                print(f"  {row['worker']}: {row['shares']} shares, "
+                      f"{row['estimated_hashrate']:,.0f} H/s estimated, "
+                      f"{row['reported_hashrate']:,.0f} H/s reported")
+    finally:
+        await coordinator.stop()
+        stop_workers(processes)
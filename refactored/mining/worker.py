@@ -0,0 +1,144 @@
+#!/usr/bin/env python
+"""
+Mining Pool Worker
+------------------
+Connects to a pool coordinator, hashes the nonce ranges it is given and
+reports shares. Start one per core, on this or any other machine:
+
+    python mining/worker.py 127.0.0.1:3333 --name worker1
+"""
+
+import argparse
+import hashlib
+import os
+import select
+import socket
+import sys
+from typing import Dict, Any, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from network.protocol import HEADER, MAX_MESSAGE_SIZE, ProtocolError, encode_message, decode_message
+
+
+# Nonces hashed between progress reports and checks for a new job
+CHUNK_SIZE = 5000
+
+
+class PoolWorker:
+    """
+    Blocking pool client that hashes one job at a time.
+    A new job from the coordinator replaces the current one straight away,
+    so work on a stale block template stops within one chunk.
+    """
+    def __init__(self, host: str, port: int, name: str):
+        """
+        Initialize a worker.
+
+        Args:
+            host: Coordinator host
+            port: Coordinator port
+            name: Name reported to the coordinator
+        """
+        self.host = host
+        self.port = port
+        self.name = name
+        self.sock: Optional[socket.socket] = None
+        self.job: Optional[Dict[str, Any]] = None
+        self.hashes = 0
+
+    def run(self) -> None:
+        """Work until the coordinator closes the connection or says stop."""
+        self.sock = socket.create_connection((self.host, self.port))
+        try:
+            self.send({"type": "hello", "worker": self.name})
+            while True:
+                if self.job is None:
+                    if not self.handle(self.receive()):
+                        return
+                    continue
+                readable, _, _ = select.select([self.sock], [], [], 0)
+                if readable and not self.handle(self.receive()):
+                    return
+                if self.job is not None:
+                    self.work_chunk()
+        except (ConnectionError, ProtocolError):
+            return
+        finally:
+            self.sock.close()
+
+    def handle(self, message: Dict[str, Any]) -> bool:
+        """
+        Act on a message from the coordinator.
+
+        Args:
+            message: Decoded message
+
+        Returns:
+            False if the worker should exit
+        """
+        if message["type"] == "job":
+            self.job = dict(message,
+                            prefix=message["prefix"].encode(),
+                            suffix=message["suffix"].encode(),
+                            next=message["start"],
+                            share_target="0" * message["share_difficulty"])
+        elif message["type"] == "idle":
+            self.job = None
+        elif message["type"] == "stop":
+            return False
+        return True
+
+    def work_chunk(self) -> None:
+        """Hash the next chunk of the current job's nonce range and report shares."""
+        job = self.job
+        prefix_hash = hashlib.sha256(job["prefix"])
+        suffix = job["suffix"]
+        target = job["share_target"]
+        start = job["next"]
+        end = min(start + CHUNK_SIZE, job["end"])
+        for nonce in range(start, end):
+            digest = prefix_hash.copy()
+            digest.update(str(nonce).encode() + suffix)
+            if digest.hexdigest().startswith(target):
+                self.send({"type": "share", "job_id": job["job_id"], "nonce": nonce})
+        job["next"] = end
+        self.hashes += end - start
+        self.send({"type": "progress", "hashes": end - start})
+        if end >= job["end"]:
+            self.send({"type": "done", "job_id": job["job_id"]})
+            self.job = None
+
+    def send(self, message: Dict[str, Any]) -> None:
+        """Send a message to the coordinator."""
+        self.sock.sendall(encode_message(message))
+
+    def receive(self) -> Dict[str, Any]:
+        """Block until a whole message arrives from the coordinator."""
+        (length,) = HEADER.unpack(self._receive_exactly(HEADER.size))
+        if length > MAX_MESSAGE_SIZE:
+            raise ProtocolError(f"Message of {length} bytes exceeds the size limit")
+        return decode_message(self._receive_exactly(length))
+
+    def _receive_exactly(self, size: int) -> bytes:
+        """Read exactly `size` bytes from the socket."""
+        data = bytearray()
+        while len(data) < size:
+            chunk = self.sock.recv(size - len(data))
+            if not chunk:
+                raise ConnectionError("Coordinator closed the connection")
+            data.extend(chunk)
+        return bytes(data)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Mining pool worker")
+    parser.add_argument("coordinator", help="Coordinator address as host:port")
+    parser.add_argument("--name", default=f"{socket.gethostname()}-{os.getpid()}")
+    args = parser.parse_args()
+    host, _, port = args.coordinator.rpartition(":")
+    PoolWorker(host, int(port), args.name).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+import hashlib
+from typing import Dict, List, Any, Optional, Tuple
+
+from blockchain.block import Block
+from blockchain.transaction import transaction_id
+from network.sync import block_header
+
+
+# Bytes per short transaction id (12 hex characters on the wire)
+SHORT_ID_BYTES = 6
+
+
+def short_id(tx: Dict[str, Any], key: bytes) -> str:
+    """
+    Hash a transaction id down to a short id that is only meaningful for one block.
+    Keying the hash with the block hash means a collision found for one block
+    doesn't carry over to the next.
+
+    Args:
+        tx: Transaction dictionary
+        key: Key derived from the block (see compact_key)
+
+    Returns:
+        Short id as a hex string
+    """
+    return hashlib.blake2b(transaction_id(tx).encode(), digest_size=SHORT_ID_BYTES,
+                           key=key).hexdigest()
+
+
+def compact_key(block_hash: str) -> bytes:
+    """
+    Derive the short-id key of a block.
+
+    Args:
+        block_hash: Hex hash of the block
+
+    Returns:
+        Key bytes for short_id
+    """
+    return bytes.fromhex(block_hash)[:16]
+
+
+def encode_compact_block(block: Block) -> Dict[str, Any]:
+    """
+    Build a compact block message: the header plus short ids of the transactions.
+    Mining rewards are sent in full since no peer can have seen them yet.
+
+    Args:
+        block: Block to announce
+
+    Returns:
+        "cmpct_block" message dictionary
+    """
+    key = compact_key(block.hash)
+    short_ids = []
+    prefilled = []
+    for position, tx in enumerate(block.transactions):
+        if tx.get("type") == "REWARD":
+            prefilled.append([position, tx])
+        else:
+            short_ids.append(short_id(tx, key))
+    return {
+        "type": "cmpct_block",
+        "header": block_header(block),
+        "short_ids": short_ids,
+        "prefilled": prefilled,
+    }
+
+
+def reconstruct_transactions(message: Dict[str, Any],
+                             pool: List[Dict[str, Any]]) -> Tuple[List[Optional[Dict[str, Any]]], List[int]]:
+    """
+    Fill in a compact block's transactions from a pending pool.
+
+    Args:
+        message: Received "cmpct_block" message
+        pool: Transactions the receiver already has
+
+    Returns:
+        (transactions in block order with None where unknown, positions still missing)
+    """
+    key = compact_key(message["header"]["hash"])
+    by_short_id = {short_id(tx, key): tx for tx in pool}
+
+    count = len(message["short_ids"]) + len(message["prefilled"])
+    transactions: List[Optional[Dict[str, Any]]] = [None] * count
+    for position, tx in message["prefilled"]:
+        transactions[position] = tx
+
+    ids = iter(message["short_ids"])
+    missing = []
+    for position in range(count):
+        if transactions[position] is not None:
+            continue
+        tx = by_short_id.get(next(ids))
+        if tx is None:
+            missing.append(position)
+        transactions[position] = tx
+    return transactions, missing
+
+
+def build_block(header: Dict[str, Any], transactions: List[Dict[str, Any]]) -> Block:
+    """
+    Assemble a block from a header and its transactions.
+    The hash is recalculated, so a short-id collision shows up as a hash mismatch.
+
+    Args:
+        header: Header from the compact block
+        transactions: All transactions in block order
+
+    Returns:
+        The rebuilt Block
+    """
+    block = Block(header["index"], header["timestamp"], transactions,
+                  header["previous_hash"], header["nonce"])
+    block.hash = block.calculate_hash()
+    return block
+
+
+class RelayStats:
+    """
+    Byte and timing counters for block relay on one node.
+    """
+    def __init__(self):
+        """Initialize all counters at zero."""
+        self.blocks_sent = 0
+        self.block_bytes_sent = 0
+        self.full_block_bytes = 0
+        self.txn_bytes_sent = 0
+        self.blocks_reconstructed = 0
+        self.transactions_requested = 0
+        self.reconstruct_seconds: List[float] = []
+
+    def __str__(self) -> str:
+        """String representation of the counters."""
+        return (f"{self.blocks_sent} block announcements, {self.block_bytes_sent} bytes "
+                f"(full blocks: {self.full_block_bytes}), {self.txn_bytes_sent} bytes of "
+                f"requested transactions; {self.blocks_reconstructed} blocks rebuilt, "
+                f"{self.transactions_requested} transactions requested")
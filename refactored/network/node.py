@@ -0,0 +1,621 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Callable, Tuple
+
+from blockchain.block import Block
+from blockchain.transaction import is_well_formed
+from mining.job import MiningJob, MiningProgress, MiningCancelled, MiningTimeout, start_mining
+from network.protocol import encode_message, read_message, ProtocolError
+from network.sync import ChainSync, SyncStats, block_header, HEADER_BATCH, DEFAULT_WINDOW
+from network.compact import (RelayStats, encode_compact_block, reconstruct_transactions,
+                             build_block)
+
+
+# Most blocks returned by one get_blocks reply
+MAX_BLOCKS_PER_REPLY = 500
+# Number of recently seen transaction ids and block hashes remembered for gossip dedup
+SEEN_CACHE_SIZE = 100_000
+
+
+class Peer:
+    """
+    One TCP connection to another node.
+    Messages carrying a "reply_to" key complete the request with that id;
+    every other message is handed to the node.
+    """
+    def __init__(self, node: 'Node', reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        Initialize a peer connection.
+
+        Args:
+            node: Local node that handles incoming messages
+            reader: Stream for incoming messages
+            writer: Stream for outgoing messages
+        """
+        self.node = node
+        self.reader = reader
+        self.writer = writer
+        self.address = writer.get_extra_info("peername")
+        self.listen_port: Optional[int] = None
+        self.height = 0
+        self._requests: Dict[int, asyncio.Future] = {}
+        self._next_request_id = 0
+        self._write_lock = asyncio.Lock()
+        self._tasks = set()
+
+    def __str__(self) -> str:
+        """String representation of the peer."""
+        return f"Peer({self.address[0]}:{self.listen_port or self.address[1]})"
+
+    async def send(self, message: Dict[str, Any]) -> None:
+        """
+        Send a message to the peer.
+
+        Args:
+            message: Message dictionary with a "type" key
+        """
+        data = encode_message(message)
+        async with self._write_lock:
+            self.writer.write(data)
+            await self.writer.drain()
+
+    async def request(self, message: Dict[str, Any], timeout: float = 30.0) -> Dict[str, Any]:
+        """
+        Send a message and wait for the peer's reply.
+
+        Args:
+            message: Request message dictionary
+            timeout: Seconds to wait for the reply
+
+        Returns:
+            The reply message
+        """
+        self._next_request_id += 1
+        request_id = self._next_request_id
+        future = asyncio.get_running_loop().create_future()
+        self._requests[request_id] = future
+        try:
+            await self.send(dict(message, id=request_id))
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            self._requests.pop(request_id, None)
+
+    async def reply(self, request: Dict[str, Any], message: Dict[str, Any]) -> None:
+        """
+        Answer a request received from the peer.
+
+        Args:
+            request: The request being answered
+            message: Reply message dictionary
+        """
+        await self.send(dict(message, reply_to=request["id"]))
+
+    async def run(self) -> None:
+        """Read and dispatch messages until the connection closes."""
+        try:
+            while True:
+                message = await read_message(self.reader)
+                if "reply_to" in message:
+                    future = self._requests.get(message["reply_to"])
+                    if future and not future.done():
+                        future.set_result(message)
+                    continue
+                # Handlers may send requests back to this peer, so they can't run
+                # inside the read loop that delivers the replies
+                task = asyncio.ensure_future(self.node.handle_message(self, message))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+        except (asyncio.IncompleteReadError, ConnectionError, ProtocolError):
+            pass
+        finally:
+            for future in self._requests.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("Peer disconnected"))
+            await self.node.remove_peer(self)
+
+    async def close(self) -> None:
+        """Close the connection."""
+        for task in list(self._tasks):
+            task.cancel()
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except (ConnectionError, OSError):
+            pass
+
+
+class Node:
+    """
+    Network node wrapping a Blockchain.
+    Accepts peer connections over TCP, gossips new transactions and mined blocks,
+    and validates and appends blocks received from peers. Blocks are announced
+    as compact blocks (header plus short transaction ids) that peers rebuild
+    from their own pending pools.
+    All blockchain calls run in an executor, one at a time, and mining runs as a
+    cancellable MiningJob, so file I/O and proof of work never block the event loop.
+    """
+    def __init__(self, blockchain, host: str = "127.0.0.1", port: int = 0, auto_sync: bool = True,
+                 compact_blocks: bool = True):
+        """
+        Initialize a node.
+
+        Args:
+            blockchain: Blockchain instance the node serves
+            host: Interface to listen on
+            port: Port to listen on (0 picks a free port)
+            auto_sync: Sync as soon as a peer announces a longer chain
+            compact_blocks: Announce blocks as short transaction ids instead of in full
+        """
+        self.blockchain = blockchain
+        self.host = host
+        self.port = port
+        self.auto_sync = auto_sync
+        self.compact_blocks = compact_blocks
+        self.relay_stats = RelayStats()
+        self.peers: List[Peer] = []
+        self.server: Optional[asyncio.AbstractServer] = None
+        self.block_handlers: List[Callable[[Block], None]] = []
+        self.mining_job: Optional[MiningJob] = None
+        self.blockchain.add_block_listener(self._cancel_stale_mining)
+        self._seen: OrderedDict = OrderedDict()
+        self._chain_lock = asyncio.Lock()
+        self._sync_lock = asyncio.Lock()
+        self._peer_tasks = set()
+
+    async def start(self) -> None:
+        """Start listening for peer connections."""
+        self.server = await asyncio.start_server(self._accept, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        """Stop listening and close every peer connection."""
+        if self.server:
+            self.server.close()
+            await self.server.wait_closed()
+        for peer in list(self.peers):
+            await peer.close()
+
+    async def connect(self, host: str, port: int) -> Peer:
+        """
+        Open a connection to another node.
+
+        Args:
+            host: Peer host
+            port: Peer listening port
+
+        Returns:
+            The connected Peer
+        """
+        reader, writer = await asyncio.open_connection(host, port)
+        peer = self._add_peer(reader, writer)
+        peer.listen_port = port
+        return peer
+
+    async def remove_peer(self, peer: Peer) -> None:
+        """
+        Forget a disconnected peer.
+
+        Args:
+            peer: Peer to remove
+        """
+        if peer in self.peers:
+            self.peers.remove(peer)
+
+    async def broadcast(self, message: Dict[str, Any], exclude: Optional[Peer] = None) -> None:
+        """
+        Send a message to every connected peer.
+
+        Args:
+            message: Message dictionary
+            exclude: Peer to skip, usually the one the message came from
+        """
+        targets = [peer for peer in self.peers if peer is not exclude]
+        await asyncio.gather(*(peer.send(message) for peer in targets), return_exceptions=True)
+
+    async def submit_transaction(self, tx: Dict[str, Any]) -> bool:
+        """
+        Add a locally created transaction to the pending pool and gossip it.
+
+        Args:
+            tx: Transaction dictionary
+
+        Returns:
+            True if the transaction was new
+        """
+        self._mark_seen(tx["id"])
+        added = await self._run_locked(self.blockchain.add_pending_transaction, tx)
+        if added:
+            await self.broadcast({"type": "tx", "tx": tx})
+        return added
+
+    async def mine(self, miner_address: str, timeout: Optional[float] = None,
+                   on_progress: Optional[Callable[[MiningProgress], None]] = None) -> Optional[Block]:
+        """
+        Mine the pending transactions and announce the new block.
+        The node keeps handling peers meanwhile, and the search is abandoned
+        as soon as a peer's block changes the tip. The running job is
+        `mining_job`, which can also be cancelled directly.
+
+        Args:
+            miner_address: Address receiving the mining reward
+            timeout: Seconds to search before giving up (None for no limit)
+            on_progress: Called with each MiningProgress event
+
+        Returns:
+            The mined block, or None if there was nothing to mine or the
+            search was cancelled because the chain moved on
+
+        Raises:
+            MiningTimeout: If no block was found within the timeout
+        """
+        self.mining_job = start_mining(self.blockchain, miner_address, timeout, on_progress)
+        try:
+            block = await self.mining_job
+        except MiningTimeout:
+            raise
+        except MiningCancelled:
+            return None
+        finally:
+            self.mining_job = None
+        if block is None:
+            return None
+        self._mark_seen(block.hash)
+        await self._announce_block(block)
+        return block
+
+    async def sync(self, window: int = DEFAULT_WINDOW) -> SyncStats:
+        """
+        Catch up with the best chain advertised by connected peers using
+        headers-first sync. Only one sync runs at a time.
+
+        Args:
+            window: Number of blocks per body request
+
+        Returns:
+            Statistics of the sync
+        """
+        async with self._sync_lock:
+            stats = await ChainSync(self, window).run()
+        ahead = [peer for peer in self.peers if peer.height > stats.target_height]
+        if ahead and not stats.headers:
+            # The best peer's headers don't extend our tip: it is on another branch
+            peer = max(ahead, key=lambda peer: peer.height)
+            reply = await peer.request({"type": "get_blocks", "start": peer.height - 1,
+                                        "end": peer.height})
+            if reply["blocks"]:
+                block = Block.from_dict(reply["blocks"][0])
+                self._mark_seen(block.hash)
+                await self._attach_from_peer(peer, block)
+        return stats
+
+    async def apply_blocks(self, blocks: List[Block]) -> int:
+        """
+        Append consecutive blocks downloaded from peers.
+
+        Args:
+            blocks: Blocks in height order
+
+        Returns:
+            Number of blocks appended
+        """
+        for block in blocks:
+            self._mark_seen(block.hash)
+        applied = await self._run_locked(self.blockchain.add_blocks, blocks)
+        for block in blocks[:applied]:
+            for handler in self.block_handlers:
+                handler(block)
+        return applied
+
+    async def handle_message(self, peer: Peer, message: Dict[str, Any]) -> None:
+        """
+        Dispatch a message received from a peer to its handler.
+
+        Args:
+            peer: Peer the message came from
+            message: Received message
+        """
+        handler = getattr(self, f"_on_{message['type']}", None)
+        if handler is None:
+            return
+        try:
+            await handler(peer, message)
+        except (ConnectionError, asyncio.TimeoutError):
+            pass
+        except Exception as e:
+            print(f"Error handling {message['type']} from {peer}: {str(e)}")
+
+    async def _on_hello(self, peer: Peer, message: Dict[str, Any]) -> None:
+        """Record a peer's listening port and height, catching up if it is ahead."""
+        peer.listen_port = message.get("port")
+        peer.height = message.get("height", 0)
+        if self.auto_sync and peer.height > len(self.blockchain.chain):
+            await self.sync()
+
+    async def _on_tx(self, peer: Peer, message: Dict[str, Any]) -> None:
+        """Add a gossiped transaction to the pending pool and pass it on."""
+        tx = message.get("tx")
+        # Malformed transactions are dropped before they are remembered or relayed
+        if not is_well_formed(tx) or not self._mark_seen(tx["id"]):
+            return
+        if await self._run_locked(self.blockchain.add_pending_transaction, tx):
+            await self.broadcast(message, exclude=peer)
+
+    async def _on_block(self, peer: Peer, message: Dict[str, Any]) -> None:
+        """Validate and attach a gossiped block, then pass it on if it changed our chain."""
+        block = Block.from_dict(message["block"])
+        if not self._mark_seen(block.hash):
+            return
+        peer.height = max(peer.height, block.index + 1)
+        if block.index > len(self.blockchain.chain):
+            # We are missing blocks in between; sync them first
+            await self.sync()
+        await self._attach_from_peer(peer, block)
+
+    async def _on_cmpct_block(self, peer: Peer, message: Dict[str, Any]) -> None:
+        """Rebuild a compact block from the pending pool, then attach it like a full block."""
+        header = message["header"]
+        if not self._mark_seen(header["hash"]):
+            return
+        peer.height = max(peer.height, header["index"] + 1)
+        if header["index"] > len(self.blockchain.chain):
+            # We are missing blocks in between; sync them first
+            await self.sync()
+        if header["hash"] in self.blockchain.block_tree:
+            return
+
+        started = time.perf_counter()
+        transactions, missing = reconstruct_transactions(message, self.blockchain.pending_transactions)
+        if missing:
+            transactions = await self._request_transactions(peer, header["hash"], transactions, missing)
+        block = build_block(header, transactions)
+        if block.hash != header["hash"]:
+            # A short id matched the wrong transaction; fetch them all
+            everything = list(range(len(transactions)))
+            block = build_block(header, await self._request_transactions(
+                peer, header["hash"], transactions, everything))
+        self.relay_stats.blocks_reconstructed += 1
+        self.relay_stats.reconstruct_seconds.append(time.perf_counter() - started)
+        await self._attach_from_peer(peer, block)
+
+    async def _on_get_block_txn(self, peer: Peer, message: Dict[str, Any]) -> None:
+        """Reply with the requested transactions of a block we announced."""
+        entry = self.blockchain.block_tree.entries.get(message["hash"])
+        transactions = entry.block.transactions if entry else []
+        reply = {
+            "type": "block_txn",
+            "transactions": [transactions[i] for i in message["indexes"] if 0 <= i < len(transactions)]
+        }
+        self.relay_stats.txn_bytes_sent += len(encode_message(reply))
+        await peer.reply(message, reply)
+
+    async def _request_transactions(self, peer: Peer, block_hash: str,
+                                    transactions: List[Optional[Dict[str, Any]]],
+                                    indexes: List[int]) -> List[Dict[str, Any]]:
+        """
+        Fetch some of a compact block's transactions from the peer that announced it.
+
+        Args:
+            peer: Announcing peer
+            block_hash: Hash of the block
+            transactions: Transactions rebuilt so far
+            indexes: Positions to fetch
+
+        Returns:
+            The transactions with the fetched positions filled in
+
+        Raises:
+            ProtocolError: If the peer doesn't return every requested transaction
+        """
+        reply = await peer.request({"type": "get_block_txn", "hash": block_hash, "indexes": indexes})
+        if len(reply["transactions"]) != len(indexes):
+            raise ProtocolError(f"{peer} returned {len(reply['transactions'])} of "
+                                f"{len(indexes)} requested transactions")
+        self.relay_stats.transactions_requested += len(indexes)
+        transactions = list(transactions)
+        for position, tx in zip(indexes, reply["transactions"]):
+            transactions[position] = tx
+        return transactions
+
+    async def _on_get_blocks(self, peer: Peer, message: Dict[str, Any]) -> None:
+        """Reply with the requested range of blocks."""
+        start = max(0, message["start"])
+        end = min(message["end"], start + MAX_BLOCKS_PER_REPLY, len(self.blockchain.chain))
+        await peer.reply(message, {
+            "type": "blocks",
+            "blocks": [block.to_dict() for block in self.blockchain.chain[start:end]]
+        })
+
+    async def _on_get_headers(self, peer: Peer, message: Dict[str, Any]) -> None:
+        """Reply with block headers starting at the requested height."""
+        start = max(0, message["start"])
+        end = start + min(message.get("count", HEADER_BATCH), HEADER_BATCH)
+        await peer.reply(message, {
+            "type": "headers",
+            "headers": [block_header(block) for block in self.blockchain.chain[start:end]]
+        })
+
+    async def _attach_from_peer(self, peer: Peer, block: Block) -> None:
+        """
+        Attach a block from a peer, downloading its branch if the parent is
+        unknown, and pass it on if it changed our chain.
+
+        Args:
+            peer: Peer the block came from
+            block: Block to attach
+        """
+        status = await self._accept_block(block)
+        if status == "orphan":
+            # The block builds on a branch we haven't seen
+            status = await self._fetch_branch(peer, block)
+        if status in ("connected", "reorg"):
+            await self._announce_block(block, exclude=peer)
+
+    async def _accept_block(self, block: Block) -> str:
+        """
+        Attach a block received from the network to the block tree, switching
+        to its branch if that branch now has the most work.
+
+        Args:
+            block: Candidate block
+
+        Returns:
+            Status returned by Blockchain.receive_block
+        """
+        status = await self._run_locked(self.blockchain.receive_block, block)
+        if status in ("connected", "reorg"):
+            for handler in self.block_handlers:
+                handler(block)
+        return status
+
+    async def _fetch_branch(self, peer: Peer, block: Block) -> str:
+        """
+        Download the ancestors of an orphan block from the peer that sent it,
+        walking back one window at a time until the branch joins a known block.
+
+        Args:
+            peer: Peer whose chain the block belongs to
+            block: Block whose parent is unknown
+
+        Returns:
+            "reorg" if the block ended up on our chain, otherwise "side" or "orphan"
+        """
+        end = block.index
+        while block.hash not in self.blockchain.block_tree and end > 1:
+            start = max(1, end - DEFAULT_WINDOW)
+            try:
+                reply = await peer.request({"type": "get_blocks", "start": start, "end": end})
+            except (ConnectionError, asyncio.TimeoutError):
+                break
+            if not reply["blocks"]:
+                break
+            for data in reply["blocks"]:
+                ancestor = Block.from_dict(data)
+                self._mark_seen(ancestor.hash)
+                await self._run_locked(self.blockchain.receive_block, ancestor)
+            end = start
+
+        if block.hash not in self.blockchain.block_tree:
+            return "orphan"
+        chain = self.blockchain.chain
+        if block.index < len(chain) and chain[block.index].hash == block.hash:
+            for handler in self.block_handlers:
+                handler(block)
+            return "reorg"
+        return "side"
+
+    async def _announce_block(self, block: Block, exclude: Optional[Peer] = None) -> None:
+        """
+        Gossip a block to peers.
+
+        Args:
+            block: Block to announce
+            exclude: Peer to skip
+        """
+        full = {"type": "block", "block": block.to_dict()}
+        message = encode_compact_block(block) if self.compact_blocks else full
+        targets = sum(1 for peer in self.peers if peer is not exclude)
+        self.relay_stats.blocks_sent += targets
+        self.relay_stats.block_bytes_sent += targets * len(encode_message(message))
+        self.relay_stats.full_block_bytes += targets * len(encode_message(full))
+        await self.broadcast(message, exclude=exclude)
+
+    async def _run_locked(self, func: Callable, *args) -> Any:
+        """
+        Run a blockchain call in the executor while holding the chain lock.
+
+        Args:
+            func: Blocking function to call
+            *args: Arguments for the function
+
+        Returns:
+            The function's return value
+        """
+        async with self._chain_lock:
+            return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+    def _cancel_stale_mining(self, block: Block) -> None:
+        """
+        Block listener: abandon the running search, whose template no longer
+        builds on the tip. Runs on the thread that appended the block.
+
+        Args:
+            block: Block appended to the chain
+        """
+        job = self.mining_job
+        if job and block is not job.block:
+            job.cancel()
+
+    def _mark_seen(self, key: str) -> bool:
+        """
+        Remember a transaction id or block hash for gossip dedup.
+
+        Args:
+            key: Id or hash
+
+        Returns:
+            True if the key had not been seen before
+        """
+        if key in self._seen:
+            return False
+        self._seen[key] = True
+        if len(self._seen) > SEEN_CACHE_SIZE:
+            self._seen.popitem(last=False)
+        return True
+
+    def _add_peer(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> Peer:
+        """Register a new connection, start its read loop and say hello."""
+        peer = Peer(self, reader, writer)
+        self.peers.append(peer)
+        task = asyncio.ensure_future(self._start_peer(peer))
+        self._peer_tasks.add(task)
+        task.add_done_callback(self._peer_tasks.discard)
+        return peer
+
+    async def _start_peer(self, peer: Peer) -> None:
+        """Send our hello and run the peer's read loop."""
+        await peer.send({"type": "hello", "port": self.port, "height": len(self.blockchain.chain)})
+        await peer.run()
+
+    async def _accept(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Handle an incoming connection."""
+        self._add_peer(reader, writer)
+
+
+def parse_peer(address: str) -> Tuple[str, int]:
+    """
+    Parse a "host:port" peer address.
+
+    Args:
+        address: Peer address string
+
+    Returns:
+        (host, port) tuple
+    """
+    host, _, port = address.rpartition(":")
+    return host or "127.0.0.1", int(port)
+
+
+async def run_node(blockchain, host: str, port: int, peers: List[str]) -> None:
+    """
+    Start a node, connect to the given peers and serve until cancelled.
+
+    Args:
+        blockchain: Blockchain instance to serve
+        host: Interface to listen on
+        port: Port to listen on
+        peers: Peer addresses as "host:port" strings
+    """
+    node = Node(blockchain, host, port)
+    await node.start()
+    print(f"Node listening on {node.host}:{node.port}")
+    for address in peers:
+        try:
+            await node.connect(*parse_peer(address))
+            print(f"Connected to {address}")
+        except OSError as e:
+            print(f"Could not connect to {address}: {str(e)}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await node.stop()
@@ -0,0 +1,72 @@
+import asyncio
+import json
+import struct
+from typing import Dict, Any
+
+
+# Every message is a 4-byte big-endian length followed by that many bytes of UTF-8 JSON
+HEADER = struct.Struct(">I")
+MAX_MESSAGE_SIZE = 32 * 1024 * 1024
+
+
+class ProtocolError(Exception):
+    """Raised when a peer sends a malformed or oversized message."""
+
+
+def encode_message(message: Dict[str, Any]) -> bytes:
+    """
+    Serialize a message into a length-prefixed frame.
+
+    Args:
+        message: JSON-serializable dictionary with a "type" key
+
+    Returns:
+        Framed message bytes
+    """
+    payload = json.dumps(message, separators=(",", ":")).encode()
+    if len(payload) > MAX_MESSAGE_SIZE:
+        raise ProtocolError(f"Message of {len(payload)} bytes exceeds the size limit")
+    return HEADER.pack(len(payload)) + payload
+
+
+async def read_message(reader: asyncio.StreamReader) -> Dict[str, Any]:
+    """
+    Read one length-prefixed message from a stream.
+
+    Args:
+        reader: Stream to read from
+
+    Returns:
+        Decoded message dictionary
+
+    Raises:
+        asyncio.IncompleteReadError: If the connection closes mid-frame
+        ProtocolError: If the frame is oversized or not a JSON object
+    """
+    header = await reader.readexactly(HEADER.size)
+    (length,) = HEADER.unpack(header)
+    if length > MAX_MESSAGE_SIZE:
+        raise ProtocolError(f"Message of {length} bytes exceeds the size limit")
+    return decode_message(await reader.readexactly(length))
+
+
+def decode_message(payload: bytes) -> Dict[str, Any]:
+    """
+    Decode the payload of one frame.
+
+    Args:
+        payload: Frame contents after the length header
+
+    Returns:
+        Decoded message dictionary
+
+    Raises:
+        ProtocolError: If the payload is not a JSON object with a type
+    """
+    try:
+        message = json.loads(payload)
+    except json.JSONDecodeError as e:
+        raise ProtocolError(f"Invalid message payload: {str(e)}")
+    if not isinstance(message, dict) or "type" not in message:
+        raise ProtocolError("Message must be a JSON object with a type")
+    return message
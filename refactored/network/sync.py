@@ -0,0 +1,258 @@
+import asyncio
+import heapq
+import time
+from typing import Dict, List, Any, Optional
+
+from blockchain.block import Block
+
+
+# Headers per get_headers request
+HEADER_BATCH = 2000
+# Blocks per body download window
+DEFAULT_WINDOW = 100
+# Body downloads in flight per peer
+REQUESTS_PER_PEER = 2
+# Downloaded-but-unapplied windows allowed ahead of the chain tip
+MAX_WINDOWS_AHEAD = 16
+
+
+def block_header(block: Block) -> Dict[str, Any]:
+    """
+    Get the header fields of a block, leaving out its transactions.
+
+    Args:
+        block: Block to describe
+
+    Returns:
+        Dictionary with index, timestamp, previous_hash, nonce and hash
+    """
+    return {
+        "index": block.index,
+        "timestamp": block.timestamp,
+        "previous_hash": block.previous_hash,
+        "nonce": block.nonce,
+        "hash": block.hash
+    }
+
+
+def validate_headers(headers: List[Dict[str, Any]], start: int, previous_hash: str,
+                     difficulty: int) -> bool:
+    """
+    Check that headers form a chain extending a known block and carry valid-looking work.
+    A block's hash covers its transactions, so the proof of work can only be
+    claimed here; each body is checked against its header's hash when applied.
+
+    Args:
+        headers: Headers in height order
+        start: Expected height of the first header
+        previous_hash: Hash of the block just below `start`
+        difficulty: Required number of leading zeros
+
+    Returns:
+        True if the headers link up and meet the difficulty
+    """
+    target = "0" * difficulty
+    for offset, header in enumerate(headers):
+        if header["index"] != start + offset or header["previous_hash"] != previous_hash:
+            return False
+        if not header["hash"].startswith(target):
+            return False
+        previous_hash = header["hash"]
+    return True
+
+
+class SyncStats:
+    """
+    Progress and throughput of one chain sync.
+    """
+    def __init__(self, start_height: int):
+        """
+        Initialize sync statistics.
+
+        Args:
+            start_height: Local chain length when the sync started
+        """
+        self.start_height = start_height
+        self.target_height = start_height
+        self.headers = 0
+        self.blocks = 0
+        self.started = time.perf_counter()
+        self.header_seconds = 0.0
+        self.seconds = 0.0
+
+    @property
+    def blocks_per_second(self) -> float:
+        """Blocks applied per second of total sync time."""
+        return self.blocks / self.seconds if self.seconds else 0.0
+
+    def __str__(self) -> str:
+        """String representation of the statistics."""
+        return (f"Synced {self.blocks} blocks ({self.start_height} -> "
+                f"{self.start_height + self.blocks}) in {self.seconds:.2f}s, "
+                f"{self.blocks_per_second:.0f} blocks/sec "
+                f"(headers: {self.headers} in {self.header_seconds:.2f}s)")
+
+
+class ChainSync:
+    """
+    Headers-first chain sync.
+    Fetches and validates the header chain from the best peer, then downloads
+    block bodies from several peers at once in height windows and applies
+    them strictly in order. Every applied window is saved, so an interrupted
+    sync resumes from the local chain's height.
+    """
+    def __init__(self, node, window: int = DEFAULT_WINDOW):
+        """
+        Initialize a sync.
+
+        Args:
+            node: Node whose chain is synced from its peers
+            window: Number of blocks per body request
+        """
+        self.node = node
+        self.blockchain = node.blockchain
+        self.window = window
+
+    async def run(self) -> SyncStats:
+        """
+        Sync the chain up to the best height advertised by the node's peers.
+
+        Returns:
+            Statistics of the sync
+        """
+        stats = SyncStats(len(self.blockchain.chain))
+        peers = [peer for peer in self.node.peers if peer.height > stats.start_height]
+        if not peers:
+            return stats
+
+        headers = await self._fetch_headers(max(peers, key=lambda peer: peer.height), stats)
+        stats.header_seconds = time.perf_counter() - stats.started
+        if headers:
+            stats.target_height = headers[-1]["index"] + 1
+            await self._fetch_bodies(headers, peers, stats)
+        stats.seconds = time.perf_counter() - stats.started
+        return stats
+
+    async def _fetch_headers(self, peer, stats: SyncStats) -> List[Dict[str, Any]]:
+        """
+        Download and validate headers from our tip up to a peer's height.
+
+        Args:
+            peer: Peer to download from
+            stats: Statistics to update
+
+        Returns:
+            Validated headers above our tip, possibly cut short at the first bad batch
+        """
+        start = len(self.blockchain.chain)
+        previous_hash = self.blockchain.chain[-1].hash
+        headers: List[Dict[str, Any]] = []
+        while start < peer.height:
+            reply = await peer.request({"type": "get_headers", "start": start, "count": HEADER_BATCH})
+            batch = reply["headers"]
+            if not batch or not validate_headers(batch, start, previous_hash, self.blockchain.difficulty):
+                break
+            headers.extend(batch)
+            stats.headers += len(batch)
+            start += len(batch)
+            previous_hash = batch[-1]["hash"]
+        return headers
+
+    async def _fetch_bodies(self, headers: List[Dict[str, Any]], peers, stats: SyncStats) -> None:
+        """
+        Download bodies for the validated headers in parallel and apply them in order.
+
+        Args:
+            headers: Validated headers, starting right above our tip
+            peers: Peers to download from
+            stats: Statistics to update
+        """
+        first = headers[0]["index"]
+        end_height = first + len(headers)
+        # Min-heap of window start heights still to download
+        windows = list(range(first, end_height, self.window))
+
+        state = {"next": first, "outstanding": len(windows)}
+        downloaded: Dict[int, List[Block]] = {}
+        changed = asyncio.Condition()
+        failed_peers = set()
+
+        def can_take_window() -> bool:
+            # Bound memory by not running too far ahead of the applied height
+            return bool(windows) and windows[0] < state["next"] + self.window * MAX_WINDOWS_AHEAD
+
+        async def download(peer) -> None:
+            while state["outstanding"] > 0:
+                async with changed:
+                    await changed.wait_for(lambda: can_take_window() or state["outstanding"] == 0)
+                    if state["outstanding"] == 0:
+                        return
+                    start = heapq.heappop(windows)
+                end = min(start + self.window, end_height)
+                try:
+                    blocks = await self._fetch_window(peer, start, end)
+                except (ConnectionError, asyncio.TimeoutError):
+                    blocks = None
+                async with changed:
+                    if blocks is None or not self._matches_headers(blocks, headers, first, start, end):
+                        # Hand the window to another peer and stop using this one
+                        heapq.heappush(windows, start)
+                        failed_peers.add(peer)
+                        changed.notify_all()
+                        return
+                    downloaded[start] = blocks
+                    state["outstanding"] -= 1
+                    changed.notify_all()
+
+        workers = [asyncio.ensure_future(download(peer))
+                   for peer in peers for _ in range(REQUESTS_PER_PEER)]
+        try:
+            while state["next"] < end_height:
+                async with changed:
+                    await changed.wait_for(lambda: state["next"] in downloaded
+                                           or len(failed_peers) == len(peers))
+                    if state["next"] not in downloaded:
+                        return
+                    blocks = downloaded.pop(state["next"])
+                applied = await self.node.apply_blocks(blocks)
+                stats.blocks += applied
+                if applied < len(blocks):
+                    return
+                async with changed:
+                    state["next"] += len(blocks)
+                    changed.notify_all()
+        finally:
+            for worker in workers:
+                worker.cancel()
+
+    async def _fetch_window(self, peer, start: int, end: int) -> Optional[List[Block]]:
+        """
+        Download the bodies of blocks [start, end) from a peer.
+
+        Args:
+            peer: Peer to download from
+            start: First height
+            end: Height after the last block
+
+        Returns:
+            Blocks in height order, or None if the peer returned too few
+        """
+        blocks: List[Block] = []
+        while start + len(blocks) < end:
+            reply = await peer.request({"type": "get_blocks", "start": start + len(blocks), "end": end})
+            if not reply["blocks"]:
+                return None
+            blocks.extend(Block.from_dict(data) for data in reply["blocks"])
+        return blocks
+
+    @staticmethod
+    def _matches_headers(blocks: List[Block], headers: List[Dict[str, Any]],
+                         first: int, start: int, end: int) -> bool:
+        """
+        Check downloaded bodies against the validated headers.
+        Block.from_dict recalculates each hash from the block's contents, so a
+        match proves the body is the one the header chain committed to.
+        """
+        expected = headers[start - first:end - first]
+        return len(blocks) == len(expected) and all(
+            block.hash == header["hash"] for block, header in zip(blocks, expected))
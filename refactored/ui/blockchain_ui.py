@@ -1,9 +1,20 @@
-from typing import Dict, Any
+import asyncio
+from typing import Dict, List, Any, Optional
 from uuid import uuid4
 from tabulate import tabulate
+from blockchain.block import Block
+from mining.auto_miner import AutoMiner
+from mining.job import MiningProgress, MiningCancelled, MiningTimeout, start_mining
+from utils import perf
 from utils.formatting import (
     format_address_with_name, format_amount, format_timestamp, format_hash
 )
+from utils.table import GridTable
+
+# Column widths of the block view's tables: the block info (label, value; a
+# SHA-256 hex digest is 64 characters) and the transactions (From, To, Amount, Time)
+BLOCK_INFO_WIDTHS = (13, 64)
+BLOCK_TX_WIDTHS = (38, 38, 16, 23)
 
 
 class BlockchainUI:
@@ -20,6 +31,7 @@ class BlockchainUI:
         """
         self.data_handler = data_handler
         self.blockchain = blockchain
+        self.auto_miner: Optional[AutoMiner] = None
     
     def mine_transactions(self, current_wallet: Dict[str, Any]) -> bool:
         """
@@ -44,19 +56,128 @@ class BlockchainUI:
             print("Mining cancelled - Returning to main menu")
             return False
         
+        time_limit = input("Time limit in seconds (press Enter for none): ").strip()
         try:
-            processed_count = self.blockchain.mine_pending_transactions(current_wallet['address'])
-            print(f"\nBlock mined successfully! {processed_count} transactions processed.")
-            print(f"Mining reward: {self.blockchain.mining_reward} coins added to your wallet")
-            
-            # Record reward transaction separately since it's handled in blockchain.mine_pending_transactions
-            return True
+            timeout = float(time_limit) if time_limit else None
+        except ValueError:
+            print("Invalid time limit - Returning to main menu")
+            return False
+        
+        print("Mining... press Ctrl+C to cancel")
+        try:
+            block = asyncio.run(self._mine_with_progress(current_wallet['address'], timeout))
+        except KeyboardInterrupt:
+            print("\nMining cancelled. Pending transactions are kept.")
+            return False
+        except MiningTimeout:
+            print(f"\nNo block found within {timeout:g}s. Pending transactions are kept.")
+            return False
+        except MiningCancelled:
+            print("\nMining cancelled. Pending transactions are kept.")
+            return False
         except ValueError as e:
             print(f"\nMining failed: {str(e)}")
             return False
         except Exception as e:
             print(f"\nMining failed: {str(e)}")
             return False
+        
+        if block is None:
+            print("\nMining failed: the chain changed while mining.")
+            return False
+        print(f"\nBlock mined successfully! {len(block.transactions) - 1} transactions processed.")
+        print(f"Mining reward: {self.blockchain.mining_reward} coins added to your wallet")
+        return True
+    
+    async def _mine_with_progress(self, miner_address: str, timeout: Optional[float]) -> Optional[Block]:
+        """
+        Mine one block, printing the hashrate on one updating line.
+        
+        Args:
+            miner_address: Wallet that will receive the mining reward
+            timeout: Seconds to search before giving up (None for no limit)
+            
+        Returns:
+            The mined block, or None if the chain changed while mining
+        """
+        def show(progress: MiningProgress) -> None:
+            print(f"\r  {progress}   ", end="", flush=True)
+        
+        return await start_mining(self.blockchain, miner_address, timeout, on_progress=show)
+    
+    def manage_auto_miner(self, current_wallet: Dict[str, Any]) -> None:
+        """
+        Display UI for starting, stopping and checking the background auto-miner.
+        
+        Args:
+            current_wallet: Wallet that will receive the mining rewards
+        """
+        while True:
+            print("\n=== Auto-Miner ===")
+            if self.auto_miner is not None:
+                status = self.auto_miner.status()
+                print(tabulate([
+                    ["State", status["state"]],
+                    ["Rewards to", status["miner"]],
+                    ["Hashes (current block)", f"{status['hashes']:,}"],
+                    ["Hashrate", f"{status['hashrate']:,.0f} H/s"],
+                    ["Blocks mined", status["blocks_mined"]],
+                    ["Transactions mined", status["transactions_mined"]],
+                    ["Last block", status["last_block"] if status["last_block"] is not None else "-"],
+                    ["Last error", status["error"] or "-"],
+                ], tablefmt="simple_grid"))
+            else:
+                print("The auto-miner has not been started.")
+            print(f"Pending transactions: {len(self.blockchain.pending_transactions)}")
+            
+            running = self.auto_miner is not None and self.auto_miner.running
+            print("\n1. Stop auto-miner" if running else "\n1. Start auto-miner")
+            print("2. Refresh status")
+            print("X - Back")
+            choice = input("\nEnter choice: ").strip().upper()
+            
+            if choice == '1' and running:
+                print("Stopping auto-miner...")
+                self.stop_auto_miner()
+                print("Auto-miner stopped.")
+            elif choice == '1':
+                min_transactions = input("Mine when this many transactions are pending (default 5): ").strip()
+                max_age = input("... or when the oldest has waited this many seconds (default 60): ").strip()
+                try:
+                    self.auto_miner = AutoMiner(
+                        self.blockchain, current_wallet['address'],
+                        min_transactions=int(min_transactions) if min_transactions else 5,
+                        max_age=float(max_age) if max_age else 60.0)
+                except ValueError:
+                    print("Invalid input. Please enter a number.")
+                    continue
+                self.auto_miner.start()
+                print("Auto-miner started. You can keep sending transactions; "
+                      "they will go into the next block.")
+            elif choice == '2':
+                continue
+            elif choice == 'X' or not choice:
+                return
+            else:
+                print("Invalid choice.")
+    
+    def stop_auto_miner(self) -> None:
+        """Stop the background auto-miner if it is running."""
+        if self.auto_miner is not None:
+            self.auto_miner.stop()
+    
+    def auto_miner_summary(self) -> Optional[str]:
+        """
+        One-line auto-miner status for the main menu.
+        
+        Returns:
+            Status line, or None if the auto-miner isn't running
+        """
+        if self.auto_miner is None or not self.auto_miner.running:
+            return None
+        status = self.auto_miner.status()
+        return (f"Auto-miner: {status['state']}, {status['hashrate']:,.0f} H/s, "
+                f"{status['blocks_mined']} blocks mined")
     
     def view_blockchain(self) -> None:
         """
@@ -75,60 +196,97 @@ class BlockchainUI:
         contacts = self.data_handler.load_contacts()
         wallets = self.data_handler.load_wallets()
         
+        self._print_blocks(contacts, wallets)
+
+    @perf.timed()
+    def _print_blocks(self, contacts: List[Dict[str, Any]], wallets: List[Dict[str, Any]]) -> None:
+        """
+        Print every block and its transactions as tables.
+        
+        Args:
+            contacts: Contacts for naming addresses
+            wallets: Wallets for naming addresses
+        """
         for i, block in enumerate(self.blockchain.chain):
             print(f"\n Block #{i}")
             print("=" * 50)
             
             # Basic block info
-            block_info = [
-                ["Index", str(block.index).center(10)],
-                ["Timestamp", format_timestamp(block.timestamp)],
-                ["Previous Hash", format_hash(block.previous_hash)],
-                ["Hash", format_hash(block.hash)],
-                ["Nonce", str(block.nonce).center(10)]
-            ]
-            print(tabulate(block_info, tablefmt="simple_grid"))
+            with GridTable(BLOCK_INFO_WIDTHS) as table:
+                table.add_row(["Index", str(block.index)])
+                table.add_row(["Timestamp", format_timestamp(block.timestamp)])
+                table.add_row(["Previous Hash", format_hash(block.previous_hash)])
+                table.add_row(["Hash", format_hash(block.hash)])
+                table.add_row(["Nonce", str(block.nonce)])
             
             # If it's not the genesis block, show transactions
             if isinstance(block.transactions, list):
                 if block.transactions:
                     print("\nTransactions:")
-                    tx_data = []
-                    
-                    for tx in block.transactions:
-                        # For reward transactions, use "Network Reward" as sender
-                        if isinstance(tx, dict) and tx.get('type') == 'REWARD':
-                            sender = "Network Reward"
-                        else:
-                            sender = format_address_with_name(
-                                tx['sender'] if isinstance(tx, dict) else tx.sender,
+                    with GridTable(BLOCK_TX_WIDTHS, ["left", "left", "right", "left"],
+                                   ['From'.center(36), 'To'.center(36),
+                                    'Amount'.center(14), 'Time'.center(21)]) as table:
+                        for tx in block.transactions:
+                            # For reward transactions, use "Network Reward" as sender
+                            if isinstance(tx, dict) and tx.get('type') == 'REWARD':
+                                sender = "Network Reward"
+                            else:
+                                sender = format_address_with_name(
+                                    tx['sender'] if isinstance(tx, dict) else tx.sender,
+                                    contacts,
+                                    wallets,
+                                    is_sender=True
+                                )
+                            
+                            # Get receiver with name
+                            receiver = format_address_with_name(
+                                tx['receiver'] if isinstance(tx, dict) else tx.receiver,
                                 contacts,
-                                wallets,
-                                is_sender=True
+                                wallets
                             )
-                        
-                        # Get receiver with name
-                        receiver = format_address_with_name(
-                            tx['receiver'] if isinstance(tx, dict) else tx.receiver,
-                            contacts,
-                            wallets
-                        )
-                        
-                        # Get amount and time
-                        amount = tx['amount'] if isinstance(tx, dict) else tx.amount
-                        timestamp = tx['timestamp'] if isinstance(tx, dict) else tx.timestamp
-                        
-                        tx_data.append([
-                            sender,
-                            receiver,
-                            format_amount(amount),
-                            format_timestamp(timestamp)
-                        ])
-                    
-                    print(tabulate(tx_data, 
-                                headers=['From'.center(36), 'To'.center(36), 
-                                        'Amount'.center(14), 'Time'.center(21)],
-                                tablefmt="simple_grid"))
+                            
+                            # Get amount and time
+                            amount = tx['amount'] if isinstance(tx, dict) else tx.amount
+                            timestamp = tx['timestamp'] if isinstance(tx, dict) else tx.timestamp
+                            
+                            # Amounts as tabulate showed them, as numbers in general format
+                            table.add_row([
+                                sender,
+                                receiver,
+                                f"{float(amount):g}",
+                                format_timestamp(timestamp)
+                            ])
                 else:
                     print("No transactions in this block")
             print("\n")
+
+    @perf.timed()
+    def show_transaction(self, tx_id: str) -> bool:
+        """
+        Display a single transaction located through the transaction index.
+        
+        Args:
+            tx_id: Id of the transaction to show
+            
+        Returns:
+            True if the transaction was found, False otherwise
+        """
+        result = self.blockchain.get_transaction(tx_id)
+        if not result:
+            print(f"\nTransaction {tx_id} not found")
+            return False
+        
+        tx, confirmations = result
+        location = self.blockchain.tx_index.locate(tx_id)
+        rows = [
+            ["Id", tx_id],
+            ["From", tx['sender']],
+            ["To", tx['receiver']],
+            ["Amount", format_amount(tx['amount'])],
+            ["Time", format_timestamp(tx['timestamp'])],
+            ["Type", tx.get('type') or "TRANSFER"],
+            ["Block", f"#{location[0]} (position {location[1]})" if location else "Pending"],
+            ["Confirmations", str(confirmations)]
+        ]
+        print(tabulate(rows, tablefmt="simple_grid", disable_numparse=True))
+        return True
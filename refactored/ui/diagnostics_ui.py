@@ -0,0 +1,119 @@
+import contextlib
+import io
+import os
+import shutil
+import tempfile
+from tabulate import tabulate
+from blockchain.blockchain import Blockchain
+from data.data_handler import DataHandler
+from ui.blockchain_ui import BlockchainUI
+from utils.memory import (
+    AllocationTrace, format_bytes, memory_breakdown, rss_bytes, top_sites, traced_peak
+)
+
+
+class DiagnosticsUI:
+    """
+    User interface for memory diagnostics: how much each in-memory structure
+    holds, and which source lines allocate memory while loading, mining and viewing.
+    """
+    def __init__(self, data_handler, blockchain, blockchain_ui):
+        """
+        Initialize the diagnostics UI.
+
+        Args:
+            data_handler: Handler for loading and saving data
+            blockchain: The loaded blockchain instance
+            blockchain_ui: Blockchain UI whose block view is measured
+        """
+        self.data_handler = data_handler
+        self.blockchain = blockchain
+        self.blockchain_ui = blockchain_ui
+
+    def show_memory(self) -> None:
+        """
+        Print the memory held by each blockchain structure, per block and per
+        transaction, and the transient memory of rendering the block view.
+        """
+        rows = memory_breakdown(self.blockchain)
+        print("\n=== Memory Footprint ===")
+        print(tabulate(
+            [[row["structure"], f"{row['count']:,}", format_bytes(row["bytes"]),
+              f"{format_bytes(row['bytes_per_item'])} per {row['unit']}"] for row in rows],
+            headers=["Structure", "Items", "Size", "Average"], tablefmt="simple_grid"))
+        print(f" Total: {format_bytes(sum(row['bytes'] for row in rows))}")
+
+        # The block view builds its rows and table strings and drops them again
+        contacts = self.data_handler.load_contacts()
+        wallets = self.data_handler.load_wallets()
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            peak, _ = traced_peak(lambda: self.blockchain_ui._print_blocks(contacts, wallets))
+        print(f" Block view rendering: {format_bytes(peak)} peak for "
+              f"{format_bytes(len(output.getvalue()))} of table text")
+
+        current, peak_rss = rss_bytes()
+        if current is not None:
+            print(f" Process RSS: {format_bytes(current)}")
+        if peak_rss is not None:
+            print(f" Peak RSS: {format_bytes(peak_rss)}")
+
+    def trace_allocations(self, output_dir: str, top: int = 10) -> None:
+        """
+        Load, mine and view a copy of the data under tracemalloc and print the
+        source lines that allocated the most memory in each step. A snapshot
+        and a text diff per step are written to the output directory.
+
+        Args:
+            output_dir: Directory for the snapshots and diffs
+            top: Number of allocation sites shown per step
+        """
+        with tempfile.TemporaryDirectory() as data_dir:
+            # Mining writes to the data files, so the trace works on a copy
+            self._copy_data(data_dir)
+            trace = AllocationTrace(output_dir)
+            output = io.StringIO()
+            trace.start()
+            try:
+                with contextlib.redirect_stdout(output):
+                    data_handler = DataHandler(data_dir)
+                    blockchain = Blockchain(data_handler, difficulty=self.blockchain.difficulty,
+                                            mining_reward=self.blockchain.mining_reward,
+                                            mining_backend=self.blockchain.mining_backend)
+                self._print_step("load", *trace.step("load", top))
+
+                wallets = data_handler.load_wallets()
+                if wallets:
+                    with contextlib.redirect_stdout(output):
+                        if not blockchain.pending_transactions:
+                            receiver = wallets[1 if len(wallets) > 1 else 0]["address"]
+                            blockchain.create_transaction(wallets[0]["address"], receiver, 0.01)
+                        blockchain.mine_pending_transactions(wallets[0]["address"])
+                    self._print_step("mine", *trace.step("mine", top))
+                else:
+                    print("\n No wallets to mine with, skipping the mine step.")
+
+                contacts = data_handler.load_contacts()
+                with contextlib.redirect_stdout(output):
+                    BlockchainUI(data_handler, blockchain)._print_blocks(contacts, wallets)
+                self._print_step("view", *trace.step("view", top))
+            finally:
+                trace.stop()
+        print(f"\n Snapshots and diffs written to {os.path.abspath(output_dir)}")
+
+    def _copy_data(self, data_dir: str) -> None:
+        """Copy the data files and wallet histories to another directory."""
+        handler = self.data_handler
+        for path in (handler.wallets_file, handler.contacts_file, handler.pending_transactions_file,
+                     handler.completed_transactions_file, handler.blockchain_file,
+                     handler.tx_index_file):
+            if os.path.exists(path):
+                shutil.copy2(path, data_dir)
+        if os.path.isdir(handler.transactions_dir):
+            shutil.copytree(handler.transactions_dir, os.path.join(data_dir, "transactions"))
+
+    def _print_step(self, name: str, stats, peak: int) -> None:
+        """Print the allocation sites of one traced step."""
+        print(f"\n=== {name.capitalize()} (traced peak {format_bytes(peak)}) ===")
+        print(tabulate(top_sites(stats), headers=["Allocation site", "Size", "Blocks"],
+                       tablefmt="simple_grid"))
@@ -0,0 +1,70 @@
+from tabulate import tabulate
+from analytics.queries import (
+    period_stats, top_receivers, top_senders, mining_rewards_per_miner
+)
+from utils import perf
+from utils.formatting import format_timestamp
+
+
+class StatsUI:
+    """
+    User interface for chain-wide statistics computed over the columnar export.
+    """
+    def __init__(self, exporter, blockchain):
+        """
+        Initialize the statistics UI.
+
+        Args:
+            exporter: ColumnarExporter holding the transaction columns
+            blockchain: The blockchain instance the columns are exported from
+        """
+        self.exporter = exporter
+        self.blockchain = blockchain
+
+    @perf.timed()
+    def show_stats(self, period: int = 3600, top: int = 10) -> None:
+        """
+        Print per-period volume, top senders and receivers, and mining rewards.
+
+        Args:
+            period: Length of each reporting period in seconds
+            top: Number of addresses to show in the top lists
+        """
+        self.exporter.sync(self.blockchain.chain)
+        columns = self.exporter.load()
+
+        print("\n=== Chain Statistics ===")
+        print(f" Blocks: {len(self.blockchain.chain)}")
+        print(f" Transactions: {len(columns)}")
+        print(f" Addresses: {len(columns.addresses)}")
+
+        stats = period_stats(columns, period)
+        print(f"\nVolume per {period} seconds:")
+        if len(stats["count"]) == 0:
+            print(" No transactions found")
+        else:
+            rows = [[
+                format_timestamp(start),
+                int(count),
+                f"{volume:.2f}",
+                f"{mean:.2f}",
+                f"{maximum:.2f}"
+            ] for start, count, volume, mean, maximum in zip(
+                stats["period_start"], stats["count"], stats["volume"],
+                stats["mean"], stats["max"]
+            )]
+            print(tabulate(rows, headers=["Period Start", "Count", "Volume", "Mean", "Max"],
+                           tablefmt="simple_grid", disable_numparse=True))
+
+        for title, results in (
+            (f"Top {top} senders:", top_senders(columns, top)),
+            (f"Top {top} receivers:", top_receivers(columns, top)),
+            ("Mining rewards per miner:", mining_rewards_per_miner(columns))
+        ):
+            print(f"\n{title}")
+            if not results:
+                print(" None")
+                continue
+            rows = [[r["address"], f"{r['total']:.2f}", r["count"]] for r in results]
+            print(tabulate(rows, headers=["Address", "Total", "Count"],
+                           tablefmt="simple_grid", disable_numparse=True))
@@ -1,11 +1,15 @@
-from typing import Dict, List, Any, Optional
-from tabulate import tabulate
-from utils.validation import get_valid_input, validate_positive_number
+from typing import Dict, List, Any, Optional, Tuple
+from utils import perf
+from utils.table import GridTable
+from utils.validation import get_valid_input, validate_positive_number, validate_datetime
 from utils.formatting import (
     format_address_with_name, format_amount, format_timestamp, 
-    format_type, pad_to_width
+    format_type, pad_to_width, parse_datetime
 )
 
+# Column widths of the history table: Type, Amount, From, To, Time
+HISTORY_WIDTHS = (16, 16, 52, 52, 23)
+
 
 class TransactionUI:
     """
@@ -18,7 +22,8 @@ class TransactionUI:
         
         Args:
             data_handler: Handler for storing and retrieving transaction data
-            blockchain: The blockchain instance to interact with
+            blockchain: The blockchain instance to interact with (None when only
+                        showing history from the data files)
         """
         self.data_handler = data_handler
         self.blockchain = blockchain
@@ -91,16 +96,19 @@ class TransactionUI:
                     print("Transaction cancelled.")
                     return False
                 
-                # Create the transaction
-                transaction = self.blockchain.create_transaction(sender_address, recipient_address, amount)
-                
-                # Update wallet balances
-                self.data_handler.update_wallet_balance(sender_address, -amount)
-                self.data_handler.update_wallet_balance(recipient_address, amount)
-                
-                # Record transaction for sender and recipient
-                self.data_handler.record_transaction(transaction, sender_address, "sent")
-                self.data_handler.record_transaction(transaction, recipient_address, "received")
+                # Hold the chain lock so a background auto-miner can't update
+                # the wallet files halfway through
+                with self.blockchain.lock.write():
+                    # Create the transaction
+                    transaction = self.blockchain.create_transaction(sender_address, recipient_address, amount)
+                    
+                    # Update wallet balances
+                    self.data_handler.update_wallet_balance(sender_address, -amount)
+                    self.data_handler.update_wallet_balance(recipient_address, amount)
+                    
+                    # Record transaction for sender and recipient
+                    self.data_handler.record_transaction(transaction, sender_address, "sent")
+                    self.data_handler.record_transaction(transaction, recipient_address, "received")
                 
                 print("\nTransaction completed successfully!")
                 return True
@@ -139,9 +147,24 @@ class TransactionUI:
                 print("Invalid input. Please enter a valid number.")
                 return
         
-        # Load wallet's transactions
-        tx_file = self.data_handler.get_transaction_file(wallet_address)
-        transactions = self.data_handler.load_data(tx_file)
+        # Load wallet's transactions, narrowed to a time range if requested
+        time_range = self._prompt_time_range()
+        transactions = self._confirmed_history(wallet_address, *time_range) if time_range else None
+        self.show_history(wallet_address, transactions)
+    
+    def show_history(self, wallet_address: str,
+                     transactions: Optional[List[Dict[str, Any]]] = None) -> None:
+        """
+        Print a wallet's transaction history without prompting. Only the data
+        files are read, so the chain doesn't need to be loaded.
+        
+        Args:
+            wallet_address: Address of the wallet
+            transactions: Transactions to show (None for the wallet's transaction file)
+        """
+        if transactions is None:
+            tx_file = self.data_handler.get_transaction_file(wallet_address)
+            transactions = self.data_handler.load_data(tx_file)
         
         # Find wallet nickname
         wallets = self.data_handler.load_wallets()
@@ -160,8 +183,20 @@ class TransactionUI:
         
         # Load contacts and wallets for display
         contacts = self.data_handler.load_contacts()
+        self._print_history(transactions, contacts, wallets)
+
+    @perf.timed()
+    def _print_history(self, transactions: List[Dict[str, Any]], contacts: List[Dict[str, Any]],
+                       wallets: List[Dict[str, Any]]) -> None:
+        """
+        Print a wallet's transactions as a table.
         
-        # Prepare headers with exact widths
+        Args:
+            transactions: Transactions to show
+            contacts: Contacts for naming addresses
+            wallets: Wallets for naming addresses
+        """
+        # Headers padded to the cell widths, in columns two wider as tabulate made them
         headers = [
             pad_to_width('Type', 14),
             pad_to_width('Amount', 14),
@@ -170,24 +205,62 @@ class TransactionUI:
             pad_to_width('Time', 21)
         ]
         
-        # Ensure all data rows have exact widths
-        tx_data = []
-        for tx in transactions:
-            tx_type = tx.get('type', 'UNKNOWN')
-            tx_type = tx_type.upper() if tx_type else 'UNKNOWN'
-            tx_data.append([
-                format_type(tx_type),
-                format_amount(tx['amount']),
-                format_address_with_name(tx['sender'], contacts, wallets, is_sender=True),
-                format_address_with_name(tx['receiver'], contacts, wallets, is_sender=False),
-                format_timestamp(tx['timestamp'])
-            ])
-        
-        print("\n" + tabulate(tx_data,
-                       headers=headers,
-                       tablefmt="simple_grid",
-                       colalign=("center", "center", "center", "center", "center"),
-                       disable_numparse=True) + "\n")
+        # Rows are written as they are formatted
+        print()
+        with GridTable(HISTORY_WIDTHS, ["center"] * 5, headers) as table:
+            for tx in transactions:
+                tx_type = tx.get('type', 'UNKNOWN')
+                tx_type = tx_type.upper() if tx_type else 'UNKNOWN'
+                table.add_row([
+                    format_type(tx_type),
+                    format_amount(tx['amount']),
+                    format_address_with_name(tx['sender'], contacts, wallets, is_sender=True),
+                    format_address_with_name(tx['receiver'], contacts, wallets, is_sender=False),
+                    format_timestamp(tx['timestamp'])
+                ])
+        print()
+    
+    def _prompt_time_range(self) -> Optional[Tuple[float, float]]:
+        """
+        Ask whether to filter history by date and read the range.
+        
+        Returns:
+            (start, end) Unix timestamps, or None if no filter was requested
+        """
+        use_filter = input("\nFilter by date range? (press Enter to skip): ").strip()
+        if not use_filter:
+            return None
+        
+        error = "Invalid date. Use YYYY-MM-DD or YYYY-MM-DD HH:MM:SS."
+        start = get_valid_input("Start date (YYYY-MM-DD [HH:MM:SS]): ", validate_datetime, error)
+        end = get_valid_input("End date (YYYY-MM-DD [HH:MM:SS]): ", validate_datetime, error)
+        return parse_datetime(start), parse_datetime(end, end_of_day=True)
+    
+    def _confirmed_history(self, wallet_address: str, start_time: float,
+                           end_time: float) -> List[Dict[str, Any]]:
+        """
+        Get a wallet's confirmed transactions in a time range from the chain's
+        time index, labelled from the wallet's point of view.
+        
+        Args:
+            wallet_address: Address of the wallet
+            start_time: Range start as a Unix timestamp
+            end_time: Range end as a Unix timestamp
+            
+        Returns:
+            List of transaction copies with "type" set to sent, received or reward
+        """
+        history = []
+        for tx in self.blockchain.get_transactions_between(start_time, end_time, wallet_address):
+            tx_copy = tx.copy()
+            if tx.get('type') == 'REWARD':
+                tx_copy['type'] = 'reward'
+            elif tx['sender'] == wallet_address:
+                tx_copy['type'] = 'sent'
+            else:
+                tx_copy['type'] = 'received'
+            history.append(tx_copy)
+        return history
     
     def view_contact_transactions(self) -> None:
         """
@@ -130,3 +130,80 @@ class WalletUI:
         print(f"Starting Balance: {new_wallet['balance']}")
         
         return new_wallet
+    
+    def find_wallet(self, query: str) -> Optional[Dict[str, Any]]:
+        """
+        Find a wallet by address or by name, ignoring case.
+        
+        Args:
+            query: Wallet address or nickname
+            
+        Returns:
+            The matching wallet, or None if there is none
+        """
+        wanted = query.strip().lower()
+        for wallet in self.data_handler.load_wallets():
+            if 'nickname' in wallet:
+                name = wallet['nickname']
+            else:
+                # Handle older wallet format
+                name = f"{wallet.get('first_name', '')} {wallet.get('last_name', '')}".strip()
+            if wanted in (wallet['address'].lower(), name.lower()):
+                return wallet
+        return None
+    
+    def show_balance(self, query: str) -> bool:
+        """
+        Print a wallet's balance from the wallet file, without loading the chain.
+        
+        Args:
+            query: Wallet address or nickname
+            
+        Returns:
+            True if the wallet was found, False otherwise
+        """
+        wallet = self.find_wallet(query)
+        if not wallet:
+            print(f"\n Wallet not found: {query}")
+            return False
+        name = wallet.get('nickname') or f"{wallet.get('first_name', '')} {wallet.get('last_name', '')}".strip()
+        print(f"\n{name}")
+        print(f"Address: {wallet['address']}")
+        print(f"Balance: {wallet['balance']}")
+        return True
+    
+    def import_file(self, file_path: str, default_type: str = "wallet", dry_run: bool = False,
+                    show: int = 10) -> bool:
+        """
+        Create wallets and contacts from a CSV or JSONL file and print a summary.
+        
+        Args:
+            file_path: File to import (see data.bulk_import.read_records)
+            default_type: "wallet" or "contact", for records without a type field
+            dry_run: Only check the file, without saving anything
+            show: Number of skipped records to list per reason
+            
+        Returns:
+            True if every record was imported, False otherwise
+        """
+        import csv
+        from data.bulk_import import BulkImporter, read_records
+        
+        try:
+            result = BulkImporter(self.data_handler).import_records(
+                read_records(file_path), default_type, dry_run)
+        except (OSError, ValueError, UnicodeDecodeError, csv.Error) as e:
+            print(f"\n Import failed: {str(e)}")
+            return False
+        
+        print(f"\n{'Would add' if dry_run else 'Added'} {result['wallets']} wallet(s) "
+              f"and {result['contacts']} contact(s) from {file_path}")
+        for key, label in (("duplicates", "Skipped duplicate names"), ("invalid", "Skipped invalid records")):
+            skipped = result[key]
+            if skipped:
+                print(f"\n{label}: {len(skipped)}")
+                for line, detail in skipped[:show]:
+                    print(f" Line {line}: {detail}")
+                if len(skipped) > show:
+                    print(f" ... and {len(skipped) - show} more")
+        return not result["duplicates"] and not result["invalid"]
@@ -12,6 +12,9 @@ def get_string_width(s: str) -> int:
     Returns:
         Display width of the string
     """
+    # ASCII characters are all one column wide
+    if s.isascii():
+        return len(s)
     width = 0
     for c in s:
         # East Asian Width property for wide characters
@@ -127,6 +130,35 @@ def format_timestamp(ts: float, width: int = 21) -> str:
     return pad_to_width(dt.strftime("%Y-%m-%d %H:%M:%S"), width)
 
 
+def parse_datetime(text: str, end_of_day: bool = False) -> float:
+    """
+    Parse a local date or date-time string into a Unix timestamp.
+    Accepts the format produced by format_timestamp or a bare date.
+    
+    Args:
+        text: "YYYY-MM-DD HH:MM:SS", "YYYY-MM-DD HH:MM" or "YYYY-MM-DD"
+        end_of_day: For a bare date, return the last moment of that day
+                    instead of midnight
+        
+    Returns:
+        Unix timestamp
+        
+    Raises:
+        ValueError: If the text matches none of the accepted formats
+    """
+    from datetime import datetime, timedelta
+    text = text.strip()
+    for fmt in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M"):
+        try:
+            return datetime.strptime(text, fmt).timestamp()
+        except ValueError:
+            pass
+    day = datetime.strptime(text, "%Y-%m-%d")
+    if end_of_day:
+        day += timedelta(days=1, microseconds=-1)
+    return day.timestamp()
+
+
 def format_type(tx_type: str, width: int = 12) -> str:
     """
     Format transaction type, centered.
@@ -0,0 +1,251 @@
+import gc
+import linecache
+import os
+import sys
+import tracemalloc
+import types
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+# Objects deep_sizeof never descends into: code and type objects are shared
+# by everything and would swamp the numbers
+_OPAQUE_TYPES = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType,
+                 types.MethodType, types.CodeType, types.FrameType)
+
+
+def deep_sizeof(obj: Any, seen: Optional[Set[int]] = None) -> int:
+    """
+    Approximate the memory held by an object and everything it references.
+    Each object is counted once per `seen` set, so passing the same set to
+    several calls attributes shared objects to the first structure that reaches them.
+
+    Args:
+        obj: Object to measure
+        seen: Ids of objects already counted (updated in place)
+
+    Returns:
+        Size in bytes, as reported by sys.getsizeof for every reachable object
+    """
+    if seen is None:
+        seen = set()
+    total = 0
+    stack = [obj]
+    while stack:
+        current = stack.pop()
+        if id(current) in seen or isinstance(current, _OPAQUE_TYPES):
+            continue
+        seen.add(id(current))
+        total += sys.getsizeof(current)
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            stack.extend(current)
+        elif isinstance(current, (str, bytes, bytearray, int, float, bool)) or current is None:
+            continue
+        else:
+            if hasattr(current, "__dict__"):
+                stack.append(current.__dict__)
+            for name in getattr(type(current), "__slots__", ()):
+                if hasattr(current, name):
+                    stack.append(getattr(current, name))
+    return total
+
+
+def rss_bytes() -> Tuple[Optional[int], Optional[int]]:
+    """
+    Resident set size of this process.
+
+    Returns:
+        (current RSS, peak RSS) in bytes; either is None where unavailable
+    """
+    current = peak = None
+    try:
+        with open("/proc/self/statm") as f:
+            current = int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports kilobytes, macOS bytes
+        if sys.platform != "darwin":
+            peak *= 1024
+        # The two are sampled differently; the peak can't be below the current size
+        if current is not None:
+            peak = max(peak, current)
+    return current, peak
+
+
+def memory_breakdown(blockchain) -> List[Dict[str, Any]]:
+    """
+    Break the memory held by a Blockchain down by structure.
+    Structures are measured in the order below and share one `seen` set, so
+    e.g. the block tree is only charged for what the chain doesn't already hold.
+
+    Args:
+        blockchain: Loaded Blockchain
+
+    Returns:
+        List of dictionaries with structure, count, unit, bytes and bytes_per_item
+    """
+    # Back-references to the chain and the data handler are not part of any structure
+    seen = {id(blockchain), id(blockchain.data_handler), id(blockchain.lock)}
+    transactions = [tx for block in blockchain.chain if isinstance(block.transactions, list)
+                    for tx in block.transactions]
+    measured = [
+        ("Block transactions", deep_sizeof([block.transactions for block in blockchain.chain], seen),
+         len(transactions), "transaction"),
+        ("Block Bloom filters", deep_sizeof([block.bloom for block in blockchain.chain], seen),
+         len(blockchain.chain), "block"),
+        ("Block objects", deep_sizeof(blockchain.chain, seen), len(blockchain.chain), "block"),
+        ("Pending transactions", deep_sizeof(blockchain.pending_transactions, seen),
+         len(blockchain.pending_transactions), "transaction"),
+        ("Block tree", deep_sizeof(blockchain.block_tree, seen), len(blockchain.chain), "block"),
+        ("Time index", deep_sizeof(blockchain.time_index, seen), len(blockchain.chain), "block"),
+        ("Transaction index", deep_sizeof(blockchain.tx_index, seen), len(blockchain.tx_index.locations),
+         "transaction"),
+    ]
+    return [{
+        "structure": structure,
+        "count": count,
+        "unit": unit,
+        "bytes": size,
+        "bytes_per_item": size / count if count else 0.0
+    } for structure, size, count, unit in measured]
+
+
+def traced_peak(func: Callable[[], Any]) -> Tuple[int, Any]:
+    """
+    Run a function under tracemalloc and measure the most memory it held at once,
+    e.g. the formatted rows and table text of a view.
+
+    Args:
+        func: Function to run
+
+    Returns:
+        (peak bytes allocated above the level at the start, function result)
+    """
+    started_here = not tracemalloc.is_tracing()
+    if started_here:
+        tracemalloc.start()
+    try:
+        if hasattr(tracemalloc, "reset_peak"):  # Python 3.9+
+            tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        result = func()
+        return tracemalloc.get_traced_memory()[1] - baseline, result
+    finally:
+        if started_here:
+            tracemalloc.stop()
+
+
+class AllocationTrace:
+    """
+    Records tracemalloc snapshots between named steps (such as load, mine and
+    view) and reports which source lines allocated the memory each step kept.
+    """
+    def __init__(self, output_dir: Optional[str] = None, frames: int = 10):
+        """
+        Initialize a trace. Tracing starts with start().
+
+        Args:
+            output_dir: Directory for the snapshot dumps and text diffs (None to keep nothing)
+            frames: Stack frames stored per allocation
+        """
+        self.output_dir = output_dir
+        self.frames = frames
+        self.snapshot: Optional[tracemalloc.Snapshot] = None
+        self.steps: List[str] = []  # Names of the snapshots taken, numbering the files
+
+    def start(self) -> None:
+        """Start tracing and take the baseline snapshot."""
+        if self.output_dir:
+            os.makedirs(self.output_dir, exist_ok=True)
+        tracemalloc.start(self.frames)
+        self.snapshot = self._take("baseline")
+        self.steps.append("baseline")
+
+    def stop(self) -> None:
+        """Stop tracing."""
+        tracemalloc.stop()
+
+    def step(self, name: str, top: int = 10) -> Tuple[List[tracemalloc.StatisticDiff], int]:
+        """
+        Snapshot after a step and compare it with the previous snapshot.
+
+        Args:
+            name: Step name, used in the file names
+            top: Number of allocation sites to return
+
+        Returns:
+            (largest allocation-site differences, peak traced bytes during the step)
+        """
+        peak = tracemalloc.get_traced_memory()[1]
+        snapshot = self._take(name)
+        diff = snapshot.compare_to(self.snapshot, "lineno")
+        if self.output_dir:
+            # Allocation lines first, then the call stacks that led to the largest ones
+            with open(os.path.join(self.output_dir, f"{len(self.steps):02d}-{name}.diff.txt"), "w") as f:
+                f.write(f"# {name}: allocation sites by size change\n")
+                f.writelines(f"{stat}\n" for stat in diff)
+                f.write(f"\n# {name}: largest call stacks by size change\n")
+                for stat in snapshot.compare_to(self.snapshot, "traceback")[:top]:
+                    f.write(f"\n{stat}\n")
+                    f.writelines(f"    {line}\n" for line in stat.traceback.format())
+        self.snapshot = snapshot
+        self.steps.append(name)
+        if hasattr(tracemalloc, "reset_peak"):  # Python 3.9+
+            tracemalloc.reset_peak()
+        return diff[:top], peak
+
+    def _take(self, name: str) -> tracemalloc.Snapshot:
+        """Take a snapshot without the tracing machinery's own allocations, dumping it if requested."""
+        gc.collect()
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            # Source lines cached when the diffs' stacks are formatted
+            tracemalloc.Filter(False, linecache.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        ))
+        if self.output_dir:
+            snapshot.dump(os.path.join(self.output_dir, f"{len(self.steps):02d}-{name}.snapshot"))
+        return snapshot
+
+
+def format_bytes(size: float) -> str:
+    """Format a byte count with a binary unit, e.g. 1.5 MiB."""
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if abs(size) < 1024 or unit == "GiB":
+            return f"{size:,.0f} {unit}" if unit == "B" else f"{size:,.1f} {unit}"
+        size /= 1024
+    return f"{size:,.1f} GiB"
+
+
+def _short_path(filename: str) -> str:
+    """Path relative to the import root it was loaded from, e.g. json/decoder.py."""
+    roots = [os.path.abspath(path) for path in sys.path if path]
+    root = max((root for root in roots if filename.startswith(root + os.sep)), key=len, default=None)
+    return os.path.relpath(filename, root) if root else filename
+
+
+def top_sites(stats: Iterable[tracemalloc.StatisticDiff]) -> List[List[str]]:
+    """
+    Table rows for allocation-site differences.
+
+    Returns:
+        Rows of [file:line, size change, block count change]
+    """
+    rows = []
+    for stat in stats:
+        frame = stat.traceback[0]
+        filename = _short_path(frame.filename)
+        rows.append([f"{filename}:{frame.lineno}",
+                     ("+" if stat.size_diff >= 0 else "-") + format_bytes(abs(stat.size_diff)),
+                     f"{stat.count_diff:+,}"])
+    return rows
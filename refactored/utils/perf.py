@@ -0,0 +1,198 @@
+import collections
+import functools
+import threading
+import time
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+
+# Whether timings are recorded. While False, timed functions only pay for
+# one global lookup and a branch, and timer blocks for one attribute check.
+enabled = False
+
+# Latencies kept per name for the percentiles (the most recent calls)
+SAMPLE_LIMIT = 10_000
+
+
+class _Stat:
+    """
+    Timings recorded under one name.
+    """
+    def __init__(self):
+        """Initialize empty timings."""
+        self.count = 0
+        self.total = 0.0
+        self.samples: Deque[float] = collections.deque(maxlen=SAMPLE_LIMIT)
+        self.bytes_read = 0
+        self.bytes_written = 0
+
+
+_stats: Dict[str, _Stat] = {}
+_stats_lock = threading.Lock()
+# Per-thread stack of the timers that are running, for add_bytes()
+_local = threading.local()
+
+
+def enable() -> None:
+    """Start recording timings."""
+    global enabled
+    enabled = True
+
+
+def disable() -> None:
+    """Stop recording timings. What was recorded so far is kept."""
+    global enabled
+    enabled = False
+
+
+def reset() -> None:
+    """Discard everything recorded so far."""
+    with _stats_lock:
+        _stats.clear()
+
+
+class Timer:
+    """
+    Context manager timing a block of code under a name.
+    Does nothing unless recording is enabled when the block starts.
+    """
+    __slots__ = ("name", "_stat", "_started")
+
+    def __init__(self, name: str):
+        """
+        Initialize a timer.
+
+        Args:
+            name: Name the timing is recorded under
+        """
+        self.name = name
+        self._stat: Optional[_Stat] = None
+
+    def __enter__(self) -> "Timer":
+        """Start timing if recording is enabled."""
+        if enabled:
+            with _stats_lock:
+                self._stat = _stats.get(self.name)
+                if self._stat is None:
+                    self._stat = _stats[self.name] = _Stat()
+            stack = getattr(_local, "stack", None)
+            if stack is None:
+                stack = _local.stack = []
+            stack.append(self._stat)
+            self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Record the elapsed time."""
+        if self._stat is None:
+            return
+        elapsed = time.perf_counter() - self._started
+        _local.stack.pop()
+        with _stats_lock:
+            self._stat.count += 1
+            self._stat.total += elapsed
+            self._stat.samples.append(elapsed)
+        self._stat = None
+
+
+def timed(name: Optional[str] = None) -> Callable:
+    """
+    Decorator recording the calls of a function while recording is enabled.
+
+    Args:
+        name: Name the timings are recorded under (defaults to the qualified
+              function name, e.g. "DataHandler.load_data")
+
+    Returns:
+        The decorator
+    """
+    def decorator(func: Callable) -> Callable:
+        label = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not enabled:
+                return func(*args, **kwargs)
+            with Timer(label):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def add_bytes(read: int = 0, written: int = 0) -> None:
+    """
+    Count bytes read or written against the innermost running timer of the
+    current thread. Callers should check `enabled` first if measuring the
+    size costs anything.
+
+    Args:
+        read: Bytes read
+        written: Bytes written
+    """
+    stack = getattr(_local, "stack", None)
+    if not enabled or not stack:
+        return
+    with _stats_lock:
+        stack[-1].bytes_read += read
+        stack[-1].bytes_written += written
+
+
+def _percentile(ordered: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of sorted values."""
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def report() -> List[Dict[str, Any]]:
+    """
+    Summarize the recorded timings, slowest total first.
+    Times of nested timers are also included in the timers around them.
+
+    Returns:
+        List of dictionaries with name, calls, total, mean, p50, p99 (seconds),
+        bytes_read and bytes_written
+    """
+    with _stats_lock:
+        stats = [(name, stat.count, stat.total, sorted(stat.samples),
+                  stat.bytes_read, stat.bytes_written) for name, stat in _stats.items()]
+    rows = []
+    for name, count, total, ordered, bytes_read, bytes_written in stats:
+        if not count:
+            continue
+        rows.append({
+            "name": name,
+            "calls": count,
+            "total": total,
+            "mean": total / count,
+            "p50": _percentile(ordered, 0.50),
+            "p99": _percentile(ordered, 0.99),
+            "bytes_read": bytes_read,
+            "bytes_written": bytes_written
+        })
+    rows.sort(key=lambda row: row["total"], reverse=True)
+    return rows
+
+
+def format_report() -> str:
+    """
+    Format the recorded timings as a table.
+
+    Returns:
+        The table, or a note that nothing was recorded
+    """
+    # Imported here so instrumented modules don't pay for it at startup
+    from tabulate import tabulate
+
+    rows = report()
+    if not rows:
+        return "No timings recorded."
+    return tabulate([[
+        row["name"],
+        f"{row['calls']:,}",
+        f"{row['total']:.3f}",
+        f"{row['mean'] * 1000:.3f}",
+        f"{row['p50'] * 1000:.3f}",
+        f"{row['p99'] * 1000:.3f}",
+        f"{row['bytes_read']:,}" if row["bytes_read"] else "",
+        f"{row['bytes_written']:,}" if row["bytes_written"] else ""
+    ] for row in rows], headers=["Name", "Calls", "Total (s)", "Mean (ms)", "p50 (ms)",
+                                  "p99 (ms)", "Bytes Read", "Bytes Written"],
+        tablefmt="simple_grid", disable_numparse=True)
@@ -0,0 +1,180 @@
+import cProfile
+import heapq
+import json
+import os
+import pstats
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+
+# pstats function key: (file name, line number, function name)
+FunctionKey = Tuple[str, int, str]
+
+# Most frames collapsed_stacks() expands per profile
+MAX_FRAMES = 20_000
+
+
+def frame_name(func: FunctionKey) -> str:
+    """
+    Name of a function in a collapsed stack, e.g. "load_data (data_handler.py:61)".
+    Built-in functions keep pstats' own name, e.g. "<built-in method builtins.input>".
+    """
+    filename, line, name = func
+    if filename == "~":
+        return name.replace(";", ",")
+    return f"{name} ({os.path.basename(filename)}:{line})".replace(";", ",")
+
+
+def collapsed_stacks(stats: pstats.Stats) -> Dict[str, int]:
+    """
+    Reconstruct collapsed stacks ("outer;inner;leaf" -> microseconds of own time)
+    from a profile. cProfile only records caller/callee pairs, so a function's
+    time is split between the stacks that reach it in proportion to the time
+    each caller spent in it; recursion is cut at the first repeat.
+
+    A call graph with many paths through it (e.g. a decorator wrapper shared
+    by many functions) has exponentially many stacks, so the walk is bounded:
+    heavier stacks are expanded first, callees that would get less than a
+    microsecond are charged to their caller, and after MAX_FRAMES frames the
+    remaining stacks are charged to their deepest expanded frame. The stacks
+    add up to the profile's total time, to the microsecond.
+
+    Args:
+        stats: Profile statistics
+
+    Returns:
+        Dictionary of stack to own time in microseconds, without empty stacks
+    """
+    callees: Dict[FunctionKey, Dict[FunctionKey, float]] = {}
+    # Stacks start at functions whose time isn't all accounted for by their callers,
+    # such as the profiled function itself (a shared decorator wrapper can be both).
+    # Entries: (-time spent in the function along this path, tie-breaker, function,
+    # names of the path, functions on the path)
+    pending: List[Tuple[float, int, FunctionKey, List[str], frozenset]] = []
+    for func, (_, _, _, cumulative, callers) in stats.stats.items():
+        for caller, (_, _, _, edge_time) in callers.items():
+            callees.setdefault(caller, {})[func] = edge_time
+        outside = cumulative - sum(edge[3] for edge in callers.values())
+        if not callers or outside > 1e-6:
+            pending.append((-(cumulative if not callers else outside), len(pending), func, [], frozenset()))
+    heapq.heapify(pending)
+    pushed = len(pending)
+
+    # Seconds per stack, rounded to microseconds once all paths are added up
+    seconds: Dict[str, float] = {}
+    frames = 0
+    while pending:
+        spent, _, func, path, on_path = heapq.heappop(pending)
+        spent = -spent
+        _, _, own, cumulative, _ = stats.stats[func]
+        share = spent / cumulative if cumulative else 0.0
+        path = path + [frame_name(func)]
+        frames += 1
+        charged = own * share
+        if frames >= MAX_FRAMES:
+            # Out of budget: this frame keeps the time of everything below it
+            charged = spent
+        else:
+            on_path = on_path | {func}
+            for callee, edge_time in callees.get(func, {}).items():
+                if callee in on_path:
+                    continue
+                callee_time = edge_time * share
+                if callee_time < 1e-6:
+                    charged += callee_time
+                    continue
+                heapq.heappush(pending, (-callee_time, pushed, callee, path, on_path))
+                pushed += 1
+        key = ";".join(path)
+        seconds[key] = seconds.get(key, 0.0) + charged
+    # Round down, then hand the microseconds lost to rounding to the stacks
+    # that lost the most, so the stacks add up to the profile's total
+    stacks = {key: int(spent * 1_000_000) for key, spent in seconds.items()}
+    lost = round(sum(seconds.values()) * 1_000_000) - sum(stacks.values())
+    if lost > 0:
+        for key in heapq.nlargest(lost, seconds, key=lambda key: seconds[key] * 1_000_000 - stacks[key]):
+            stacks[key] += 1
+    return {key: micros for key, micros in stacks.items() if micros}
+
+
+class ActionProfiler:
+    """
+    Runs application actions under cProfile and writes, per action, a .pstats
+    file, collapsed stacks for flamegraph tools and a .json file with the chain
+    height and data sizes the profile was taken at.
+    """
+    def __init__(self, output_dir: str, data_handler, blockchain):
+        """
+        Initialize the profiler.
+
+        Args:
+            output_dir: Directory the profiles are written to (created if needed)
+            data_handler: Handler whose data file sizes are recorded
+            blockchain: Blockchain whose height and pending pool are recorded
+                        (None until it has been loaded)
+        """
+        self.output_dir = output_dir
+        self.data_handler = data_handler
+        self.blockchain = blockchain
+        self.session = time.strftime("%Y%m%d-%H%M%S")
+        self.count = 0
+        os.makedirs(output_dir, exist_ok=True)
+
+    def run(self, action: str, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Call a function under the profiler and write its profile, also when it raises.
+
+        Args:
+            action: Action name used in the file names, e.g. "send"
+            func: Function to call
+            args: Positional arguments for the function
+            kwargs: Keyword arguments for the function
+
+        Returns:
+            The function's result
+        """
+        tags = self.tags()
+        profile = cProfile.Profile()
+        started = time.time()
+        try:
+            return profile.runcall(func, *args, **kwargs)
+        finally:
+            tags.update(action=action, started=started, seconds=time.time() - started)
+            self._write(action, profile, tags)
+
+    def tags(self) -> Dict[str, Any]:
+        """
+        Describe the data an action starts on.
+
+        Returns:
+            Dictionary with the chain height, pending pool size (both None while the
+            blockchain isn't loaded) and data file sizes in bytes
+        """
+        handler = self.data_handler
+        sizes = {}
+        for path in (handler.blockchain_file, handler.pending_transactions_file,
+                     handler.completed_transactions_file, handler.wallets_file,
+                     handler.contacts_file, handler.tx_index_file):
+            try:
+                sizes[os.path.basename(path)] = os.path.getsize(path)
+            except OSError:
+                sizes[os.path.basename(path)] = 0
+        loaded = self.blockchain is not None
+        return {
+            "height": len(self.blockchain.chain) - 1 if loaded else None,
+            "pending_transactions": len(self.blockchain.pending_transactions) if loaded else None,
+            "file_sizes": sizes
+        }
+
+    def _write(self, action: str, profile: cProfile.Profile, tags: Dict[str, Any]) -> None:
+        """Write the profile files of one action and say where they are."""
+        self.count += 1
+        height = f"-h{tags['height']}" if tags["height"] is not None else ""
+        base = os.path.join(self.output_dir, f"{self.session}-{self.count:03d}-{action}{height}")
+        profile.dump_stats(base + ".pstats")
+        stacks = collapsed_stacks(pstats.Stats(profile))
+        with open(base + ".collapsed", "w") as f:
+            f.writelines(f"{stack} {micros}\n" for stack, micros in sorted(stacks.items()))
+        with open(base + ".json", "w") as f:
+            json.dump(tags, f, indent=2)
+        print(f"\n Profile written to {base}.pstats")
@@ -0,0 +1,137 @@
+import builtins
+import contextlib
+import importlib.util
+import sys
+import time
+from typing import Dict, Iterator, List, Optional
+
+# Whether startup phases and imports are recorded (see enable())
+enabled = False
+
+_started = time.perf_counter()
+_phases: List[List] = []
+_current_phase: Optional[str] = None
+# (module, self seconds, cumulative seconds, nesting depth, phase), in completion order
+_imports: List[tuple] = []
+# Time spent in nested imports, one entry per import in progress
+_nested: List[float] = []
+_original_import = builtins.__import__
+
+
+def _timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+    """builtins.__import__ that records how long modules took to import the first time."""
+    try:
+        module_name = importlib.util.resolve_name("." * level + name, (globals or {}).get("__package__")) \
+            if level else name
+    except (ImportError, ValueError):
+        module_name = name
+    if module_name in sys.modules:
+        return _original_import(name, globals, locals, fromlist, level)
+    _nested.append(0.0)
+    started = time.perf_counter()
+    try:
+        return _original_import(name, globals, locals, fromlist, level)
+    finally:
+        cumulative = time.perf_counter() - started
+        nested = _nested.pop()
+        if _nested:
+            _nested[-1] += cumulative
+        _imports.append((module_name, cumulative - nested, cumulative, len(_nested), _current_phase))
+
+
+def enable() -> None:
+    """
+    Start recording imports and phases, like python -X importtime but for
+    the imports that happen after this point, including deferred ones.
+    """
+    global enabled
+    enabled = True
+    builtins.__import__ = _timed_import
+
+
+def disable() -> None:
+    """Stop recording. What was recorded so far is kept."""
+    global enabled
+    enabled = False
+    builtins.__import__ = _original_import
+
+
+@contextlib.contextmanager
+def phase(name: str) -> Iterator[None]:
+    """
+    Time a startup phase, such as loading the chain. Does nothing unless recording is enabled.
+
+    Args:
+        name: Phase name
+    """
+    global _current_phase
+    if not enabled:
+        yield
+        return
+    outer = _current_phase
+    _current_phase = name
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        _phases.append([name, time.perf_counter() - started, started - _started])
+        _current_phase = outer
+
+
+def report(top: int = 20) -> Dict[str, list]:
+    """
+    Summarize what was recorded.
+
+    Args:
+        top: Number of imports to include, slowest first by cumulative time
+
+    Returns:
+        Dictionary with "phases" ([name, seconds, seconds after process start]) and
+        "imports" ([module, self seconds, cumulative seconds, phase]) for top-level imports
+    """
+    outermost = [entry for entry in _imports if entry[3] == 0]
+    slowest = sorted(outermost, key=lambda entry: entry[2], reverse=True)[:top]
+    return {
+        "phases": list(_phases),
+        "imports": [[module, own, cumulative, phase_name]
+                    for module, own, cumulative, _, phase_name in slowest]
+    }
+
+
+def format_importtime() -> str:
+    """
+    Every recorded import in python -X importtime's format, in completion order.
+
+    Returns:
+        Lines of "import time: self [us] | cumulative | imported package"
+    """
+    lines = ["import time: self [us] | cumulative | imported package"]
+    for module, own, cumulative, depth, _ in _imports:
+        lines.append(f"import time: {own * 1e6:>9.0f} | {cumulative * 1e6:>10.0f} | {'  ' * depth}{module}")
+    return "\n".join(lines)
+
+
+def format_report(top: int = 20) -> str:
+    """
+    Render the phases and the slowest top-level imports as tables.
+
+    Args:
+        top: Number of imports to show
+
+    Returns:
+        The tables, or a note that nothing was recorded
+    """
+    from tabulate import tabulate
+
+    summary = report(top)
+    if not summary["phases"] and not summary["imports"]:
+        return " Nothing recorded"
+    phases = tabulate([[name, f"{seconds * 1000:,.1f}", f"{at * 1000:,.1f}"]
+                       for name, seconds, at in summary["phases"]],
+                      headers=["Phase", "ms", "Started at ms"], tablefmt="simple_grid",
+                      disable_numparse=True)
+    imports = tabulate([[module, f"{own * 1000:,.1f}", f"{cumulative * 1000:,.1f}", phase_name or "-"]
+                        for module, own, cumulative, phase_name in summary["imports"]],
+                       headers=["Import", "Self ms", "Cumulative ms", "Phase"], tablefmt="simple_grid",
+                       disable_numparse=True)
+    return f"{phases}\n{imports}\n Total since start: {(time.perf_counter() - _started) * 1000:,.1f} ms"
@@ -0,0 +1,106 @@
+import sys
+from typing import Optional, Sequence, TextIO
+
+from utils.formatting import get_string_width
+
+
+# Pads each cell's content (a plain string) to its column width
+_ALIGN = {
+    "left": lambda s, pad: s + " " * pad,
+    "right": lambda s, pad: " " * pad + s,
+    "center": lambda s, pad: " " * (pad // 2) + s + " " * (pad - pad // 2)
+}
+
+
+def fit_to_width(s: str, width: int) -> str:
+    """
+    Cut a string to a display width, ending it with "..." when something was cut.
+
+    Args:
+        s: String to fit
+        width: Maximum display width
+
+    Returns:
+        The string, or its longest prefix plus "..." that fits
+    """
+    if get_string_width(s) <= width:
+        return s
+    while s and get_string_width(s) + 3 > width:
+        s = s[:-1]
+    return s + "..."
+
+
+class GridTable:
+    """
+    Writes a table in tabulate's "simple_grid" format one row at a time, for
+    layouts whose column widths are known in advance. Nothing is buffered and
+    nothing is measured twice: each row is written as soon as it is added, so
+    a long table starts appearing at once and costs memory for one row.
+
+    Cells are stripped and aligned like tabulate does with its default
+    settings, so the output is the same as tabulate's as long as no cell is
+    wider than its column. Wider cells are cut to fit (see fit_to_width)
+    instead of widening the column. Headers are aligned but not stripped.
+    """
+    def __init__(self, widths: Sequence[int], aligns: Optional[Sequence[str]] = None,
+                 headers: Optional[Sequence[str]] = None, out: Optional[TextIO] = None):
+        """
+        Start a table and write its top border and header row.
+
+        Args:
+            widths: Content width of each column, without the one space of padding on each side
+            aligns: "left", "right" or "center" per column (default: all left)
+            headers: Header cells (None for a table without a header row)
+            out: Stream to write to (default: sys.stdout at the time the table is created)
+        """
+        self.widths = list(widths)
+        self.aligns = [_ALIGN[align] for align in (aligns or ["left"] * len(self.widths))]
+        self.out = out or sys.stdout
+        self.rows = 0
+        self._between = self._line("├", "┼", "┤")
+        self._below = self._line("└", "┴", "┘")
+        self.out.write(self._line("┌", "┬", "┐"))
+        self.has_headers = headers is not None
+        if self.has_headers:
+            self.out.write(self._format(headers, strip=False))
+
+    def _line(self, begin: str, sep: str, end: str) -> str:
+        """A horizontal border with the given corner and junction characters."""
+        return begin + sep.join("─" * (width + 2) for width in self.widths) + end + "\n"
+
+    def _format(self, cells: Sequence[str], strip: bool = True) -> str:
+        """Align the cells of one row to the column widths."""
+        parts = []
+        for cell, width, align in zip(cells, self.widths, self.aligns):
+            if strip:
+                cell = cell.strip()
+            cell_width = get_string_width(cell)
+            if cell_width > width:
+                cell = fit_to_width(cell, width)
+                cell_width = get_string_width(cell)
+            parts.append(align(cell, width - cell_width))
+        return "│ " + " │ ".join(parts) + " │\n"
+
+    def add_row(self, cells: Sequence[str]) -> None:
+        """
+        Write a data row, preceded by the line that separates it from the row above.
+
+        Args:
+            cells: One string per column
+        """
+        if self.rows or self.has_headers:
+            self.out.write(self._between)
+        self.out.write(self._format(cells))
+        self.rows += 1
+
+    def close(self) -> None:
+        """Write the bottom border."""
+        self.out.write(self._below)
+
+    def __enter__(self) -> "GridTable":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        # A table interrupted by an error is left open, like output cut short
+        if exc_type is None:
+            self.close()
@@ -77,3 +77,21 @@ def validate_non_empty(text: str) -> bool:
         True if input is not empty, False otherwise
     """
     return len(text.strip()) > 0
+
+
+def validate_datetime(text: str) -> bool:
+    """
+    Validate a date ("YYYY-MM-DD") or date-time ("YYYY-MM-DD HH:MM[:SS]").
+    
+    Args:
+        text: String to validate
+        
+    Returns:
+        True if input can be parsed as a date or date-time, False otherwise
+    """
+    from utils.formatting import parse_datetime
+    try:
+        parse_datetime(text)
+        return True
+    except ValueError:
+        return False